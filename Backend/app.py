@@ -9,6 +9,7 @@ from flask import Flask, request, g
 
 from config.router import register_routes
 from Backend.services.logging_service import Logger
+from Backend.core.search_strategies.algorithm_comparator import PARALLEL_DEFAULT, AlgorithmComparator
 
 
 log = Logger("FlaskApp")
@@ -30,6 +31,10 @@ def create_app() -> Flask:
     register_routes(app)
     log.ok("Routes registered", {"count": len(app.url_map._rules)})
 
+    if PARALLEL_DEFAULT:
+        workers = AlgorithmComparator.warm_up()
+        log.ok("Search worker pool warmed", {"workers": workers})
+
     @app.before_request
     def _before_request():
         g._start_time = time.perf_counter()
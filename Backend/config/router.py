@@ -1,11 +1,12 @@
 from __future__ import annotations
 
+import json
 import os
-from flask import Blueprint, jsonify, request, send_from_directory, render_template
+from flask import Blueprint, Response, jsonify, request, send_from_directory, render_template, stream_with_context
 
 from Backend.services.logging_service import Logger
 from Backend.persistence.services.catalog_service import get_catalog
-from Backend.services.question_service import generate_question
+from Backend.services.question_service import generate_question, generate_question_stream
 from Backend.services.evaluation_service import evaluate_answer
 from Backend.services.test_service import generate_test, fetch_test_details
 
@@ -26,6 +27,11 @@ def _safe_payload() -> dict:
     return payload
 
 
+def _sse(event: dict) -> str:
+    name = str(event.get("event") or "message")
+    return f"event: {name}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
 def register_routes(app):
     root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     fe_dir = os.path.join(os.path.dirname(root_dir), "Frontend")
@@ -102,6 +108,41 @@ def register_routes(app):
         )
         return jsonify(data)
 
+    @app.post("/api/question/stream")
+    def api_question_stream():
+        # Server-Sent Events variant of /api/question: progress events while the question is being built,
+        # then a final "done" event whose "response" is exactly what /api/question would have returned.
+        payload = _safe_payload()
+        log.info(
+            "API generate question (stream)",
+            {
+                "chapter_number": payload.get("chapter_number"),
+                "subchapter_number": payload.get("subchapter_number"),
+                "has_options": bool(payload.get("options")),
+            },
+        )
+
+        def events():
+            try:
+                for event in generate_question_stream(payload):
+                    if event.get("event") == "done":
+                        data = event.get("response") or {}
+                        if data.get("ok"):
+                            q = data.get("question") or {}
+                            log.ok("Question generated (stream)", {"question_id": q.get("question_id")})
+                        else:
+                            log.warn("generate_question_stream returned error", {"error": data.get("error")})
+                    yield _sse(event)
+            except Exception as e:
+                log.error("generate_question_stream crashed", exc=e)
+                yield _sse({"event": "done", "response": {"ok": False, "error": "internal server error"}})
+
+        resp = Response(stream_with_context(events()), mimetype="text/event-stream")
+        resp.headers["Cache-Control"] = "no-cache"
+        # Keep reverse proxies (nginx) from buffering the stream until the comparison is over.
+        resp.headers["X-Accel-Buffering"] = "no"
+        return resp
+
     @app.post("/api/question/check")
     def api_question_check():
         payload = _safe_payload()
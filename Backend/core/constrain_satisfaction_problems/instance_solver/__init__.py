@@ -1,5 +1,6 @@
 from __future__ import annotations
 
 from .csp_solver import CSPSolver
+from .csp_trace import TRACE_DECISIONS, TRACE_FULL, TRACE_OFF
 
-__all__ = ["CSPSolver"]
\ No newline at end of file
+__all__ = ["CSPSolver", "TRACE_DECISIONS", "TRACE_FULL", "TRACE_OFF"]
\ No newline at end of file
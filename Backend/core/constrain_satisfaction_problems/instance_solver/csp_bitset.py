@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Iterable, List, Sequence, Tuple
+
+"""
+csp_bitset.py
+
+Bitset domains for the CSP solver.
+
+When every value is a small non-negative integer (the generator uses 0..15), a
+domain can be held as a Python int whose bit v is set iff v is in the domain.
+A mask lists its values in ascending order, which is also the order the payload
+normalizer leaves domains in, so searching over masks tries exactly the same
+values in the same order as searching over lists.
+
+With masks, "which values of X still have a support in D(Y)" becomes a couple of
+integer operations instead of a loop over value pairs:
+- neq: every xv is supported if D(Y) has two or more values, otherwise every
+  xv except the single value of D(Y)
+- lt: xv < yv for some yv iff xv < max D(Y), i.e. the bits below D(Y)'s top bit
+- gt: xv > yv for some yv iff xv > min D(Y), i.e. the bits above D(Y)'s lowest bit
+
+Provided utilities:
+- BITSET_MAX_VALUE: largest value bitset domains are used for
+- fits(): whether an instance's values allow bitset domains
+- to_mask() / mask_values(): convert between value lists and masks
+- merge_relation(): the single relation equivalent to all constraints on a pair
+- supported(): mask of the values of X that have a support in D(Y)
+"""
+
+# Masks up to here stay within one machine word.
+BITSET_MAX_VALUE = 63
+
+# Relation of a pair whose constraints cannot hold together (e.g. lt and gt).
+EMPTY = "empty"
+
+
+def fits(domains: Iterable[Sequence[int]], values: Iterable[int] = ()) -> bool:
+    """
+    Check whether bitset domains can represent an instance.
+
+    Args:
+        domains: Domain value lists, expected ascending and duplicate-free.
+        values: Further values that must be representable (e.g. partial assignment).
+
+    Returns:
+        True if every domain is strictly ascending and every value is within
+        0..BITSET_MAX_VALUE, otherwise False.
+    """
+
+    for d in domains:
+        prev = -1
+        for v in d:
+            if not isinstance(v, int) or v <= prev or v > BITSET_MAX_VALUE:
+                return False
+            prev = v
+    return all(isinstance(v, int) and 0 <= v <= BITSET_MAX_VALUE for v in values)
+
+
+def to_mask(values: Iterable[int]) -> int:
+    """
+    Build the mask of a value list.
+
+    Args:
+        values: Non-negative integer values.
+
+    Returns:
+        Int with bit v set for every value v.
+    """
+
+    mask = 0
+    for v in values:
+        mask |= 1 << v
+    return mask
+
+
+def mask_values(mask: int) -> List[int]:
+    """
+    List the values of a mask.
+
+    Args:
+        mask: Bitset domain.
+
+    Returns:
+        The values in ascending order, as a new list.
+    """
+
+    return list(_values(mask))
+
+
+# The search lists the same few masks over and over (every SELECT_VAR), so the
+# decoded values are cached.
+@lru_cache(maxsize=4096)
+def _values(mask: int) -> Tuple[int, ...]:
+    out: List[int] = []
+    while mask:
+        low = mask & -mask
+        out.append(low.bit_length() - 1)
+        mask ^= low
+    return tuple(out)
+
+
+def merge_relation(types: Sequence[str]) -> str:
+    """
+    Merge the constraint types on one oriented pair into a single relation.
+
+    lt and gt each imply neq, so a pair is constrained by lt if any of its
+    constraints is lt (likewise gt), by nothing satisfiable if it has both,
+    and by neq otherwise.
+
+    Args:
+        types: Constraint types oriented from x to y ("neq", "lt", "gt").
+
+    Returns:
+        "neq", "lt", "gt" or EMPTY.
+    """
+
+    lt, gt = "lt" in types, "gt" in types
+    if lt and gt:
+        return EMPTY
+    if lt:
+        return "lt"
+    if gt:
+        return "gt"
+    return "neq"
+
+
+def supported(rel: str, dy: int) -> int:
+    """
+    Mask of the x values that have a support in D(y) under `rel`.
+
+    The result is meant to be ANDed with D(x); for "neq" and "gt" it is a
+    negative int, i.e. it also has every bit above the value range set.
+
+    Args:
+        rel: Merged relation from x to y (see merge_relation()).
+        dy: Bitset domain of y.
+
+    Returns:
+        Support mask.
+    """
+
+    if not dy or rel == EMPTY:
+        return 0
+    if rel == "lt":
+        return (1 << (dy.bit_length() - 1)) - 1
+    if rel == "gt":
+        return -((dy & -dy) << 1)
+    return -1 if dy & (dy - 1) else ~dy
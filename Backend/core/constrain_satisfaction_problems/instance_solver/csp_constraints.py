@@ -1,8 +1,7 @@
 from __future__ import annotations
 
-from typing import List, Set
-
-from Backend.core.constrain_satisfaction_problems.instance_solver.csp_types import Assignment, JsonDict
+from Backend.core.constrain_satisfaction_problems.instance_solver.csp_model import CSPModel
+from Backend.core.constrain_satisfaction_problems.instance_solver.csp_types import Assignment
 
 """
 csp_constraints.py
@@ -12,42 +11,21 @@ Constraint primitives for a simple binary-constraint CSP.
 Constraint representation:
 - Each constraint is a dict: {"type": "neq"|"lt"|"gt", "vars": [A, B]}
 - Semantics: type(A, B) must hold on assigned values (e.g., A != B)
+- The solver compiles the list once into a CSPModel (csp_model); the queries
+  below take variable ids and look constraints up in it instead of scanning
+- Inference and value ordering (csp_inference, csp_heuristics) read the
+  per-arc checks of the model directly, fetching them once per arc
 
 Provided utilities:
-- neighbors(): adjacency query based on constraint list
 - satisfies(): evaluate a single constraint type on two integers
 - is_consistent_partial(): check all constraints whose endpoints are assigned
 - is_consistent_with(): check whether assigning (var=val) violates any constraint
   against already assigned neighbors
-- pair_ok(): check if a pair of values is consistent w.r.t. all constraints between
-  two variables (considering both directions in the list)
 """
 
 ALLOWED_CONSTRAINTS = {"neq", "lt", "gt"}
 
 
-def neighbors(var: str, constraints: List[JsonDict]) -> List[str]:
-    """
-        Return the neighbor variables of `var` in the constraint graph.
-
-        Args:
-            var: Variable name.
-            constraints: List of constraint dicts.
-
-        Returns:
-            List of variables that appear in a constraint together with `var`.
-        """
-
-    out: Set[str] = set()
-    for c in constraints:
-        a, b = c["vars"]
-        if a == var:
-            out.add(b)
-        elif b == var:
-            out.add(a)
-    return list(out)
-
-
 def satisfies(ctype: str, a: int, b: int) -> bool:
     """
        Evaluate a constraint type on two integer values.
@@ -73,7 +51,7 @@ def satisfies(ctype: str, a: int, b: int) -> bool:
     raise ValueError(f"unknown constraint type: {ctype}")
 
 
-def is_consistent_partial(assignment: Assignment, constraints: List[JsonDict]) -> bool:
+def is_consistent_partial(assignment: Assignment, model: CSPModel) -> bool:
     """
        Check whether a partial assignment violates any fully-instantiated constraint.
 
@@ -81,70 +59,42 @@ def is_consistent_partial(assignment: Assignment, constraints: List[JsonDict]) -
 
        Args:
            assignment: Current partial assignment.
-           constraints: Constraint list.
+           model: Compiled instance.
 
        Returns:
            True if no violated constraint exists, otherwise False.
        """
 
-    for c in constraints:
-        a, b = c["vars"]
+    for (a, b), checks in model.checks.items():
         if a in assignment and b in assignment:
-            if not satisfies(c["type"], assignment[a], assignment[b]):
-                return False
+            av, bv = assignment[a], assignment[b]
+            for check in checks:
+                if not check(av, bv):
+                    return False
     return True
 
 
-def is_consistent_with(var: str, val: int, assignment: Assignment, constraints: List[JsonDict]) -> bool:
+def is_consistent_with(var: int, val: int, assignment: Assignment, model: CSPModel) -> bool:
     """
        Check whether assigning `var = val` is consistent with current assignment.
 
        Evaluates only constraints between `var` and variables already assigned.
 
        Args:
-           var: Variable to test.
+           var: Variable id to test.
            val: Candidate value.
            assignment: Current partial assignment (without var assigned, typically).
-           constraints: Constraint list.
+           model: Compiled instance.
 
        Returns:
            True if the assignment is locally consistent, otherwise False.
        """
 
-    for c in constraints:
-        a, b = c["vars"]
-        if a == var and b in assignment:
-            if not satisfies(c["type"], val, assignment[b]):
-                return False
-        if b == var and a in assignment:
-            if not satisfies(c["type"], assignment[a], val):
-                return False
+    for n in model.neighbors[var]:
+        if n in assignment:
+            nv = assignment[n]
+            for check in model.checks[(var, n)]:
+                if not check(val, nv):
+                    return False
     return True
 
-
-def pair_ok(x: str, xv: int, y: str, yv: int, constraints: List[JsonDict]) -> bool:
-    """
-        Check if (x=xv, y=yv) satisfies all constraints between x and y.
-
-        The constraint list may contain constraints in either direction [x, y] or [y, x].
-        This function enforces that all applicable constraints are satisfied.
-
-        Args:
-            x: First variable.
-            xv: Value for x.
-            y: Second variable.
-            yv: Value for y.
-            constraints: Constraint list.
-
-        Returns:
-            True if the pair is consistent for all constraints between x and y, else False.
-        """
-    for c in constraints:
-        a, b = c["vars"]
-        if a == x and b == y:
-            if not satisfies(c["type"], xv, yv):
-                return False
-        if a == y and b == x:
-            if not satisfies(c["type"], yv, xv):
-                return False
-    return True
\ No newline at end of file
@@ -2,8 +2,14 @@ from __future__ import annotations
 
 from typing import List, Tuple
 
-from Backend.core.constrain_satisfaction_problems.instance_solver.csp_constraints import neighbors, pair_ok
-from Backend.core.constrain_satisfaction_problems.instance_solver.csp_types import Assignment, Domains, JsonDict
+from Backend.core.constrain_satisfaction_problems.instance_solver.csp_bitset import supported
+from Backend.core.constrain_satisfaction_problems.instance_solver.csp_model import CSPModel
+from Backend.core.constrain_satisfaction_problems.instance_solver.csp_types import (
+    Assignment,
+    Domains,
+    domain_size,
+    domain_values,
+)
 
 """
 csp_heuristics.py
@@ -21,48 +27,46 @@ Provided heuristics:
 """
 
 def select_unassigned_var(
-    variables: List[str],
-    order: List[str],
+    order: List[int],
     domains: Domains,
     assignment: Assignment,
     heuristic: str,
-) -> str:
+) -> int:
     """
        Select the next unassigned variable.
 
        Args:
-           variables: All variables (source of truth for membership).
-           order: Preferred variable ordering used by FIXED and as MRV tie-break.
+           order: Preferred variable ordering (ids, covering every variable) used by
+               FIXED and as MRV tie-break.
            domains: Current domains (used by MRV).
            assignment: Current partial assignment.
            heuristic: Name of heuristic ("MRV" or "FIXED"/other).
 
        Returns:
-           The chosen variable name.
+           The chosen variable id.
 
        Notes:
-           - If heuristic is MRV, chooses smallest domain variable, tie-break by `order`.
+           - If heuristic is MRV, chooses smallest domain variable, tie-break by `order`
+             (min() keeps the first of equal keys, so scanning in `order` is the tie-break).
            - Otherwise chooses the first unassigned variable according to `order`.
        """
-    unassigned = [v for v in variables if v not in assignment]
-
     if heuristic.upper() == "MRV":
         return min(
-            unassigned,
-            key=lambda v: (len(domains[v]), order.index(v) if v in order else 10**9),
+            (v for v in order if v not in assignment),
+            key=lambda v: domain_size(domains[v]),
         )
 
     for v in order:
         if v not in assignment:
             return v
 
-    return unassigned[0]
+    raise ValueError("no unassigned variable left")
 
 
 def order_values(
-    var: str,
+    var: int,
     domains: Domains,
-    constraints: List[JsonDict],
+    model: CSPModel,
     assignment: Assignment,
     heuristic: str,
 ) -> List[int]:
@@ -70,9 +74,9 @@ def order_values(
        Order the candidate values for a variable.
 
        Args:
-           var: Variable to assign.
+           var: Variable id to assign.
            domains: Current domains.
-           constraints: Binary constraints list.
+           model: Compiled instance.
            assignment: Current partial assignment.
            heuristic: Name of heuristic ("LCV" or "NONE"/other).
 
@@ -83,20 +87,30 @@ def order_values(
            LCV scoring counts how many neighbor values would be eliminated if `var = val`.
            Lower elimination count is better (try first).
        """
-    vals = list(domains[var])
+    vals = domain_values(domains[var])
     if heuristic.upper() != "LCV":
         return vals
 
-    neigh = neighbors(var, constraints)
+    if model.bitset:
+        # Values of n left after var = val are those supported by {val}.
+        masks = [(domains[n], model.relation[(n, var)]) for n in model.neighbors[var] if n not in assignment]
+        scored = [
+            (sum((dn & ~supported(rel, 1 << val)).bit_count() for dn, rel in masks), val)
+            for val in vals
+        ]
+        scored.sort(key=lambda t: (t[0], t[1]))
+        return [v for _, v in scored]
+
+    neigh = [(domains[n], model.checks[(var, n)]) for n in model.neighbors[var] if n not in assignment]
     scored: List[Tuple[int, int]] = []
     for val in vals:
         eliminated = 0
-        for n in neigh:
-            if n in assignment:
-                continue
-            for nv in domains[n]:
-                if not pair_ok(var, val, n, nv, constraints):
-                    eliminated += 1
+        for dn, checks in neigh:
+            for nv in dn:
+                for check in checks:
+                    if not check(val, nv):
+                        eliminated += 1
+                        break
         scored.append((eliminated, val))
 
     scored.sort(key=lambda t: (t[0], t[1]))
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
-from typing import List, Optional, Tuple
+from bisect import bisect_left
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Set, Tuple
 
-from Backend.core.constrain_satisfaction_problems.instance_solver.csp_constraints import neighbors, pair_ok
-from Backend.core.constrain_satisfaction_problems.instance_solver.csp_types import Assignment, Domains, JsonDict
+from Backend.core.constrain_satisfaction_problems.instance_solver.csp_bitset import supported
+from Backend.core.constrain_satisfaction_problems.instance_solver.csp_model import CSPModel
+from Backend.core.constrain_satisfaction_problems.instance_solver.csp_types import Assignment, Domains, Trail
 
 """
 csp_inference.py
@@ -13,22 +16,43 @@ Inference and consistency algorithms for binary-constraint CSPs.
 Provided algorithms:
 - forward_check(): Forward Checking (FC) from recently assigned variables
 - ac3(): AC-3 arc consistency algorithm
+- ac2001(): AC-2001/3.1, AC-3 with last-support pointers
+- ac4(): AC-4, support counting
 - revise(): arc revision primitive used by AC-3
 - all_arcs(): build full queue of arcs from constraints
 - arcs_touching(): build queue of arcs incident to a subset of variables
+- ARC_CONSISTENCY / MAINTAINED_ARC_CONSISTENCY: `consistency` code -> algorithm
+- LIST_DOMAINS_ONLY: `consistency` codes that cannot run on bitset domains
+
+AC-3 and AC-2001 share one arc queue: a deque plus a membership set, so an arc
+already waiting is not queued twice. All three reach the same arc-consistent
+domains, and so report the same pruned count; they differ in how much support
+checking it takes on large, dense instances. On a wipe-out each stops at the
+first domain it empties, so the count only covers what was removed up to then
+and may differ between AC-4 and the queue-based two.
+
+Variables are ids of the compiled CSPModel; the predicates of an arc are looked
+up once per arc rather than once per value pair. With bitset domains
+(model.bitset) an FC or AC-3 revision is a mask operation instead (see
+csp_bitset); AC-2001 and AC-4 keep per-value state and only run on lists.
 
 All functions mutate `domains` in-place and return:
 - ok: whether domains remain non-empty (no domain wipe-out)
 - pruned: how many domain values were removed
+
+A pruned domain is replaced by a new list rather than edited. When a `trail` is
+given, the replaced list is pushed onto it so the search can undo the pruning
+with csp_types.undo() instead of snapshotting every domain.
 """
 
 
 def forward_check(
     domains: Domains,
-    constraints: List[JsonDict],
+    model: CSPModel,
     assignment: Assignment,
     *,
-    last_assigned_vars: List[str],
+    last_assigned_vars: List[int],
+    trail: Optional[Trail] = None,
 ) -> Tuple[bool, int]:
     """
       Perform Forward Checking propagation from recently assigned variables.
@@ -38,10 +62,11 @@ def forward_check(
 
       Args:
           domains: Current domains (mutated in-place).
-          constraints: Binary constraints list.
+          model: Compiled instance.
           assignment: Current partial assignment.
           last_assigned_vars: Variables to propagate from (typically the last chosen var,
               or all vars from an initial partial assignment).
+          trail: Optional undo log receiving (var, previous domain) per pruned domain.
 
       Returns:
           (ok, pruned) where:
@@ -54,13 +79,21 @@ def forward_check(
         if var not in assignment:
             continue
         val = assignment[var]
-        for n in neighbors(var, constraints):
+        for n in model.neighbors[var]:
             if n in assignment:
                 continue
-            before = list(domains[n])
-            kept = [nv for nv in before if pair_ok(var, val, n, nv, constraints)]
-            if len(kept) != len(before):
-                pruned += (len(before) - len(kept))
+            before = domains[n]
+            if model.bitset:
+                kept = before & supported(model.relation[(n, var)], 1 << val)
+                removed = (before ^ kept).bit_count()
+            else:
+                checks = model.checks[(var, n)]
+                kept = [nv for nv in before if all(check(val, nv) for check in checks)]
+                removed = len(before) - len(kept)
+            if removed:
+                pruned += removed
+                if trail is not None:
+                    trail.append((n, before))
                 domains[n] = kept
             if not domains[n]:
                 return False, pruned
@@ -69,9 +102,10 @@ def forward_check(
 
 def ac3(
     domains: Domains,
-    constraints: List[JsonDict],
+    model: CSPModel,
     *,
-    queue: Optional[List[Tuple[str, str]]] = None,
+    queue: Optional[List[Tuple[int, int]]] = None,
+    trail: Optional[Trail] = None,
 ) -> Tuple[bool, int]:
     """
       Enforce arc consistency using the AC-3 algorithm.
@@ -81,8 +115,9 @@ def ac3(
 
       Args:
           domains: Current domains (mutated in-place).
-          constraints: Binary constraints list.
+          model: Compiled instance.
           queue: Optional initial queue of arcs. If None, uses all arcs in constraints.
+          trail: Optional undo log receiving (var, previous domain) per revision.
 
       Returns:
           (ok, pruned) where:
@@ -90,23 +125,240 @@ def ac3(
           - pruned is the number of removed values across all revisions
       """
 
+    return _propagate(
+        model,
+        queue if queue is not None else all_arcs(model),
+        lambda x, y: revise(domains, model, x, y, trail=trail),
+        domains,
+    )
+
+
+def ac2001(
+    domains: Domains,
+    model: CSPModel,
+    *,
+    queue: Optional[List[Tuple[int, int]]] = None,
+    trail: Optional[Trail] = None,
+) -> Tuple[bool, int]:
+    """
+      Enforce arc consistency using AC-2001 (also known as AC-3.1).
+
+      Same queue discipline as AC-3, but each value xv of X remembers the value of Y
+      that last supported it. A revision first checks whether that support is still
+      in D(Y) and only otherwise searches on from it, so every (xv, yv) pair of an
+      arc is checked at most once per call instead of once per revision.
+
+      Domains are ascending (the payload normalizer sorts them and pruning keeps the
+      order), which is what lets the search resume after the last support. The
+      pointers live for one call: values restored by backtracking could otherwise
+      sit before a pointer. The pointers index value lists, so this needs list
+      domains (the solver never uses masks with AC2001/MAC2001).
+
+      Args:
+          domains: Current domains (mutated in-place).
+          model: Compiled instance.
+          queue: Optional initial queue of arcs. If None, uses all arcs in constraints.
+          trail: Optional undo log receiving (var, previous domain) per revision.
+
+      Returns:
+          (ok, pruned) as for ac3().
+
+      Raises:
+          ValueError: If the model uses bitset domains.
+      """
+
+    if model.bitset:
+        raise ValueError("AC-2001 needs list domains")
+
+    last: Dict[Tuple[int, int], Dict[int, int]] = {}
+    return _propagate(
+        model,
+        queue if queue is not None else all_arcs(model),
+        lambda x, y: _revise2001(domains, model, x, y, last, trail),
+        domains,
+    )
+
+
+def ac4(
+    domains: Domains,
+    model: CSPModel,
+    *,
+    trail: Optional[Trail] = None,
+) -> Tuple[bool, int]:
+    """
+      Enforce arc consistency using AC-4.
+
+      Counts, for every value xv of X and constraint arc (X, Y), how many values of
+      D(Y) support it, and records which (X, xv) each (Y, yv) supports. A value whose
+      count drops to zero is removed, and its removal only decrements the counters
+      it contributed to, so no support is ever searched for twice. Building the
+      counters costs one pass over every value pair of every arc, which suits a one-off
+      preprocessing step; MAC keeps using the incremental algorithms.
+
+      The counters are kept per value, so this needs list domains (the solver never
+      uses masks with AC4).
+
+      Args:
+          domains: Current domains (mutated in-place).
+          model: Compiled instance.
+          trail: Optional undo log receiving (var, previous domain) per pruned domain.
+
+      Returns:
+          (ok, pruned) as for ac3(). On a wipe-out, pruned counts the values removed
+          until the first domain emptied. AC-4 removes values in a different order
+          from AC-3/AC-2001 (arc by arc while counting, then by lost support), so it
+          can meet the wipe-out earlier or later and report a different count; with
+          ok=True the counts always agree.
+
+      Raises:
+          ValueError: If the model uses bitset domains.
+      """
+
+    if model.bitset:
+        raise ValueError("AC-4 needs list domains")
+
+    alive: Dict[int, Set[int]] = {}
+    counter: Dict[Tuple[int, int, int], int] = {}
+    supports: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+    removed: Deque[Tuple[int, int]] = deque()
+    pruned = 0
+    ok = True
+
+    def remove(x: int, xv: int) -> bool:
+        nonlocal pruned
+        values = alive.setdefault(x, set(domains[x]))
+        if xv not in values:
+            return True
+        values.discard(xv)
+        removed.append((x, xv))
+        pruned += 1
+        return bool(values)
+
+    for x, y in model.arcs:
+        checks = model.checks[(x, y)]
+        dy = domains[y]
+        supporters = [supports.setdefault((y, yv), []) for yv in dy]
+        for xv in domains[x]:
+            n = 0
+            for yv, sup in zip(dy, supporters):
+                if all(check(xv, yv) for check in checks):
+                    n += 1
+                    sup.append((x, xv))
+            counter[(x, y, xv)] = n
+            if not n and not remove(x, xv):
+                ok = False
+                break
+        if not ok:
+            break
+
+    while ok and removed:
+        y, yv = removed.popleft()
+        for x, xv in supports.get((y, yv), ()):
+            if x not in alive or xv in alive[x]:
+                counter[(x, y, xv)] -= 1
+                if not counter[(x, y, xv)] and not remove(x, xv):
+                    ok = False
+                    break
+
+    for x, values in alive.items():
+        if len(values) != len(domains[x]):
+            if trail is not None:
+                trail.append((x, domains[x]))
+            domains[x] = [v for v in domains[x] if v in values]
+    return ok, pruned
+
+
+def _propagate(
+    model: CSPModel,
+    arcs: List[Tuple[int, int]],
+    revise_arc: Callable[[int, int], Tuple[bool, int]],
+    domains: Domains,
+) -> Tuple[bool, int]:
+    """
+      Queue loop shared by AC-3 and AC-2001.
+
+      Args:
+          model: Compiled instance.
+          arcs: Initial arcs.
+          revise_arc: Revises D(x) against D(y), returning (changed, removed).
+          domains: Current domains (read to detect a wipe-out).
+
+      Returns:
+          (ok, pruned) as for ac3().
+      """
+
     pruned = 0
-    q = queue[:] if queue is not None else all_arcs(constraints)
+    q: Deque[Tuple[int, int]] = deque(dict.fromkeys(arcs))
+    queued: Set[Tuple[int, int]] = set(q)
 
     while q:
-        x, y = q.pop(0)
-        changed, removed = revise(domains, constraints, x, y)
+        arc = q.popleft()
+        queued.discard(arc)
+        x, y = arc
+        changed, removed = revise_arc(x, y)
         pruned += removed
         if changed:
             if not domains[x]:
                 return False, pruned
-            for z in neighbors(x, constraints):
-                if z != y:
+            for z in model.neighbors[x]:
+                if z != y and (z, x) not in queued:
+                    queued.add((z, x))
                     q.append((z, x))
     return True, pruned
 
 
-def revise(domains: Domains, constraints: List[JsonDict], x: str, y: str) -> Tuple[bool, int]:
+def _revise2001(
+    domains: Domains,
+    model: CSPModel,
+    x: int,
+    y: int,
+    last: Dict[Tuple[int, int], Dict[int, int]],
+    trail: Optional[Trail],
+) -> Tuple[bool, int]:
+    """
+     Revise D(x) against D(y), resuming each value's support search after its last support.
+
+     Args:
+         domains: Current (list) domains, ascending (mutated in-place if changes occur).
+         model: Compiled instance.
+         x: Source variable id.
+         y: Target variable id.
+         last: (x, y) -> {xv: last support found for xv in D(y)} (updated in-place).
+         trail: Optional undo log receiving (x, previous domain) if D(x) shrinks.
+
+     Returns:
+         (changed, removed) as for revise().
+     """
+
+    checks = model.checks.get((x, y), ())
+    pointers = last.setdefault((x, y), {})
+    dx, dy = domains[x], domains[y]
+    new_dx = []
+    for xv in dx:
+        start = 0
+        yv = pointers.get(xv)
+        if yv is not None:
+            start = bisect_left(dy, yv)
+            if start < len(dy) and dy[start] == yv:
+                new_dx.append(xv)
+                continue
+        for i in range(start, len(dy)):
+            yv = dy[i]
+            if all(check(xv, yv) for check in checks):
+                pointers[xv] = yv
+                new_dx.append(xv)
+                break
+
+    removed = len(dx) - len(new_dx)
+    if removed > 0:
+        if trail is not None:
+            trail.append((x, dx))
+        domains[x] = new_dx
+        return True, removed
+    return False, 0
+
+
+def revise(domains: Domains, model: CSPModel, x: int, y: int, *, trail: Optional[Trail] = None) -> Tuple[bool, int]:
     """
      Revise the domain of x to be consistent with y.
 
@@ -115,9 +367,10 @@ def revise(domains: Domains, constraints: List[JsonDict], x: str, y: str) -> Tup
 
      Args:
          domains: Current domains (mutated in-place if changes occur).
-         constraints: Binary constraints list.
-         x: Source variable.
-         y: Target variable.
+         model: Compiled instance.
+         x: Source variable id.
+         y: Target variable id.
+         trail: Optional undo log receiving (x, previous domain) if D(x) shrinks.
 
      Returns:
          (changed, removed) where:
@@ -125,47 +378,51 @@ def revise(domains: Domains, constraints: List[JsonDict], x: str, y: str) -> Tup
          - removed is the number of removed values
      """
 
-    removed = 0
-    new_dx = []
-    for xv in domains[x]:
-        ok = False
-        for yv in domains[y]:
-            if pair_ok(x, xv, y, yv, constraints):
-                ok = True
-                break
-        if ok:
-            new_dx.append(xv)
-        else:
-            removed += 1
+    dx, dy = domains[x], domains[y]
+    if model.bitset:
+        new_dx = dx & supported(model.relation[(x, y)], dy)
+        removed = (dx ^ new_dx).bit_count()
+        if removed > 0:
+            if trail is not None:
+                trail.append((x, dx))
+            domains[x] = new_dx
+            return True, removed
+        return False, 0
+
+    checks = model.checks.get((x, y), ())
+    if len(checks) == 1:
+        check = checks[0]
+        new_dx = [xv for xv in dx if any(check(xv, yv) for yv in dy)]
+    else:
+        new_dx = [xv for xv in dx if any(all(check(xv, yv) for check in checks) for yv in dy)]
+    removed = len(dx) - len(new_dx)
 
     if removed > 0:
+        if trail is not None:
+            trail.append((x, dx))
         domains[x] = new_dx
         return True, removed
     return False, 0
 
 
-def all_arcs(constraints: List[JsonDict]) -> List[Tuple[str, str]]:
+def all_arcs(model: CSPModel) -> List[Tuple[int, int]]:
     """
        Build the full set of directed arcs implied by constraints.
 
-       For each constraint (A, B) add arcs (A, B) and (B, A).
+       For each constrained pair (A, B) add arcs (A, B) and (B, A), once each even
+       when several constraints link the same pair.
 
        Args:
-           constraints: Binary constraints list.
+           model: Compiled instance.
 
        Returns:
            List of directed arcs (x, y).
        """
 
-    arcs: List[Tuple[str, str]] = []
-    for c in constraints:
-        a, b = c["vars"]
-        arcs.append((a, b))
-        arcs.append((b, a))
-    return arcs
+    return list(model.arcs)
 
 
-def arcs_touching(vars_: List[str], constraints: List[JsonDict]) -> List[Tuple[str, str]]:
+def arcs_touching(vars_: List[int], model: CSPModel) -> List[Tuple[int, int]]:
     """
     Build directed arcs for constraints incident to any variable in `vars_`.
 
@@ -173,18 +430,26 @@ def arcs_touching(vars_: List[str], constraints: List[JsonDict]) -> List[Tuple[s
     may be affected by X (instead of running AC-3 on the whole graph).
 
     Args:
-        vars_: Variables considered "touched" (recently assigned).
-        constraints: Binary constraints list.
+        vars_: Variable ids considered "touched" (recently assigned).
+        model: Compiled instance.
 
     Returns:
-        List of directed arcs (a, b) and (b, a) for each incident constraint.
+        Directed arcs (a, b) and (b, a) for each incident constrained pair, once each.
     """
 
-    s = set(vars_)
-    arcs: List[Tuple[str, str]] = []
-    for c in constraints:
-        a, b = c["vars"]
-        if a in s or b in s:
-            arcs.append((a, b))
-            arcs.append((b, a))
-    return arcs
\ No newline at end of file
+    arcs: Dict[Tuple[int, int], None] = {}
+    for v in vars_:
+        for n in model.neighbors[v]:
+            arcs[(v, n)] = None
+            arcs[(n, v)] = None
+    return list(arcs)
+
+
+# Payload `consistency` code -> algorithm. AC3/AC2001/AC4 make the domains arc
+# consistent once before search; MAC/MAC2001 maintain arc consistency after every
+# assignment.
+ARC_CONSISTENCY = {"AC3": ac3, "AC2001": ac2001, "AC4": ac4}
+MAINTAINED_ARC_CONSISTENCY = {"MAC": ac3, "MAC2001": ac2001}
+
+# Codes whose algorithm keeps per-value state and so needs list domains.
+LIST_DOMAINS_ONLY = frozenset({"AC2001", "AC4", "MAC2001"})
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import operator
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Tuple
+
+from Backend.core.constrain_satisfaction_problems.instance_solver.csp_bitset import merge_relation
+from Backend.core.constrain_satisfaction_problems.instance_solver.csp_types import JsonDict
+
+"""
+csp_model.py
+
+Compiled, indexed form of a binary-constraint CSP instance.
+
+The payload lists constraints as {"type": ..., "vars": [A, B]} dicts, which is
+convenient to generate and validate but slow to query: every "which constraints
+link X and Y" question would otherwise be a scan over the whole list. The solver
+compiles the instance once into a CSPModel and every heuristic and inference
+routine works on it instead.
+
+Representation:
+- variables are integer ids (their position in instance.variables)
+- domains and assignments are keyed by id (see csp_types)
+- neighbors[x] lists the ids sharing at least one constraint with x
+- checks[(x, y)] holds the predicates p(xv, yv) that must all hold between
+  x and y, already oriented so that x is the left operand (a constraint
+  lt(A, B) is stored as lt under (A, B) and as gt under (B, A))
+- with bitset domains (see csp_bitset), relation[(x, y)] is the single
+  relation those predicates amount to, used for mask-based support checks
+"""
+
+Predicate = Callable[[int, int], bool]
+
+PREDICATES: Dict[str, Predicate] = {"neq": operator.ne, "lt": operator.lt, "gt": operator.gt}
+
+# Constraint type seen from the other endpoint: lt(A, B) is gt(B, A).
+REVERSED: Dict[str, str] = {"neq": "neq", "lt": "gt", "gt": "lt"}
+
+
+@dataclass(frozen=True)
+class CSPModel:
+    """
+    Indexed view of the variables and constraints of one instance.
+
+    Attributes:
+        names: Variable names by id.
+        ids: Variable name -> id.
+        neighbors: Per-variable adjacency (ids), in order of first appearance in
+            the constraint list.
+        relations: (x, y) -> constraint types oriented from x to y.
+        checks: (x, y) -> predicates matching `relations`, called as p(xv, yv).
+        relation: (x, y) -> merged relation of `relations` (csp_bitset.merge_relation()).
+        arcs: Every directed arc (x, y) once, in constraint order.
+        bitset: True if the solver holds domains as int masks (see csp_bitset).
+    """
+
+    names: Tuple[str, ...]
+    ids: Dict[str, int]
+    neighbors: Tuple[Tuple[int, ...], ...]
+    relations: Dict[Tuple[int, int], Tuple[str, ...]]
+    checks: Dict[Tuple[int, int], Tuple[Predicate, ...]]
+    relation: Dict[Tuple[int, int], str]
+    arcs: Tuple[Tuple[int, int], ...]
+    bitset: bool = False
+
+    @staticmethod
+    def compile(variables: List[str], constraints: List[JsonDict], *, bitset: bool = False) -> "CSPModel":
+        """
+        Build the model for a validated instance.
+
+        Args:
+            variables: Variable names; a variable's id is its index here.
+            constraints: Binary constraints list.
+            bitset: Whether domains will be held as int masks.
+
+        Returns:
+            The compiled CSPModel.
+
+        Raises:
+            ValueError: If a constraint has an unknown type.
+        """
+
+        names = tuple(variables)
+        ids = {v: i for i, v in enumerate(names)}
+        adjacency: List[List[int]] = [[] for _ in names]
+        relations: Dict[Tuple[int, int], List[str]] = {}
+        arcs: List[Tuple[int, int]] = []
+
+        for c in constraints:
+            ctype = c["type"]
+            if ctype not in PREDICATES:
+                raise ValueError(f"unknown constraint type: {ctype}")
+            a, b = ids[c["vars"][0]], ids[c["vars"][1]]
+            for x, y, t in ((a, b, ctype), (b, a, REVERSED[ctype])):
+                if (x, y) not in relations:
+                    relations[(x, y)] = []
+                    adjacency[x].append(y)
+                    arcs.append((x, y))
+                relations[(x, y)].append(t)
+
+        return CSPModel(
+            names=names,
+            ids=ids,
+            neighbors=tuple(tuple(n) for n in adjacency),
+            relations={k: tuple(v) for k, v in relations.items()},
+            checks={k: tuple(PREDICATES[t] for t in v) for k, v in relations.items()},
+            relation={k: merge_relation(v) for k, v in relations.items()},
+            arcs=tuple(arcs),
+            bitset=bitset,
+        )
@@ -12,15 +12,20 @@ augmented with:
 - variable selection heuristics (FIXED / MRV)
 - value ordering heuristics (NONE / LCV)
 - inference (NONE / FC = forward checking)
-- consistency maintenance (NONE / AC3 preprocess / MAC during search)
+- consistency maintenance (NONE / AC3, AC2001 or AC4 preprocess / MAC or
+  MAC2001 during search)
 
 The solver consumes a JSON-like payload:
 - first normalizes it (defaults, coercions)
 - then validates structure and references
-- then runs AC3 preprocess / partial propagation
+- then compiles it into an indexed CSPModel (integer variable ids, adjacency,
+  per-pair constraint predicates) used by every heuristic and inference step
+- then runs arc consistency preprocess / partial propagation
 - then runs recursive backtracking until a solution is found or search fails
 
-A step-by-step trace is produced for educational/debug purposes.
+A step-by-step trace is produced for educational/debug purposes; its level of
+detail is chosen per call (see csp_trace), and callers that only need the
+solution can switch it off.
 """
 
 try:
@@ -33,6 +38,7 @@ from Backend.core.constrain_satisfaction_problems.instance_generator.csp_payload
     CSPPayloadValidator,
 )
 
+from Backend.core.constrain_satisfaction_problems.instance_solver.csp_bitset import BITSET_MAX_VALUE, fits, to_mask
 from Backend.core.constrain_satisfaction_problems.instance_solver.csp_constraints import (
     is_consistent_partial,
     is_consistent_with,
@@ -42,16 +48,21 @@ from Backend.core.constrain_satisfaction_problems.instance_solver.csp_heuristics
     select_unassigned_var,
 )
 from Backend.core.constrain_satisfaction_problems.instance_solver.csp_inference import (
-    ac3,
+    ARC_CONSISTENCY,
+    LIST_DOMAINS_ONLY,
+    MAINTAINED_ARC_CONSISTENCY,
     arcs_touching,
     forward_check,
 )
+from Backend.core.constrain_satisfaction_problems.instance_solver.csp_model import CSPModel
+from Backend.core.constrain_satisfaction_problems.instance_solver.csp_trace import TRACE_FULL, CSPTrace
 from Backend.core.constrain_satisfaction_problems.instance_solver.csp_types import (
     Assignment,
     CSPSolveStats,
     Domains,
     JsonDict,
-    domains_snapshot,
+    Trail,
+    undo,
 )
 
 log = Logger("CSP.Solver")
@@ -71,15 +82,22 @@ class CSPSolver:
     """
 
     @staticmethod
-    def solve(payload: JsonDict, *, strict: bool = True) -> JsonDict:
+    def solve(
+        payload: JsonDict,
+        *,
+        strict: bool = True,
+        bitset: Optional[bool] = None,
+        trace_level: str = TRACE_FULL,
+        trace_diff: bool = False,
+    ) -> JsonDict:
         """
                Solve a CSP instance provided as a JSON-like payload.
 
                Steps:
                1) Normalize payload (fill defaults, coerce types).
                2) Validate payload structure and references.
-               3) Initialize domains and optional partial assignment.
-               4) Optional AC3 preprocessing (if consistency == "AC3").
+               3) Compile the instance and initialize domains and optional partial assignment.
+               4) Optional arc consistency preprocessing (consistency "AC3", "AC2001" or "AC4").
                5) If partial assignment exists, propagate it using FC and/or MAC.
                6) Run recursive backtracking search with configured heuristics.
                7) Return a result dict with solution, trace, and statistics.
@@ -88,6 +106,13 @@ class CSPSolver:
                    payload: Input payload containing solver settings and CSP instance data.
                    strict: If True, enforce strict validation (partial assignments must be in
                        domain and reference known variables).
+                   bitset: Hold domains as int masks (see csp_bitset). None (default) uses them
+                       whenever every value is within 0..BITSET_MAX_VALUE and the consistency
+                       algorithm supports them (not AC2001, AC4 or MAC2001); results are the
+                       same either way, masks are just faster to prune.
+                   trace_level: "OFF", "DECISIONS" or "FULL" (default), see csp_trace.
+                   trace_diff: With FULL, record the values each propagation step removed
+                       ("removed": {var: [values]}) instead of full domain snapshots.
 
                Returns:
                    Result dict:
@@ -103,6 +128,10 @@ class CSPSolver:
                Notes:
                    - "ok" signals API-level success (normalization/validation succeeded).
                    - "found" indicates satisfiable vs unsatisfiable under given constraints.
+
+               Raises:
+                   ValueError: If bitset=True but some value is outside 0..BITSET_MAX_VALUE
+                       or consistency needs list domains, or trace_level is unknown.
                """
 
         p = CSPPayloadNormalizer.normalize(payload)
@@ -121,61 +150,83 @@ class CSPSolver:
         order: List[str] = inst["order"]
         constraints: List[JsonDict] = inst["constraints"]
 
-        domains: Domains = {v: list(inst["domains"][v]) for v in variables}
-        assignment: Assignment = dict(inst.get("partial_assignment") or {})
-
-        trace: List[JsonDict] = []
+        partial = inst.get("partial_assignment") or {}
+        list_only = settings["consistency"] in LIST_DOMAINS_ONLY
+        values_fit = fits((inst["domains"][v] for v in variables), partial.values())
+        if bitset and list_only:
+            raise ValueError(f"consistency {settings['consistency']} needs list domains")
+        if bitset and not values_fit:
+            raise ValueError(f"bitset domains need sorted values within 0..{BITSET_MAX_VALUE}")
+        if bitset is None:
+            bitset = values_fit and not list_only
+
+        model = CSPModel.compile(variables, constraints, bitset=bitset)
+        ids = model.ids
+        if model.bitset:
+            domains: Domains = [to_mask(inst["domains"][v]) for v in variables]
+        else:
+            domains = [list(inst["domains"][v]) for v in variables]
+        # Non-strict payloads may name unknown variables; no constraint can involve them.
+        assignment: Assignment = {ids[v]: val for v, val in partial.items() if v in ids}
+
+        trace = CSPTrace(model.names, trace_level, diff=trace_diff)
+        trail: Trail = []
         stats = CSPSolveStats()
 
-        # preprocess AC3
-        if settings["consistency"] == "AC3":
-            ok, pruned = ac3(domains, constraints)
+        # preprocess AC3 / AC2001 / AC4
+        if settings["consistency"] in ARC_CONSISTENCY:
+            ok, pruned = ARC_CONSISTENCY[settings["consistency"]](domains, model, trail=trail)
             stats.prunes += pruned
-            trace.append({"step": "AC3_PRE", "ok": ok, "domains": domains_snapshot(domains)})
+            trace.propagation(f"{settings['consistency']}_PRE", ok, domains, trail=trail)
             if not ok:
                 return CSPSolver._result(False, None, trace, stats, settings)
 
+        mac = MAINTAINED_ARC_CONSISTENCY.get(settings["consistency"])
+
         if assignment:
-            if not is_consistent_partial(assignment, constraints):
+            if not is_consistent_partial(assignment, model):
                 return CSPSolver._result(False, None, trace, stats, settings)
 
             if settings["inference"] == "FC":
-                ok, pruned = forward_check(domains, constraints, assignment, last_assigned_vars=list(assignment.keys()))
+                mark = len(trail)
+                ok, pruned = forward_check(domains, model, assignment, last_assigned_vars=list(assignment.keys()), trail=trail)
                 stats.prunes += pruned
-                trace.append({"step": "FC_FROM_PARTIAL", "ok": ok, "domains": domains_snapshot(domains)})
+                trace.propagation("FC_FROM_PARTIAL", ok, domains, trail=trail, mark=mark)
                 if not ok:
                     return CSPSolver._result(False, None, trace, stats, settings)
 
-            if settings["consistency"] == "MAC":
-                ok, pruned = ac3(domains, constraints, queue=arcs_touching(list(assignment.keys()), constraints))
+            if mac is not None:
+                mark = len(trail)
+                ok, pruned = mac(domains, model, queue=arcs_touching(list(assignment.keys()), model), trail=trail)
                 stats.prunes += pruned
-                trace.append({"step": "MAC_FROM_PARTIAL", "ok": ok, "domains": domains_snapshot(domains)})
+                trace.propagation("MAC_FROM_PARTIAL", ok, domains, trail=trail, mark=mark)
                 if not ok:
                     return CSPSolver._result(False, None, trace, stats, settings)
 
         found, sol = CSPSolver._backtrack(
-            variables=variables,
-            order=order,
+            order=[ids[v] for v in order],
             domains=domains,
-            constraints=constraints,
+            model=model,
             assignment=assignment,
+            trail=trail,
             settings=settings,
             trace=trace,
             stats=stats,
         )
 
-        return CSPSolver._result(found, sol if found else None, trace, stats, settings)
+        solution = {model.names[i]: val for i, val in sol.items()} if found and sol is not None else None
+        return CSPSolver._result(found, solution, trace, stats, settings)
 
     @staticmethod
     def _backtrack(
         *,
-        variables: List[str],
-        order: List[str],
+        order: List[int],
         domains: Domains,
-        constraints: List[JsonDict],
+        model: CSPModel,
         assignment: Assignment,
+        trail: Trail,
         settings: Dict[str, str],
-        trace: List[JsonDict],
+        trace: CSPTrace,
         stats: CSPSolveStats,
     ) -> Tuple[bool, Optional[Assignment]]:
         """
@@ -188,29 +239,28 @@ class CSPSolver:
                - try values one by one:
                    * check consistency with current partial assignment
                    * commit assignment
-                   * run inference (FC) and/or maintain arc consistency (MAC via AC3)
+                   * run inference (FC) and/or maintain arc consistency (MAC via AC-3, MAC2001 via AC-2001)
                    * recurse
-                   * if failure, undo assignment and restore domains
+                   * if failure, undo assignment and pop the domain changes off the trail
 
                Args:
-                   variables: All variable names.
-                   order: Preferred variable order (used by FIXED and as tie-break).
-                   domains: Current domains (mutable; gets pruned by inference).
-                   constraints: List of binary constraints.
+                   order: Preferred variable order as ids (used by FIXED and as tie-break).
+                   domains: Current domains by variable id (mutable; gets pruned by inference).
+                   model: Compiled instance.
                    assignment: Current partial assignment (mutable).
+                   trail: Undo log of domain changes shared by the whole search (mutable).
                    settings: Uppercased solver settings.
-                   trace: Mutable list of trace step dicts.
+                   trace: Trace collector (records only what its level asks for).
                    stats: Mutable search statistics.
 
                Returns:
-                   (found, solution) where solution is a fresh dict copy if found.
+                   (found, solution) where solution is a fresh id -> value dict if found.
                """
 
-        if len(assignment) == len(variables):
+        if len(assignment) == len(model.names):
             return True, dict(assignment)
 
         var = select_unassigned_var(
-            variables,
             order,
             domains,
             assignment,
@@ -220,39 +270,42 @@ class CSPSolver:
         values = order_values(
             var,
             domains,
-            constraints,
+            model,
             assignment,
             heuristic=settings["value_heuristic"],
         )
 
-        trace.append({"step": "SELECT_VAR", "var": var, "domain": list(domains[var]), "ordered_values": list(values)})
+        trace.select(var, domains[var], values)
+
+        mac = MAINTAINED_ARC_CONSISTENCY.get(settings["consistency"])
 
         for val in values:
             stats.nodes += 1
 
-            if not is_consistent_with(var, val, assignment, constraints):
+            if not is_consistent_with(var, val, assignment, model):
                 stats.fails += 1
-                trace.append({"step": "TRY", "var": var, "val": val, "ok": False, "reason": "inconsistent"})
+                trace.attempt(var, val, False)
                 continue
 
             assignment[var] = val
-            trace.append({"step": "TRY", "var": var, "val": val, "ok": True})
+            trace.attempt(var, val, True)
 
-            saved_domains = {k: list(v) for k, v in domains.items()}
+            mark = len(trail)
             ok = True
             pruned_total = 0
 
             if settings["inference"] == "FC":
-                ok, pruned = forward_check(domains, constraints, assignment, last_assigned_vars=[var])
+                ok, pruned = forward_check(domains, model, assignment, last_assigned_vars=[var], trail=trail)
                 pruned_total += pruned
-                trace.append({"step": "FC", "var": var, "ok": ok, "domains": domains_snapshot(domains)})
+                trace.propagation("FC", ok, domains, var=var, trail=trail, mark=mark)
                 if not ok:
                     stats.fails += 1
 
-            if ok and settings["consistency"] == "MAC":
-                ok, pruned = ac3(domains, constraints, queue=arcs_touching([var], constraints))
+            if ok and mac is not None:
+                mac_mark = len(trail)
+                ok, pruned = mac(domains, model, queue=arcs_touching([var], model), trail=trail)
                 pruned_total += pruned
-                trace.append({"step": "MAC", "var": var, "ok": ok, "domains": domains_snapshot(domains)})
+                trace.propagation("MAC", ok, domains, var=var, trail=trail, mark=mac_mark)
                 if not ok:
                     stats.fails += 1
 
@@ -260,11 +313,11 @@ class CSPSolver:
 
             if ok:
                 found, sol = CSPSolver._backtrack(
-                    variables=variables,
                     order=order,
                     domains=domains,
-                    constraints=constraints,
+                    model=model,
                     assignment=assignment,
+                    trail=trail,
                     settings=settings,
                     trace=trace,
                     stats=stats,
@@ -273,11 +326,10 @@ class CSPSolver:
                     return True, sol
 
             stats.backtracks += 1
-            trace.append({"step": "BACKTRACK", "var": var, "val": val})
+            trace.backtrack(var, val)
 
             assignment.pop(var, None)
-            domains.clear()
-            domains.update({k: list(v) for k, v in saved_domains.items()})
+            undo(domains, trail, mark)
 
         return False, None
 
@@ -285,7 +337,7 @@ class CSPSolver:
     def _result(
         found: bool,
         solution: Optional[Assignment],
-        trace: List[JsonDict],
+        trace: CSPTrace,
         stats: CSPSolveStats,
         settings: Dict[str, str],
     ) -> JsonDict:
@@ -295,7 +347,7 @@ class CSPSolver:
               Args:
                   found: Whether a complete solution was found.
                   solution: Solution mapping if found, otherwise None.
-                  trace: Trace steps accumulated during preprocess/search.
+                  trace: Trace collector filled during preprocess/search.
                   stats: Search counters (nodes, backtracks, fails, prunes).
                   settings: Effective solver settings (uppercased).
 
@@ -314,5 +366,5 @@ class CSPSolver:
                 "fails": stats.fails,
                 "prunes": stats.prunes,
             },
-            "trace": trace,
+            "trace": trace.entries(),
         }
\ No newline at end of file
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from Backend.core.constrain_satisfaction_problems.instance_solver.csp_types import (
+    Domain,
+    Domains,
+    JsonDict,
+    Trail,
+    domain_values,
+    domains_snapshot,
+)
+
+"""
+csp_trace.py
+
+Step trace of a CSP solve, at a configurable level of detail.
+
+Levels:
+- OFF: nothing is recorded (callers that only need the solution)
+- DECISIONS: variable selections, value tries and backtracks, plus one entry per
+  propagation step with its outcome but without domains
+- FULL: DECISIONS plus the domains after every propagation step, either as full
+  snapshots (the default) or, with diff=True, as the values each step removed
+
+Recording is lazy: inference never edits a domain in place (it installs a new
+list or mask), so holding the domain references is as good as copying them.
+A step costs one shallow copy of the domains list, and the JSON-like entries
+are only built by entries() when the result is assembled.
+"""
+
+TRACE_OFF = "OFF"
+TRACE_DECISIONS = "DECISIONS"
+TRACE_FULL = "FULL"
+TRACE_LEVELS = (TRACE_OFF, TRACE_DECISIONS, TRACE_FULL)
+
+
+class CSPTrace:
+    """
+    Collects solver steps and turns them into trace entries on demand.
+
+    Attributes:
+        names: Variable names by id.
+        level: One of TRACE_LEVELS.
+        diff: Record removed values instead of full snapshots (FULL only).
+        decisions: Whether decision steps are recorded (level is not OFF).
+        snapshots: Whether propagation steps carry domains (level is FULL).
+    """
+
+    def __init__(self, names: Sequence[str], level: str = TRACE_FULL, *, diff: bool = False):
+        """
+        Args:
+            names: Variable names by id.
+            level: Trace level (case-insensitive).
+            diff: Encode propagation steps as removed values per variable.
+
+        Raises:
+            ValueError: If level is unknown.
+        """
+
+        level = (level or TRACE_FULL).upper()
+        if level not in TRACE_LEVELS:
+            raise ValueError(f"unknown trace level: {level} (expected one of {', '.join(TRACE_LEVELS)})")
+
+        self.names = names
+        self.level = level
+        self.diff = diff
+        self.decisions = level != TRACE_OFF
+        self.snapshots = level == TRACE_FULL
+        self._steps: List[Tuple[Any, ...]] = []
+
+    def select(self, var: int, domain: Domain, values: List[int]) -> None:
+        """Record a SELECT_VAR step (var's current domain and its value order)."""
+        if self.decisions:
+            self._steps.append(("SELECT_VAR", var, domain, values))
+
+    def attempt(self, var: int, val: int, ok: bool) -> None:
+        """Record a TRY step; ok=False means the value conflicts with the assignment."""
+        if self.decisions:
+            self._steps.append(("TRY", var, val, ok))
+
+    def backtrack(self, var: int, val: int) -> None:
+        """Record a BACKTRACK step."""
+        if self.decisions:
+            self._steps.append(("BACKTRACK", var, val))
+
+    def propagation(
+        self,
+        step: str,
+        ok: bool,
+        domains: Domains,
+        *,
+        var: Optional[int] = None,
+        trail: Optional[Trail] = None,
+        mark: int = 0,
+    ) -> None:
+        """
+        Record a propagation step (AC3_PRE, FC, MAC, ...).
+
+        Args:
+            step: Step name.
+            ok: False if the step wiped out a domain.
+            domains: Domains after the step.
+            var: Variable whose assignment triggered the step, if any.
+            trail: Undo log the step pushed its changes onto (needed for diff).
+            mark: len(trail) before the step.
+        """
+
+        if not self.decisions:
+            return
+        if not self.snapshots:
+            self._steps.append((step, var, ok, None))
+        elif self.diff and trail is not None:
+            # Oldest trail entry per variable is its domain before the step.
+            before: Dict[int, Domain] = {}
+            for x, previous in trail[mark:]:
+                before.setdefault(x, previous)
+            self._steps.append((step, var, ok, {x: (d, domains[x]) for x, d in before.items()}))
+        else:
+            self._steps.append((step, var, ok, list(domains)))
+
+    def entries(self) -> List[JsonDict]:
+        """
+        Build the trace entries.
+
+        Returns:
+            List of step dicts, in the order the steps happened.
+        """
+
+        names = self.names
+        out: List[JsonDict] = []
+        for s in self._steps:
+            kind = s[0]
+            if kind == "SELECT_VAR":
+                out.append({"step": kind, "var": names[s[1]], "domain": domain_values(s[2]), "ordered_values": list(s[3])})
+            elif kind == "TRY":
+                entry: JsonDict = {"step": kind, "var": names[s[1]], "val": s[2], "ok": s[3]}
+                if not s[3]:
+                    entry["reason"] = "inconsistent"
+                out.append(entry)
+            elif kind == "BACKTRACK":
+                out.append({"step": kind, "var": names[s[1]], "val": s[2]})
+            else:
+                _, var, ok, data = s
+                entry = {"step": kind}
+                if var is not None:
+                    entry["var"] = names[var]
+                entry["ok"] = ok
+                if isinstance(data, dict):
+                    entry["removed"] = {names[x]: _removed(old, new) for x, (old, new) in sorted(data.items())}
+                elif data is not None:
+                    entry["domains"] = domains_snapshot(data, names)
+                out.append(entry)
+        return out
+
+
+def _removed(old: Domain, new: Domain) -> List[int]:
+    kept = set(domain_values(new))
+    return [v for v in domain_values(old) if v not in kept]
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from Backend.core.constrain_satisfaction_problems.instance_solver.csp_bitset import mask_values
 
 """
 csp_types.py
@@ -10,15 +12,24 @@ Shared type aliases and small utilities for the CSP solver.
 
 This module defines:
 - JsonDict: JSON-like dict payload fragments
-- Domains: mapping var -> list[int] (current domain values)
-- Assignment: mapping var -> int (partial/complete assignment)
+- Domain: current values of one variable, as a list[int] or, with bitset
+  domains, an int mask (see csp_bitset)
+- Domains: list of Domain per variable id (see csp_model)
+- Assignment: mapping variable id -> int (partial/complete assignment)
+- Trail: undo log of domain changes made during search
 - CSPSolveStats: counters used for tracing solver effort
+- domain_values() / domain_size(): read a Domain in either representation
 - domains_snapshot(): deep-ish copy helper for trace logging
+- undo(): roll domains back to an earlier trail position
 """
 
 JsonDict = Dict[str, Any]
-Domains = Dict[str, List[int]]
-Assignment = Dict[str, int]
+Domain = Union[List[int], int]
+Domains = List[Domain]
+Assignment = Dict[int, int]
+# (var id, domain it replaced). Inference never edits a domain list in place,
+# it installs a new, smaller one, so keeping the old one is enough to undo it.
+Trail = List[Tuple[int, Domain]]
 
 
 @dataclass
@@ -39,7 +50,33 @@ class CSPSolveStats:
     prunes: int = 0
 
 
-def domains_snapshot(domains: Domains) -> Dict[str, List[int]]:
+def domain_values(domain: Domain) -> List[int]:
+    """
+    Return a domain's values as a new list.
+
+    Args:
+        domain: Value list or bitset mask.
+
+    Returns:
+        The values (ascending for masks).
+    """
+    return mask_values(domain) if isinstance(domain, int) else list(domain)
+
+
+def domain_size(domain: Domain) -> int:
+    """
+    Return the number of values left in a domain.
+
+    Args:
+        domain: Value list or bitset mask.
+
+    Returns:
+        Domain size.
+    """
+    return domain.bit_count() if isinstance(domain, int) else len(domain)
+
+
+def domains_snapshot(domains: Domains, names: Sequence[str]) -> Dict[str, List[int]]:
     """
     Return a snapshot copy of current domains.
 
@@ -47,9 +84,27 @@ def domains_snapshot(domains: Domains) -> Dict[str, List[int]]:
     overwrite the recorded view.
 
     Args:
-        domains: Current domains mapping var -> list[int].
+        domains: Current domains, indexed by variable id.
+        names: Variable names by id.
 
     Returns:
-        A new dict with new lists for each variable.
+        A new dict var name -> new list, in variable order.
+    """
+    return {names[i]: domain_values(d) for i, d in enumerate(domains)}
+
+
+def undo(domains: Domains, trail: Trail, mark: int) -> None:
+    """
+    Undo every domain change recorded on `trail` after position `mark`.
+
+    Entries are popped newest first, so a variable pruned several times ends up
+    with the domain it had at `mark`.
+
+    Args:
+        domains: Current domains, indexed by variable id (mutated in-place).
+        trail: Undo log filled by the inference routines.
+        mark: len(trail) at the point to return to.
     """
-    return {k: list(v) for k, v in domains.items()}
+    while len(trail) > mark:
+        var, previous = trail.pop()
+        domains[var] = previous
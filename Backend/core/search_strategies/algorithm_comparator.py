@@ -1,15 +1,74 @@
 from __future__ import annotations
 
+import atexit
+import os
+import random
+import statistics
+import threading
 import time
-from typing import Any, Optional
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Any, Iterator, Optional
 
 from Backend.core.search_strategies.problems.registry import build_problem
-from Backend.core.search_strategies.search_problem import SearchBudget
+from Backend.core.search_strategies.result_cache import instance_key, result_cache
+from Backend.core.search_strategies.search_problem import CancelToken, SearchBudget, SearchStats
 from Backend.core.search_strategies import algorithms_generic as ag
 from Backend.services import Logger
 
 log = Logger("SearchComparator")
 
+# Opt-in: run each algorithm in its own worker process instead of sequentially.
+PARALLEL_DEFAULT = os.getenv("SEARCH_COMPARATOR_PARALLEL", "").strip().lower() in ("1", "true", "yes")
+PARALLEL_WORKERS = int(os.getenv("SEARCH_COMPARATOR_WORKERS", "0") or 0)
+
+# Whole-request limits for callers that build a CancelToken (0 disables the deadline); early stopping is opt-in.
+DEADLINE_DEFAULT_S = float(os.getenv("SEARCH_COMPARATOR_DEADLINE_S", "30") or 0)
+EARLY_STOP_DEFAULT = os.getenv("SEARCH_COMPARATOR_EARLY_STOP", "").strip().lower() in ("1", "true", "yes")
+
+_pool: ProcessPoolExecutor | None = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+_trace_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class RankingPolicy:
+    repeats: int = 1  # measured runs per solving algorithm
+    warmup: int = 0  # discarded runs before measuring (the first, status-deciding run counts as one)
+    aggregate: str = "median"  # "median" or "min" over the measured samples
+    tie_tolerance: float = 0.0  # relative; times this close are ranked by expansions, then ALGORITHM_ORDER
+    settle: bool = True  # stop repeating an algorithm once it can no longer overtake the leader
+
+
+SINGLE_SHOT = RankingPolicy()
+# A handful of samples is enough to keep GC pauses and neighbour load out of the ranking, at the price of
+# re-running every solving algorithm six times.
+STABLE_RANKING = RankingPolicy(repeats=5, warmup=1, aggregate="median", tie_tolerance=0.02)
+
+# Ranking used for stored answers: one run per algorithm unless the slower, steadier ranking is opted into.
+STABLE_RANKING_DEFAULT = os.getenv("SEARCH_COMPARATOR_STABLE_RANKING", "").strip().lower() in ("1", "true", "yes")
+QUESTION_RANKING = STABLE_RANKING if STABLE_RANKING_DEFAULT else SINGLE_SHOT
+
+# "time" ranks by measured wall time; "expansions" ranks by the deterministic expansion count, which makes
+# results cacheable (see result_cache) at the price of ignoring per-node cost differences.
+RANK_BY_DEFAULT = os.getenv("SEARCH_COMPARATOR_RANK_BY", "time").strip().lower() or "time"
+
+# Simulated annealing is seeded when ranking by expansions so its counts are reproducible.
+_EXPANSIONS_SEED = 0
+
+# early_stop: once an algorithm has solved the instance, later sequential runs only get this multiple of
+# its time (never less than the floor), which is already far outside any tie tolerance.
+_EARLY_STOP_FACTOR = 2.0
+_EARLY_STOP_FLOOR_S = 0.01
+
+
+# Algorithms that return a cheapest solution (A* with the admissible heuristics every problem registers), so
+# their solution depth can be checked against a problem's known optimum.
+_OPTIMAL_ALGORITHMS = ("uniform_cost_search", "a_star", "bidirectional_search")
+
 
 def string_name(algorithm_name: str) -> str:
     names = {
@@ -45,6 +104,207 @@ def _auto_max_depth(problem: Any) -> int:
     return 25
 
 
+def _run_algorithm(problem: Any, key: str, budget: SearchBudget, seed: Optional[int] = None) -> Any:
+    if key == "breadth_first_search":
+        return ag.bfs(problem, budget)
+    if key == "depth_first_search":
+        return ag.dfs(problem, budget)
+    if key == "uniform_cost_search":
+        return ag.ucs(problem, budget)
+    if key == "iterative_deepening_depth_first_search":
+        md = _auto_max_depth(problem)
+        return ag.iddfs(problem, budget, max_depth=md)
+    if key == "backtracking":
+        return ag.backtracking(problem, budget)
+    if key == "bidirectional_search":
+        return ag.bidirectional_search(problem, budget)
+    if key == "greedy_best_first_search":
+        return ag.greedy_best_first(problem, budget)
+    if key == "hill_climbing":
+        return ag.hill_climbing(problem, budget)
+    if key == "simulated_annealing":
+        return ag.simulated_annealing(problem, budget, rng=random.Random(seed) if seed is not None else None)
+    if key == "beam_search":
+        return ag.beam_search(problem, budget, beam_width=20)
+    if key == "a_star":
+        return ag.a_star(problem, budget)
+
+    return None
+
+
+def _run_record(status: str, dt: Optional[float], sol: Any = None, note: Optional[str] = None, budget: SearchBudget | None = None) -> dict:
+    run = {
+        "status": status,
+        "time_s": dt,
+        "solution": sol,
+        "note": note,
+        "expansions": budget.expansions if budget is not None else None,
+    }
+    if budget is not None and budget.stats is not None:
+        budget.stats.expanded = budget.expansions
+        run["stats"] = budget.stats.as_dict()
+    return run
+
+
+# One run of one algorithm on a built problem, timed and classified; the building block of every comparison
+# and of the benchmark suite.
+def timed_run(
+    problem: Any,
+    key: str,
+    max_time_s: float,
+    max_expansions: int,
+    collect_stats: bool = False,
+    profile_memory: bool = False,
+    seed: Optional[int] = None,
+    cancel: Optional[CancelToken] = None,
+) -> dict:
+    if key == "bidirectional_search" and not ag.supports_bidirectional(problem):
+        return _run_record("not_applicable", None, note="Needs an explicit goal state (goal_state/predecessors)")
+
+    if cancel is not None:
+        if cancel.expired():
+            return _run_record("cancelled", None, note=_cancel_note(cancel))
+        left = cancel.remaining_s()
+        if left is not None:
+            max_time_s = min(max_time_s, left)
+
+    b = SearchBudget(
+        max_time_s=max_time_s,
+        max_expansions=max_expansions,
+        stats=SearchStats() if collect_stats or profile_memory else None,
+        cancel=cancel,
+    )
+
+    # tracemalloc slows allocation-heavy searches noticeably, so it only runs when asked for and the
+    # reported times of a profiled comparison are not comparable with unprofiled ones. Its peak counter is
+    # process-wide, so profiled runs hold _trace_lock; allocations made meanwhile by other threads still
+    # count towards the peak.
+    error: Optional[Exception] = None
+    with _trace_lock if profile_memory else nullcontext():
+        own_trace = profile_memory and not tracemalloc.is_tracing()
+        if profile_memory:
+            if own_trace:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            mem_base = tracemalloc.get_traced_memory()[0]
+
+        t0 = time.perf_counter()
+        try:
+            sol = _run_algorithm(problem, key, b, seed)
+        except Exception as e:
+            sol, error = None, e
+        finally:
+            dt = time.perf_counter() - t0
+            if profile_memory:
+                b.stats.peak_bytes = max(0, tracemalloc.get_traced_memory()[1] - mem_base)
+                if own_trace:
+                    tracemalloc.stop()
+
+    if error is not None:
+        return _run_record("runtime_error", dt, note=str(error), budget=b)
+
+    if sol is None:
+        if cancel is not None and cancel.expired():
+            return _run_record("cancelled", dt, note=_cancel_note(cancel), budget=b)
+        run = _run_record("no_solution", dt, budget=b)
+        if b.expansions < b.max_expansions and dt >= b.max_time_s:
+            run["timed_out"] = True
+        return run
+    run = _run_record("solved", dt, sol, budget=b)
+    # Needs the solution depth, which a returned state does not carry, so "optimal" is only reported for
+    # runs with stats (collect_stats or profile_memory).
+    check = getattr(problem, "is_optimal_cost", None)
+    depth = (run.get("stats") or {}).get("solution_depth")
+    if key in _OPTIMAL_ALGORITHMS and callable(check) and depth is not None:
+        run["optimal"] = check(depth)
+    return run
+
+
+def request_token() -> CancelToken:
+    return CancelToken(deadline_s=DEADLINE_DEFAULT_S if DEADLINE_DEFAULT_S > 0 else None)
+
+
+def _cancel_note(cancel: CancelToken) -> str:
+    return "Request cancelled" if cancel.cancelled else "Request deadline reached"
+
+
+def _worker_run(
+    problem_key: str,
+    instance: dict,
+    heuristic: Optional[str],
+    key: str,
+    max_time_s: float,
+    max_expansions: int,
+    collect_stats: bool,
+    profile_memory: bool = False,
+    seed: Optional[int] = None,
+    deadline_at: Optional[float] = None,
+) -> dict:
+    # Executed inside a pool worker: rebuild the problem locally so only plain data crosses the process boundary.
+    # The request deadline arrives as a wall-clock instant, since a queued task may start well after submission.
+    problem = build_problem(problem_key, instance, heuristic=heuristic)
+    cancel = CancelToken(deadline_s=deadline_at - time.time()) if deadline_at is not None else None
+    return timed_run(problem, key, max_time_s, max_expansions, collect_stats, profile_memory, seed, cancel)
+
+
+def _worker_ping() -> int:
+    return os.getpid()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None:
+            _pool_workers = max(1, PARALLEL_WORKERS or min(len(AlgorithmComparator.ALGORITHM_ORDER), os.cpu_count() or 1))
+            _pool = ProcessPoolExecutor(max_workers=_pool_workers)
+            log.ok("Search worker pool started", {"workers": _pool_workers})
+        return _pool
+
+
+def _reset_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+atexit.register(_reset_pool)
+
+
+def _progress_event(key: str, run: dict, done: int, total: int) -> dict:
+    return {"event": "algorithm", "done": done, "total": total, "timing": _timing_entry(key, run)}
+
+
+def _aggregate(samples: list[float], how: str) -> float:
+    if how == "min":
+        return min(samples)
+    if how == "median":
+        return statistics.median(samples)
+    raise ValueError(f"unknown ranking aggregate '{how}'")
+
+
+def _timing_entry(key: str, run: dict) -> dict:
+    dt = run["time_s"]
+    entry = {
+        "key": key,
+        "name": string_name(key),
+        "status": run["status"],
+        "time_s": round(dt, 6) if dt is not None else None,
+        "time_ms": round(dt * 1000.0, 3) if dt is not None else None,
+        "expansions": run["expansions"],
+    }
+    if run.get("samples") is not None:
+        entry["samples"] = run["samples"]
+    if run.get("note") is not None:
+        entry["note"] = run["note"]
+    if run.get("optimal") is not None:
+        entry["optimal"] = run["optimal"]
+    if "stats" in run:
+        entry["stats"] = run["stats"]
+    return entry
+
+
 class AlgorithmComparator:
     ALGORITHM_ORDER = [
         "breadth_first_search",
@@ -61,116 +321,274 @@ class AlgorithmComparator:
     ]
 
     @staticmethod
-    def compare(problem_key: str, instance: dict, budget: SearchBudget | None = None) -> Optional[dict]:
-        problem = build_problem(problem_key, instance)
+    def warm_up() -> int:
+        # Spawn the workers before the first request so no question pays the fork/import cost.
+        pool = _get_pool()
+        futures = [pool.submit(_worker_ping) for _ in range(_pool_workers)]
+        return len({f.result() for f in futures})
+
+    @staticmethod
+    def compare(
+        problem_key: str,
+        instance: dict,
+        budget: SearchBudget | None = None,
+        *,
+        parallel: bool | None = None,
+        heuristic: str | None = None,
+        collect_stats: bool = False,
+        profile_memory: bool = False,
+        ranking: RankingPolicy = SINGLE_SHOT,
+        rank_by: str | None = None,
+        cancel: CancelToken | None = None,
+        early_stop: bool | None = None,
+    ) -> Optional[dict]:
+        result: Optional[dict] = None
+        events = AlgorithmComparator.iter_compare(
+            problem_key,
+            instance,
+            budget,
+            parallel=parallel,
+            heuristic=heuristic,
+            collect_stats=collect_stats,
+            profile_memory=profile_memory,
+            ranking=ranking,
+            rank_by=rank_by,
+            cancel=cancel,
+            early_stop=early_stop,
+        )
+        for event in events:
+            if event["event"] == "result":
+                result = event["comparison"]
+        return result
+
+    @staticmethod
+    def iter_compare(
+        problem_key: str,
+        instance: dict,
+        budget: SearchBudget | None = None,
+        *,
+        parallel: bool | None = None,
+        heuristic: str | None = None,
+        collect_stats: bool = False,
+        profile_memory: bool = False,
+        ranking: RankingPolicy = SINGLE_SHOT,
+        rank_by: str | None = None,
+        cancel: CancelToken | None = None,
+        early_stop: bool | None = None,
+    ) -> Iterator[dict]:
+        # Yields {"event": "algorithm", ...} for every first-pass run as soon as it finishes (completion order
+        # when running on the pool), {"event": "ranking", ...} if solving algorithms are about to be re-run,
+        # and finally exactly one {"event": "result", "comparison": <compare() result>}.
+        # `cancel` bounds the whole comparison: once it expires, running searches stop at their next budget
+        # check, the remaining ones are reported as "cancelled" and ranking uses whatever has been measured.
+        # Closing the generator (client gone) drops the pool tasks that have not started yet.
+        problem = build_problem(problem_key, instance, heuristic=heuristic)
         budget_base = budget or SearchBudget()
+        use_pool = PARALLEL_DEFAULT if parallel is None else bool(parallel)
+        early_stop = EARLY_STOP_DEFAULT if early_stop is None else bool(early_stop)
+        order = AlgorithmComparator.ALGORITHM_ORDER
+        rank_by = rank_by or RANK_BY_DEFAULT
+        if rank_by not in ("time", "expansions"):
+            raise ValueError(f"unknown rank_by '{rank_by}' (expected 'time' or 'expansions')")
+        seed = _EXPANSIONS_SEED if rank_by == "expansions" else None
 
-        results: dict[str, tuple[float, Any]] = {}
-        timings: list[dict] = []
-
-        def run_alg(key: str) -> Any:
-            b = SearchBudget(max_time_s=budget_base.max_time_s, max_expansions=budget_base.max_expansions)
-
-            if key == "breadth_first_search":
-                return ag.bfs(problem, b)
-            if key == "depth_first_search":
-                return ag.dfs(problem, b)
-            if key == "uniform_cost_search":
-                return ag.ucs(problem, b)
-            if key == "iterative_deepening_depth_first_search":
-                md = _auto_max_depth(problem)
-                return ag.iddfs(problem, b, max_depth=md)
-            if key == "backtracking":
-                return ag.backtracking(problem, b)
-            if key == "greedy_best_first_search":
-                return ag.greedy_best_first(problem, b)
-            if key == "hill_climbing":
-                return ag.hill_climbing(problem, b)
-            if key == "simulated_annealing":
-                return ag.simulated_annealing(problem, b)
-            if key == "beam_search":
-                return ag.beam_search(problem, b, beam_width=20)
-            if key == "a_star":
-                return ag.a_star(problem, b)
+        # Stats and memory samples are not cached, so asking for them always means a fresh run.
+        cache_key = None
+        if rank_by == "expansions" and result_cache.enabled and not (collect_stats or profile_memory):
+            cache_key = instance_key(problem_key, problem, budget_base.max_expansions, order)
+            cached = result_cache.get(cache_key)
+            if cached is not None and all(alg in cached for alg in order):
+                runs = {alg: dict(cached[alg]) for alg in order}
+                summary = AlgorithmComparator._summarize(problem, runs, rank_by, cached=True)
+                if summary is not None:
+                    # Solutions are not cached; with the fixed seed a re-run of the winner reproduces it (should
+                    # that run fail, e.g. on cancellation, the comparison is done afresh below).
+                    best = timed_run(
+                        problem, summary["fastest_algorithm_key"], budget_base.max_time_s, budget_base.max_expansions, seed=seed, cancel=cancel
+                    )
+                    summary["solution"] = best["solution"] if best["status"] == "solved" else None
+                if summary is None or summary["solution"] is not None:
+                    for i, alg in enumerate(order, start=1):
+                        yield _progress_event(alg, runs[alg], i, len(order))
+                    yield {"event": "result", "comparison": summary}
+                    return
 
-            return None
+        def run_batch_iter(algs: list[str], early: bool = False) -> Iterator[tuple[str, dict]]:
+            nonlocal use_pool
+            done: set[str] = set()
+            futures: dict = {}
 
-        for alg in AlgorithmComparator.ALGORITHM_ORDER:
-            if alg == "bidirectional_search":
-                timings.append(
-                    {
-                        "key": alg,
-                        "name": string_name(alg),
-                        "status": "not_implemented",
-                        "time_s": None,
-                        "time_ms": None,
-                        "note": "Not implemented in algorithms_generic",
+            if use_pool:
+                left = cancel.remaining_s() if cancel is not None else None
+                deadline_at = time.time() + left if left is not None else None
+                try:
+                    pool = _get_pool()
+                    futures = {
+                        alg: pool.submit(
+                            _worker_run,
+                            problem_key,
+                            instance,
+                            heuristic,
+                            alg,
+                            budget_base.max_time_s,
+                            budget_base.max_expansions,
+                            collect_stats,
+                            profile_memory,
+                            seed,
+                            deadline_at,
+                        )
+                        for alg in algs
                     }
-                )
-                continue
+                except Exception as e:
+                    log.error("Search worker pool unavailable, running sequentially", exc=e)
+                    _reset_pool()
+                    use_pool = False
+                    futures = {}
 
-            t0 = time.perf_counter()
             try:
-                sol = run_alg(alg)
-                dt = time.perf_counter() - t0
-            except Exception as e:
-                dt = time.perf_counter() - t0
-                timings.append(
-                    {
-                        "key": alg,
-                        "name": string_name(alg),
-                        "status": "runtime_error",
-                        "time_s": round(dt, 6),
-                        "time_ms": round(dt * 1000.0, 3),
-                        "note": str(e),
-                    }
-                )
-                continue
-
-            if sol is None:
-                timings.append(
-                    {
-                        "key": alg,
-                        "name": string_name(alg),
-                        "status": "no_solution",
-                        "time_s": round(dt, 6),
-                        "time_ms": round(dt * 1000.0, 3),
-                    }
+                by_future = {fut: alg for alg, fut in futures.items()}
+                for fut in as_completed(by_future):
+                    alg = by_future[fut]
+                    try:
+                        run = fut.result()
+                    except Exception as e:
+                        log.error("Search worker failed", ctx={"algorithm": alg}, exc=e)
+                        run = _run_record("runtime_error", None, note=str(e))
+                    if run["status"] == "no_solution" and cancel is not None and cancel.expired():
+                        run = {**run, "status": "cancelled", "note": _cancel_note(cancel)}
+                    done.add(alg)
+                    yield alg, run
+            finally:
+                for fut in futures.values():
+                    fut.cancel()
+
+            # With early stopping, every sequential run after the first solve is capped: a search that needs
+            # more than _EARLY_STOP_FACTOR times the best time (or more expansions than the best, when ranking
+            # by expansions) cannot win, so it is cut off and reported as such. Pool runs all start at once
+            # and are not capped. When the ranking treats this pass as a warm-up its times are cold, so they
+            # never set a time cap; the expansion cap does not depend on timing and always applies.
+            max_t, max_exp = budget_base.max_time_s, budget_base.max_expansions
+            for alg in algs:
+                if alg in done:
+                    continue
+                run = timed_run(problem, alg, max_t, max_exp, collect_stats, profile_memory, seed, cancel)
+                cut = run["status"] == "no_solution" and (
+                    (run.get("timed_out") and max_t < budget_base.max_time_s)
+                    or (run["expansions"] >= max_exp and max_exp < budget_base.max_expansions)
                 )
-                continue
-
-            results[alg] = (dt, sol)
-            timings.append(
-                {
-                    "key": alg,
-                    "name": string_name(alg),
-                    "status": "solved",
-                    "time_s": round(dt, 6),
-                    "time_ms": round(dt * 1000.0, 3),
-                }
-            )
+                if cut:
+                    run = {**run, "status": "cutoff", "note": "Stopped early: could no longer beat the best run"}
+                    run.pop("timed_out", None)
+                elif early and run["status"] == "solved":
+                    if rank_by == "expansions":
+                        max_exp = min(max_exp, run["expansions"] + 1)
+                    elif ranking.warmup == 0:
+                        max_t = min(max_t, max(run["time_s"] * _EARLY_STOP_FACTOR, _EARLY_STOP_FLOOR_S))
+                yield alg, run
+
+        def run_batch(algs: list[str]) -> dict[str, dict]:
+            return dict(run_batch_iter(algs))
+
+        # The first pass decides each algorithm's status; only solving algorithms are ever re-run.
+        runs: dict[str, dict] = {}
+        for alg, run in run_batch_iter(list(order), early=early_stop):
+            runs[alg] = run
+            yield _progress_event(alg, run, len(runs), len(order))
+        solved = [alg for alg in order if runs[alg]["status"] == "solved"]
+
+        incomplete = ("runtime_error", "cancelled", "cutoff")
+        if cache_key is not None and not any(r.get("timed_out") or r["status"] in incomplete for r in runs.values()):
+            result_cache.put(cache_key, runs)
+
+        if not solved or rank_by == "expansions":
+            yield {"event": "result", "comparison": AlgorithmComparator._summarize(problem, runs, rank_by)}
+            return
+
+        first_time = {alg: runs[alg]["time_s"] for alg in solved}
+        samples: dict[str, list[float]] = {alg: [] if ranking.warmup > 0 else [first_time[alg]] for alg in solved}
+        attempts = {alg: len(samples[alg]) for alg in solved}
+
+        if ranking.repeats > 1 or ranking.warmup > 1:
+            yield {"event": "ranking", "contenders": len(solved), "repeats": ranking.repeats}
+
+        def live() -> bool:
+            return cancel is None or not cancel.expired()
 
-        if not results:
+        for _ in range(ranking.warmup - 1):
+            if not live():
+                break
+            run_batch(solved)
+
+        contenders = list(solved)
+        tol = max(0.0, float(ranking.tie_tolerance))
+        settle_after = max(1, min(3, ranking.repeats))
+        while live():
+            batch = [alg for alg in contenders if attempts[alg] < ranking.repeats]
+            if not batch:
+                break
+            for alg, run in run_batch(batch).items():
+                attempts[alg] += 1
+                # Stochastic algorithms may miss on a repeat; the status-deciding run still stands.
+                if run["status"] == "solved":
+                    samples[alg].append(run["time_s"])
+
+            if ranking.settle and len(contenders) > 1 and all(len(samples[alg]) >= settle_after for alg in contenders):
+                leader = min(contenders, key=lambda a: _aggregate(samples[a], ranking.aggregate))
+                ceiling = max(samples[leader]) * (1.0 + tol)
+                contenders = [alg for alg in contenders if alg == leader or min(samples[alg]) <= ceiling]
+
+        for alg in solved:
+            runs[alg]["time_s"] = _aggregate(samples[alg] or [first_time[alg]], ranking.aggregate)
+            if ranking.repeats > 1:
+                runs[alg]["samples"] = len(samples[alg])
+
+        yield {"event": "result", "comparison": AlgorithmComparator._summarize(problem, runs, rank_by, tie_tolerance=tol)}
+
+    @staticmethod
+    def _summarize(problem: Any, runs: dict[str, dict], rank_by: str, *, tie_tolerance: float = 0.0, cached: bool = False) -> Optional[dict]:
+        order = AlgorithmComparator.ALGORITHM_ORDER
+        solved = [alg for alg in order if runs[alg]["status"] == "solved"]
+        if not solved:
             return None
 
-        best_alg = min(results, key=lambda k: results[k][0])
-        best_t, best_sol = results[best_alg]
-        best_t = float(best_t)
+        def work(alg: str) -> int:
+            exp = runs[alg].get("expansions")
+            return exp if exp is not None else 10**18
 
-        for t in timings:
-            ms = t.get("time_ms")
-            if isinstance(ms, (int, float)) and best_t > 0:
-                t["pct_of_fastest"] = (float(ms) / (best_t * 1000.0)) * 100.0
+        # Ties (within tolerance for times, exact for expansions) fall back to the deterministic work
+        # counter and then to ALGORITHM_ORDER, so equal runs always produce the same answer.
+        if rank_by == "expansions":
+            fewest = min(work(alg) for alg in solved)
+            tied = [alg for alg in solved if work(alg) == fewest]
+        else:
+            fastest_t = min(runs[alg]["time_s"] for alg in solved)
+            tied = [alg for alg in solved if runs[alg]["time_s"] <= fastest_t * (1.0 + tie_tolerance)]
+        best_alg = min(tied, key=lambda a: (work(a), order.index(a)))
+        best_t = runs[best_alg]["time_s"]
 
-        timings_sorted = sorted(
-            timings,
-            key=lambda x: (x["time_s"] is None, x["time_s"] if isinstance(x["time_s"], (int, float)) else 10**18),
-        )
+        timings = [_timing_entry(alg, runs[alg]) for alg in order]
+        if best_t:
+            for t in timings:
+                ms = t.get("time_ms")
+                if isinstance(ms, (int, float)):
+                    t["pct_of_fastest"] = (float(ms) / (best_t * 1000.0)) * 100.0
+
+        if rank_by == "expansions":
+            rank_key = lambda x: (x["status"] != "solved", x["key"] != best_alg, work(x["key"]), order.index(x["key"]))
+        else:
+            rank_key = lambda x: (
+                x["time_s"] is None,
+                x["key"] != best_alg,
+                x["time_s"] if isinstance(x["time_s"], (int, float)) else 10**18,
+            )
 
         return {
             "fastest_algorithm_key": best_alg,
             "fastest_algorithm": string_name(best_alg),
-            "execution_time": round(best_t, 6),
-            "solution": best_sol,
-            "timings": timings_sorted,
-        }
\ No newline at end of file
+            "execution_time": round(float(best_t), 6) if best_t is not None else None,
+            "solution": runs[best_alg].get("solution"),
+            "heuristic": getattr(problem, "heuristic_name", None),
+            "ranked_by": rank_by,
+            "cached": cached,
+            "timings": sorted(timings, key=rank_key),
+        }
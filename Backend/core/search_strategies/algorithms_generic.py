@@ -4,42 +4,129 @@ import heapq
 import math
 import random
 from collections import deque
-from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+from operator import itemgetter
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Sequence, Tuple
 
-from Backend.core.search_strategies.search_problem import SearchBudget, SearchProblem, State
+from Backend.core.search_strategies.search_problem import (
+    BidirectionalSearchProblem,
+    Expansion,
+    SearchBudget,
+    SearchProblem,
+    SearchStats,
+    State,
+)
+
+BatchExpander = Callable[[Sequence[State], bool], List[List[Expansion]]]
+
+# States handed to expand_batch per call by BFS; large enough to amortize the call, small enough that a
+# goal early in the batch does not hold back much work.
+_BFS_BATCH = 64
+
+
+def _counted(stats: SearchStats, children: Iterable[Tuple[State, int]]) -> List[Tuple[State, int]]:
+    out = children if isinstance(children, list) else list(children)
+    stats.generated += len(out)
+    return out
+
+
+def _solved(stats: Optional[SearchStats], problem: SearchProblem, state: State, depth: Optional[int] = None) -> State:
+    if stats is not None:
+        if depth is None:
+            depth_fn = getattr(problem, "depth", None)
+            depth = depth_fn(state) if callable(depth_fn) else None
+        stats.solution_depth = depth
+    return state
+
+
+def _ranker(problem: SearchProblem) -> Callable[[State], Tuple[float, float]]:
+    # (estimate, tie-break) per state; problems without rank() never break ties.
+    fn = getattr(problem, "rank", None)
+    if callable(fn):
+        return fn
+    heuristic = problem.heuristic
+    return lambda s: (heuristic(s), 0.0)
+
+
+def _batch_expander(problem: SearchProblem) -> Optional[BatchExpander]:
+    fn = getattr(problem, "expand_batch", None)
+    return fn if callable(fn) else None
 
 
 def bfs(problem: SearchProblem, budget: SearchBudget) -> Optional[State]:
+    expand = _batch_expander(problem)
+    if expand is not None:
+        return _bfs_batched(problem, budget, expand)
+
     q = deque([problem.initial_state()])
     seen = {problem.key(q[0])}
+    st = budget.stats
 
     while q:
-        if budget.exceeded():
+        if budget.step():
             return None
-        budget.tick()
 
         s = q.popleft()
         if problem.is_goal(s):
-            return s
+            return _solved(st, problem, s)
+
+        children = problem.neighbors(s)
+        if st is not None:
+            children = _counted(st, children)
 
-        for ns, _cost in problem.neighbors(s):
+        for ns, _cost in children:
             k = problem.key(ns)
             if k in seen:
                 continue
             seen.add(k)
             q.append(ns)
 
+        if st is not None:
+            st.observe(len(q), len(seen))
+
+    return None
+
+
+def _bfs_batched(problem: SearchProblem, budget: SearchBudget, expand: BatchExpander) -> Optional[State]:
+    # Pops up to _BFS_BATCH states, goal-tests them in FIFO order, then expands them in one call. Their
+    # children land behind everything already queued, so the visiting order matches the one-by-one loop.
+    q = deque([problem.initial_state()])
+    seen = {problem.key(q[0])}
+    st = budget.stats
+    is_goal = problem.is_goal
+
+    while q:
+        batch: List[State] = []
+        for _ in range(min(_BFS_BATCH, len(q))):
+            if budget.step():
+                return None
+            s = q.popleft()
+            if is_goal(s):
+                return _solved(st, problem, s)
+            batch.append(s)
+
+        for children in expand(batch, False):
+            if st is not None:
+                st.generated += len(children)
+            for ns, k, _cost, _h in children:
+                if k in seen:
+                    continue
+                seen.add(k)
+                q.append(ns)
+
+        if st is not None:
+            st.observe(len(q), len(seen))
+
     return None
 
 
 def dfs(problem: SearchProblem, budget: SearchBudget) -> Optional[State]:
     stack = [problem.initial_state()]
     seen = set()
+    st = budget.stats
 
     while stack:
-        if budget.exceeded():
+        if budget.step():
             return None
-        budget.tick()
 
         s = stack.pop()
         k = problem.key(s)
@@ -48,12 +135,19 @@ def dfs(problem: SearchProblem, budget: SearchBudget) -> Optional[State]:
         seen.add(k)
 
         if problem.is_goal(s):
-            return s
+            return _solved(st, problem, s)
+
+        children = problem.neighbors(s)
+        if st is not None:
+            children = _counted(st, children)
 
         # LIFO: push neighbors
-        for ns, _ in problem.neighbors(s):
+        for ns, _ in children:
             stack.append(ns)
 
+        if st is not None:
+            st.observe(len(stack), len(seen))
+
     return None
 
 
@@ -61,11 +155,11 @@ def ucs(problem: SearchProblem, budget: SearchBudget) -> Optional[State]:
     start = problem.initial_state()
     pq: List[Tuple[int, State]] = [(0, start)]
     best: Dict[Hashable, int] = {problem.key(start): 0}
+    st = budget.stats
 
     while pq:
-        if budget.exceeded():
+        if budget.step():
             return None
-        budget.tick()
 
         g, s = heapq.heappop(pq)
         k = problem.key(s)
@@ -73,102 +167,157 @@ def ucs(problem: SearchProblem, budget: SearchBudget) -> Optional[State]:
             continue
 
         if problem.is_goal(s):
-            return s
+            return _solved(st, problem, s, g)
 
-        for ns, step in problem.neighbors(s):
+        children = problem.neighbors(s)
+        if st is not None:
+            children = _counted(st, children)
+
+        for ns, step in children:
             ng = g + int(step)
             nk = problem.key(ns)
             if ng < best.get(nk, 10**18):
                 best[nk] = ng
                 heapq.heappush(pq, (ng, ns))
 
+        if st is not None:
+            st.observe(len(pq), len(best))
+
     return None
 
 
 def greedy_best_first(problem: SearchProblem, budget: SearchBudget) -> Optional[State]:
     start = problem.initial_state()
-    pq: List[Tuple[float, State]] = [(problem.heuristic(start), start)]
+    rank = _ranker(problem)
+    pq: List[Tuple[float, float, State]] = [(*rank(start), start)]
     seen = set()
+    st = budget.stats
 
     while pq:
-        if budget.exceeded():
+        if budget.step():
             return None
-        budget.tick()
 
-        h, s = heapq.heappop(pq)
+        h, _tb, s = heapq.heappop(pq)
         k = problem.key(s)
         if k in seen:
             continue
         seen.add(k)
 
         if problem.is_goal(s):
-            return s
+            return _solved(st, problem, s)
+
+        children = problem.neighbors(s)
+        if st is not None:
+            children = _counted(st, children)
+
+        for ns, _ in children:
+            heapq.heappush(pq, (*rank(ns), ns))
 
-        for ns, _ in problem.neighbors(s):
-            heapq.heappush(pq, (problem.heuristic(ns), ns))
+        if st is not None:
+            st.observe(len(pq), len(seen))
 
     return None
 
 
 def a_star(problem: SearchProblem, budget: SearchBudget) -> Optional[State]:
     start = problem.initial_state()
-    pq: List[Tuple[float, int, State]] = [(problem.heuristic(start), 0, start)]
+    # Entries are (g + h, tie-break, g, state): the tie-break only orders equal f values.
+    rank = _ranker(problem)
+    pq: List[Tuple[float, float, int, State]] = [(*rank(start), 0, start)]
     best: Dict[Hashable, int] = {problem.key(start): 0}
+    st = budget.stats
 
     while pq:
-        if budget.exceeded():
+        if budget.step():
             return None
-        budget.tick()
 
-        f, g, s = heapq.heappop(pq)
+        f, _tb, g, s = heapq.heappop(pq)
         k = problem.key(s)
         if g != best.get(k, 10**18):
             continue
 
         if problem.is_goal(s):
-            return s
+            return _solved(st, problem, s, g)
+
+        children = problem.neighbors(s)
+        if st is not None:
+            children = _counted(st, children)
 
-        for ns, step in problem.neighbors(s):
+        for ns, step in children:
             ng = g + int(step)
             nk = problem.key(ns)
             if ng < best.get(nk, 10**18):
                 best[nk] = ng
-                heapq.heappush(pq, (ng + problem.heuristic(ns), ng, ns))
+                h, tb = rank(ns)
+                heapq.heappush(pq, (ng + h, tb, ng, ns))
+
+        if st is not None:
+            st.observe(len(pq), len(best))
 
     return None
 
 
-def iddfs(problem: SearchProblem, budget: SearchBudget, max_depth: int) -> Optional[State]:
-    start = problem.initial_state()
+def _path_dfs(problem: SearchProblem, budget: SearchBudget, start: State, depth_limit: Optional[int]) -> Optional[State]:
+    # Explicit-stack DFS that only forbids revisiting states on the current path. Visits children in the
+    # same order as the recursive formulation and ticks the budget once per entered node. stack[i] holds
+    # the remaining children of the i-th node on the path (stack[0] is a virtual root); `path` is an
+    # insertion-ordered dict, so popitem() undoes exactly the most recently entered node.
+    st = budget.stats
+    key, is_goal, neighbors, step = problem.key, problem.is_goal, problem.neighbors, budget.step
+    limit = depth_limit if depth_limit is not None else -1
+    path: dict[Hashable, None] = {}
+    stack: list[Iterator[Tuple[State, int]]] = [iter(((start, 0),))]
 
-    def dls(s: State, depth: int, path_seen: set[Hashable]) -> Optional[State]:
-        if budget.exceeded():
-            return None
-        budget.tick()
+    while stack:
+        for s, _ in stack[-1]:
+            k = key(s)
+            if k not in path:
+                break
+        else:
+            stack.pop()
+            if stack:
+                path.popitem()
+            continue
 
-        if problem.is_goal(s):
-            return s
-        if depth == 0:
+        if step():
             return None
 
-        k = problem.key(s)
-        path_seen.add(k)
+        if is_goal(s):
+            return _solved(st, problem, s, len(path))
+        if len(path) == limit:
+            continue
 
-        for ns, _ in problem.neighbors(s):
-            nk = problem.key(ns)
-            if nk in path_seen:
-                continue
-            res = dls(ns, depth - 1, path_seen)
-            if res is not None:
-                return res
+        path[k] = None
+
+        children = neighbors(s)
+        if st is not None:
+            children = _counted(st, children)
+            st.observe(len(path), len(path))
+
+        if len(path) == limit:
+            # Children sit on the depth limit: visit them in place instead of pushing a frame each.
+            for c, _ in children:
+                if key(c) in path:
+                    continue
+                if step():
+                    return None
+                if is_goal(c):
+                    return _solved(st, problem, c, limit)
+            path.popitem()
+            continue
 
-        path_seen.remove(k)
-        return None
+        stack.append(iter(children))
+
+    return None
+
+
+def iddfs(problem: SearchProblem, budget: SearchBudget, max_depth: int) -> Optional[State]:
+    start = problem.initial_state()
 
     for d in range(max_depth + 1):
         if budget.exceeded():
             return None
-        res = dls(start, d, set())
+        res = _path_dfs(problem, budget, start, d)
         if res is not None:
             return res
 
@@ -176,57 +325,129 @@ def iddfs(problem: SearchProblem, budget: SearchBudget, max_depth: int) -> Optio
 
 
 def backtracking(problem: SearchProblem, budget: SearchBudget) -> Optional[State]:
-    start = problem.initial_state()
+    return _path_dfs(problem, budget, problem.initial_state(), None)
 
-    def rec(s: State, path_seen: set[Hashable]) -> Optional[State]:
-        if budget.exceeded():
+
+def supports_bidirectional(problem: SearchProblem) -> bool:
+    return callable(getattr(problem, "goal_state", None)) and callable(getattr(problem, "predecessors", None))
+
+
+def bidirectional_search(problem: BidirectionalSearchProblem, budget: SearchBudget) -> Optional[State]:
+    # Bidirectional uniform-cost search (plain bidirectional BFS when every step costs 1).
+    # Each round expands the side with the smaller frontier; the search stops once the cheapest
+    # frontier entries on both sides cannot improve the best meeting cost found so far.
+    start = problem.initial_state()
+    goal = problem.goal_state()
+    st = budget.stats
+    if problem.is_goal(start):
+        return _solved(st, problem, start, 0)
+
+    INF = 10**18
+    best_f: Dict[Hashable, int] = {problem.key(start): 0}
+    best_b: Dict[Hashable, int] = {problem.key(goal): 0}
+    pq_f: List[Tuple[int, State]] = [(0, start)]
+    pq_b: List[Tuple[int, State]] = [(0, goal)]
+    mu = best_b.get(problem.key(start), INF)
+
+    while pq_f and pq_b:
+        if pq_f[0][0] + pq_b[0][0] >= mu:
+            return _solved(st, problem, goal, mu)
+        if budget.step():
             return None
-        budget.tick()
 
-        if problem.is_goal(s):
-            return s
+        if len(pq_f) <= len(pq_b):
+            pq, best, other, expand = pq_f, best_f, best_b, problem.neighbors
+        else:
+            pq, best, other, expand = pq_b, best_b, best_f, problem.predecessors
 
-        k = problem.key(s)
-        path_seen.add(k)
+        g, s = heapq.heappop(pq)
+        if g != best.get(problem.key(s), INF):
+            continue
+
+        children = expand(s)
+        if st is not None:
+            children = _counted(st, children)
 
-        for ns, _ in problem.neighbors(s):
+        for ns, step in children:
+            ng = g + int(step)
             nk = problem.key(ns)
-            if nk in path_seen:
-                continue
-            res = rec(ns, path_seen)
-            if res is not None:
-                return res
+            if ng < best.get(nk, INF):
+                best[nk] = ng
+                heapq.heappush(pq, (ng, ns))
+                meet = other.get(nk)
+                if meet is not None and ng + meet < mu:
+                    mu = ng + meet
 
-        path_seen.remove(k)
-        return None
+        if st is not None:
+            st.observe(len(pq_f) + len(pq_b), len(best_f) + len(best_b))
 
-    return rec(start, set())
+    return _solved(st, problem, goal, mu) if mu < INF else None
 
 
 def beam_search(problem: SearchProblem, budget: SearchBudget, beam_width: int = 20) -> Optional[State]:
     frontier = [problem.initial_state()]
+    st = budget.stats
+    level = 0
+    expand = _batch_expander(problem)
+    rank = _ranker(problem)
+    width = max(1, int(beam_width))
 
     while frontier:
         if budget.exceeded():
             return None
 
+        if expand is not None:
+            # Goal-test the whole level first, then score every child in one batch; the stable sort on the
+            # returned heuristic keeps the same beam as sorting with rank() (expand_batch leaves it None
+            # under heuristics whose rank() breaks ties).
+            for s in frontier:
+                if budget.step():
+                    return None
+                if problem.is_goal(s):
+                    return _solved(st, problem, s, level)
+
+            scored: List[Tuple[State, Tuple[float, float]]] = []
+            push = scored.append
+            for children in expand(frontier, True):
+                if st is not None:
+                    st.generated += len(children)
+                for ns, _k, _cost, h in children:
+                    push((ns, (h, 0.0) if h is not None else rank(ns)))
+
+            if st is not None:
+                st.observe(len(scored), 0)
+            if not scored:
+                return None
+
+            scored.sort(key=itemgetter(1))
+            frontier = [ns for ns, _h in scored[:width]]
+            level += 1
+            continue
+
         next_level: List[State] = []
         for s in frontier:
-            if budget.exceeded():
+            if budget.step():
                 return None
-            budget.tick()
 
             if problem.is_goal(s):
-                return s
+                return _solved(st, problem, s, level)
 
-            for ns, _ in problem.neighbors(s):
+            children = problem.neighbors(s)
+            if st is not None:
+                children = _counted(st, children)
+
+            for ns, _ in children:
                 next_level.append(ns)
 
+        if st is not None:
+            st.observe(len(next_level), 0)
+
         if not next_level:
             return None
 
-        next_level.sort(key=problem.heuristic)
-        frontier = next_level[: max(1, int(beam_width))]
+        next_level.sort(key=rank)
+        frontier = next_level[:width]
+        level += 1
 
     return None
 
@@ -234,49 +455,68 @@ def beam_search(problem: SearchProblem, budget: SearchBudget, beam_width: int =
 def hill_climbing(problem: SearchProblem, budget: SearchBudget) -> Optional[State]:
     cur = problem.initial_state()
     cur_h = problem.heuristic(cur)
+    rank = _ranker(problem)
+    st = budget.stats
+    moves = 0
 
     while True:
-        if budget.exceeded():
+        if budget.step():
             return None
-        budget.tick()
 
         if problem.is_goal(cur):
-            return cur
+            return _solved(st, problem, cur, moves)
 
         neigh = [ns for ns, _ in problem.neighbors(cur)]
+        if st is not None:
+            st.generated += len(neigh)
+            st.observe(len(neigh), 0)
         if not neigh:
             return None
 
-        best = min(neigh, key=problem.heuristic)
-        best_h = problem.heuristic(best)
+        ranks = [rank(ns) for ns in neigh]
+        i = min(range(len(neigh)), key=ranks.__getitem__)
+        best, best_h = neigh[i], ranks[i][0]
 
         if best_h >= cur_h:
             return None
 
         cur, cur_h = best, best_h
+        moves += 1
 
 
-def simulated_annealing(problem: SearchProblem, budget: SearchBudget, initial_temp: float = 1000.0, cooling: float = 0.995) -> Optional[State]:
+def simulated_annealing(
+    problem: SearchProblem,
+    budget: SearchBudget,
+    initial_temp: float = 1000.0,
+    cooling: float = 0.995,
+    rng: Optional[random.Random] = None,
+) -> Optional[State]:
+    rnd = rng if rng is not None else random
     cur = problem.initial_state()
     temp = float(initial_temp)
+    st = budget.stats
+    moves = 0
 
     while temp > 1e-9:
-        if budget.exceeded():
+        if budget.step():
             return None
-        budget.tick()
 
         if problem.is_goal(cur):
-            return cur
+            return _solved(st, problem, cur, moves)
 
         neigh = [ns for ns, _ in problem.neighbors(cur)]
+        if st is not None:
+            st.generated += len(neigh)
+            st.observe(len(neigh), 0)
         if not neigh:
             return None
 
-        nxt = random.choice(neigh)
+        nxt = rnd.choice(neigh)
 
         delta = problem.heuristic(nxt) - problem.heuristic(cur)
-        if delta < 0 or random.random() < math.exp(-delta / temp):
+        if delta < 0 or rnd.random() < math.exp(-delta / temp):
             cur = nxt
+            moves += 1
 
         temp *= float(cooling)
 
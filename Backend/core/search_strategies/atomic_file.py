@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from contextlib import suppress
+from typing import IO, Any, Callable
+
+
+def atomic_write(path: str, write: Callable[[IO[Any]], None], *, binary: bool = True) -> None:
+    # Write-then-rename: readers (other workers, processes mapping the file) see either the previous file
+    # or the complete new one, never a half-written one. The temporary file lives next to the target so
+    # the rename stays on one filesystem, and it is removed again if writing or renaming fails.
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb" if binary else "w", encoding=None if binary else "utf-8") as fh:
+            write(fh)
+        os.replace(tmp, path)
+    except BaseException:
+        with suppress(OSError):
+            os.unlink(tmp)
+        raise
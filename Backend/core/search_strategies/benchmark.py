@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from typing import Any, Iterator, Optional
+
+from Backend.core.search_strategies.algorithm_comparator import AlgorithmComparator, timed_run
+from Backend.core.search_strategies.problems.registry import HEURISTICS, SIZE_RULES, build_instance, build_problem
+from Backend.core.search_strategies.result_cache import instance_key
+from Backend.core.search_strategies.search_problem import SearchBudget
+
+# Sweeps every registered problem over the question size ranges and records, per algorithm, the median
+# time, the expansion count and (in a separate, untimed run) the peak traced memory:
+#
+#   python -m Backend.core.search_strategies.benchmark --out bench.json
+#   python -m Backend.core.search_strategies.benchmark --baseline bench.json --out new.json
+#
+# Instances are generated from a per-cell seed, so two runs with the same --seed measure the same boards
+# and expansion counts are directly comparable. A non-zero exit status means the baseline comparison
+# found regressions.
+
+BENCH_VERSION = 1
+
+DIFFICULTIES = ("easy", "medium", "hard")
+
+# Timing differences below this are noise on a shared machine and never count as regressions.
+_TIME_FLOOR_S = 0.002
+
+
+def _sizes(problem: str, diff: str, points: str) -> list[int]:
+    r = SIZE_RULES[diff][problem]
+    lo, hi, default = int(r["min"]), int(r["max"]), int(r["def"])
+    if points == "bounds":
+        return sorted({lo, default, hi})
+    return list(range(lo, hi + 1))
+
+
+def _cells(problems: list[str], difficulties: list[str], points: str) -> Iterator[tuple[str, str, int]]:
+    for problem in problems:
+        for diff in difficulties:
+            for size in _sizes(problem, diff, points):
+                yield problem, diff, size
+
+
+def _seeded_instance(problem: str, diff: str, size: int, seed: int) -> dict:
+    # The generators draw from the global random module; a string seed is hashed deterministically.
+    state = random.getstate()
+    random.seed(f"{seed}:{problem}:{diff}:{size}")
+    try:
+        return build_instance(problem, diff, size)
+    finally:
+        random.setstate(state)
+
+
+def _measure(problem: Any, alg: str, budget: SearchBudget, repeats: int, memory: bool, seed: int) -> dict:
+    samples: list[float] = []
+    run: dict = {}
+    for _ in range(max(1, repeats)):
+        run = timed_run(problem, alg, budget.max_time_s, budget.max_expansions, collect_stats=True, seed=seed)
+        if run["time_s"] is not None:
+            samples.append(run["time_s"])
+        if run["status"] != "solved":
+            # Unsolved runs end on the budget, so repeating them only re-measures the limit.
+            break
+
+    stats = run.get("stats") or {}
+    record = {
+        "algorithm": alg,
+        "status": run["status"],
+        "time_s": statistics.median(samples) if samples else None,
+        "samples": [round(t, 6) for t in samples],
+        "expansions": run["expansions"],
+        "generated": stats.get("generated"),
+        "peak_frontier": stats.get("peak_frontier"),
+        "solution_depth": stats.get("solution_depth"),
+        "peak_bytes": None,
+    }
+    if run.get("timed_out"):
+        record["timed_out"] = True
+    if run.get("note"):
+        record["note"] = run["note"]
+    if run.get("optimal") is not None:
+        record["optimal"] = run["optimal"]
+
+    # tracemalloc distorts timings, so memory always comes from one extra run of its own.
+    if memory and run["status"] not in ("not_applicable", "runtime_error"):
+        mem = timed_run(problem, alg, budget.max_time_s, budget.max_expansions, profile_memory=True, seed=seed)
+        record["peak_bytes"] = (mem.get("stats") or {}).get("peak_bytes")
+    return record
+
+
+def run_suite(
+    problems: Optional[list[str]] = None,
+    difficulties: Optional[list[str]] = None,
+    algorithms: Optional[list[str]] = None,
+    *,
+    points: str = "all",
+    repeats: int = 3,
+    memory: bool = True,
+    seed: int = 0,
+    budget: SearchBudget | None = None,
+    progress: bool = False,
+) -> dict:
+    problems = problems or list(HEURISTICS)
+    difficulties = difficulties or list(DIFFICULTIES)
+    algorithms = algorithms or list(AlgorithmComparator.ALGORITHM_ORDER)
+    budget = budget or SearchBudget()
+
+    results: list[dict] = []
+    t_start = time.perf_counter()
+    for problem_key, diff, size in _cells(problems, difficulties, points):
+        try:
+            instance = _seeded_instance(problem_key, diff, size, seed)
+            problem = build_problem(problem_key, instance)
+            # Fingerprint of the instance and budget only, so filtered runs still match a full baseline.
+            ikey = instance_key(problem_key, problem, budget.max_expansions, [])
+        except Exception as e:
+            # Kept in the report: a size the generator cannot serve is itself a finding about the bounds.
+            for alg in algorithms:
+                results.append({"problem": problem_key, "difficulty": diff, "size": size, "instance": None, "algorithm": alg, "status": "generator_error", "note": str(e)})
+            if progress:
+                print(f"{problem_key:<18} {diff:<6} {size:>3}  generator failed: {e}", file=sys.stderr)
+            continue
+
+        for alg in algorithms:
+            record = _measure(problem, alg, budget, repeats, memory, seed)
+            results.append({"problem": problem_key, "difficulty": diff, "size": size, "instance": ikey, **record})
+            if progress:
+                t = record["time_s"]
+                print(
+                    f"{problem_key:<18} {diff:<6} {size:>3}  {alg:<40} {record['status']:<14}"
+                    f" {t * 1000.0 if t is not None else float('nan'):>10.3f} ms  {record['expansions'] or 0:>8} exp",
+                    file=sys.stderr,
+                )
+
+    return {
+        "version": BENCH_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "problems": problems,
+            "difficulties": difficulties,
+            "algorithms": algorithms,
+            "points": points,
+            "repeats": repeats,
+            "memory": memory,
+            "seed": seed,
+            "max_time_s": budget.max_time_s,
+            "max_expansions": budget.max_expansions,
+        },
+        "elapsed_s": round(time.perf_counter() - t_start, 3),
+        "results": results,
+        "curves": scaling_curves(results),
+    }
+
+
+def scaling_curves(results: list[dict]) -> dict:
+    # {problem: {difficulty: {algorithm: [[size, time_s, expansions, peak_bytes], ...]}}}, solved runs only,
+    # which is the view used to pick difficulty bounds.
+    curves: dict = {}
+    for r in results:
+        if r["status"] != "solved":
+            continue
+        per_alg = curves.setdefault(r["problem"], {}).setdefault(r["difficulty"], {})
+        per_alg.setdefault(r["algorithm"], []).append([r["size"], r["time_s"], r["expansions"], r["peak_bytes"]])
+    for per_diff in curves.values():
+        for per_alg in per_diff.values():
+            for points in per_alg.values():
+                points.sort(key=lambda p: p[0])
+    return curves
+
+
+def _cell_key(r: dict) -> tuple:
+    return r["problem"], r["difficulty"], r["size"], r["algorithm"]
+
+
+def compare_to_baseline(current: dict, baseline: dict, *, time_tolerance: float = 0.25, memory_tolerance: float = 0.25) -> list[dict]:
+    # Expansion counts are deterministic for a given instance, so any increase is reported; times and
+    # memory only when they grow by more than the relative tolerance. Cells whose instance differs from
+    # the baseline (generator changed) are reported as "instance_changed" and not compared further.
+    base = {_cell_key(r): r for r in baseline.get("results") or []}
+    findings: list[dict] = []
+
+    def finding(r: dict, kind: str, old: Any, new: Any) -> None:
+        findings.append({"problem": r["problem"], "difficulty": r["difficulty"], "size": r["size"], "algorithm": r["algorithm"], "kind": kind, "baseline": old, "current": new})
+
+    for r in current.get("results") or []:
+        old = base.get(_cell_key(r))
+        if old is None:
+            continue
+        if old.get("instance") != r.get("instance"):
+            finding(r, "instance_changed", old.get("instance"), r.get("instance"))
+            continue
+        if old["status"] == "solved" and r["status"] != "solved":
+            finding(r, "status", old["status"], r["status"])
+            continue
+        if r["status"] != "solved":
+            continue
+
+        if isinstance(old.get("expansions"), int) and isinstance(r.get("expansions"), int) and r["expansions"] > old["expansions"]:
+            finding(r, "expansions", old["expansions"], r["expansions"])
+
+        t_old, t_new = old.get("time_s"), r.get("time_s")
+        if isinstance(t_old, (int, float)) and isinstance(t_new, (int, float)):
+            if t_new > t_old * (1.0 + time_tolerance) and t_new - t_old > _TIME_FLOOR_S:
+                finding(r, "time_s", t_old, t_new)
+
+        m_old, m_new = old.get("peak_bytes"), r.get("peak_bytes")
+        if isinstance(m_old, int) and isinstance(m_new, int) and m_new > m_old * (1.0 + memory_tolerance):
+            finding(r, "peak_bytes", m_old, m_new)
+
+    return findings
+
+
+def _parse_args(argv: Optional[list[str]]) -> argparse.Namespace:
+    ap = argparse.ArgumentParser(prog="python -m Backend.core.search_strategies.benchmark", description="Benchmark the search strategies over the question size ranges.")
+    ap.add_argument("--problem", action="append", choices=sorted(HEURISTICS), help="problem to sweep (repeatable, default: all)")
+    ap.add_argument("--difficulty", action="append", choices=DIFFICULTIES, help="difficulty range to sweep (repeatable, default: all)")
+    ap.add_argument("--algorithm", action="append", choices=AlgorithmComparator.ALGORITHM_ORDER, help="algorithm to run (repeatable, default: all)")
+    ap.add_argument("--points", choices=("all", "bounds"), default="all", help="every size in the range, or only min/default/max")
+    ap.add_argument("--repeats", type=int, default=3, help="timed runs per solving algorithm (median is reported)")
+    ap.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak-memory run")
+    ap.add_argument("--seed", type=int, default=0, help="instance and simulated annealing seed")
+    ap.add_argument("--max-time", type=float, default=SearchBudget.max_time_s, help="per-run time budget in seconds")
+    ap.add_argument("--max-expansions", type=int, default=SearchBudget.max_expansions, help="per-run expansion budget")
+    ap.add_argument("--out", help="write the JSON report here (default: stdout)")
+    ap.add_argument("--baseline", help="JSON report to compare against; regressions make the exit status 1")
+    ap.add_argument("--time-tolerance", type=float, default=0.25, help="relative slowdown tolerated before a time regression")
+    ap.add_argument("--memory-tolerance", type=float, default=0.25, help="relative growth tolerated before a memory regression")
+    ap.add_argument("--quiet", action="store_true", help="no per-run progress on stderr")
+    return ap.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = _parse_args(argv)
+    report = run_suite(
+        args.problem,
+        args.difficulty,
+        args.algorithm,
+        points=args.points,
+        repeats=args.repeats,
+        memory=not args.no_memory,
+        seed=args.seed,
+        budget=SearchBudget(max_time_s=args.max_time, max_expansions=args.max_expansions),
+        progress=not args.quiet,
+    )
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        findings = compare_to_baseline(report, baseline, time_tolerance=args.time_tolerance, memory_tolerance=args.memory_tolerance)
+        regressions = [f for f in findings if f["kind"] != "instance_changed"]
+        report["baseline"] = {"path": args.baseline, "created": baseline.get("created"), "findings": findings}
+        for f in findings:
+            label = "NOTE" if f["kind"] == "instance_changed" else "REGRESSION"
+            print(
+                f"{label} {f['kind']:<16} {f['problem']} {f['difficulty']} size={f['size']} {f['algorithm']}: {f['baseline']} -> {f['current']}",
+                file=sys.stderr,
+            )
+        print(f"{len(regressions)} regression(s) against {args.baseline}", file=sys.stderr)
+        status = 1 if regressions else 0
+
+    raw = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            fh.write(raw + "\n")
+    else:
+        print(raw)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
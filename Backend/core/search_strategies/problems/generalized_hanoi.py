@@ -1,64 +1,194 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Hashable, Iterable, Tuple
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Hashable, Iterable, List, Sequence, Tuple
 
-from Backend.core.search_strategies.search_problem import SearchProblem, State
+from Backend.core.search_strategies.problems.generalized_hanoi_problem import generalized_hanoi_pattern_db as pattern_db
+from Backend.core.search_strategies.problems.generalized_hanoi_problem.generalized_hanoi_validator import GeneralizedHanoiValidator
+from Backend.core.search_strategies.search_problem import Expansion, SearchProblem, State
 
 Pegs = Tuple[Tuple[int, ...], ...]
 
+# A state is a single int: digit d-1 in base `pegs` is the peg holding disk d (disk 1 is the smallest).
+# The start (everything on peg 0) is 0 and the goal (everything on the last peg) is pegs**disks - 1.
+
 @dataclass(frozen=True)
 class GeneralizedHanoiProblem(SearchProblem):
     name: str
     disks: int
     pegs: int
+    heuristic_name: str = "remaining"
+    powers: Tuple[int, ...] = field(init=False, repr=False, compare=False)
+    goal: int = field(init=False, repr=False, compare=False)
+    pattern_groups: Tuple[Tuple[int, int, Sequence[int]], ...] = field(init=False, repr=False, compare=False)
+    h_fn: Callable[["GeneralizedHanoiProblem", State], float] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.heuristic_name not in HEURISTICS:
+            raise ValueError(f"Unknown Generalized Hanoi heuristic: {self.heuristic_name}")
+        object.__setattr__(self, "h_fn", HEURISTICS[self.heuristic_name])
+        object.__setattr__(self, "powers", tuple(self.pegs ** d for d in range(self.disks)))
+        object.__setattr__(self, "goal", self.pegs ** self.disks - 1)
+        # Tables are loaded (or built) here rather than on the first heuristic call, so a search's
+        # budget never pays for them.
+        groups = pattern_db.groups(self.disks, self.pegs) if self.h_fn is _h_pattern_db else ()
+        object.__setattr__(self, "pattern_groups", groups)
+        # Frame-Stewart moves always solve the instance, so no admissible estimate of the start can exceed
+        # them; a table that does is corrupt and would make A* return non-optimal solutions.
+        if groups and self.heuristic(0) > GeneralizedHanoiValidator.optimal_moves(self.disks, self.pegs):
+            raise ValueError(f"Generalized Hanoi pattern database overestimates {self.disks} disks on {self.pegs} pegs")
 
     def initial_state(self) -> State:
-        start_peg = tuple(range(self.disks, 0, -1))
-        rest = tuple(() for _ in range(self.pegs - 1))
-        return (start_peg,) + rest
+        return 0
 
     def is_goal(self, state: State) -> bool:
-        s: Pegs = state
-        return len(s[-1]) == self.disks
+        return state == self.goal
+
+    def goal_state(self) -> State:
+        return self.goal
 
     def key(self, state: State) -> Hashable:
         return state
 
+    def is_optimal_cost(self, cost: int) -> bool:
+        return GeneralizedHanoiValidator.is_optimal(self.disks, self.pegs, cost)
+
     def heuristic(self, state: State) -> float:
-        s: Pegs = state
-        return float(self.disks - len(s[-1]))
+        return self.h_fn(self, state)
 
     def neighbors(self, state: State) -> Iterable[Tuple[State, int]]:
-        s: Pegs = state
+        k = self.pegs
+        tops = self._tops(state)
+        powers = self.powers
         out: list[Tuple[State, int]] = []
 
-        tops = []
-        for i, peg in enumerate(s):
-            tops.append(peg[-1] if peg else None)
-
-        for i in range(self.pegs):
-            if tops[i] is None:
-                continue
+        for i in range(k):
             disk = tops[i]
-            for j in range(self.pegs):
+            if not disk:
+                continue
+            step = powers[disk - 1]
+            for j in range(k):
                 if i == j:
                     continue
                 top_j = tops[j]
-                if top_j is None or top_j > disk:
-                    out.append((_move(s, i, j), 1))
+                if not top_j or top_j > disk:
+                    out.append((state + (j - i) * step, 1))
 
         return out
 
+    def expand_batch(self, states: Sequence[State], with_heuristic: bool = True) -> List[List[Expansion]]:
+        # Same move loop as neighbors(); the key is the state itself and the 'remaining' heuristic only
+        # changes when a disk leaves or lands on the goal peg, so it is derived from the parent.
+        k = self.pegs
+        last = k - 1
+        powers = self.powers
+        incremental = with_heuristic and self.h_fn is _h_remaining
+        out: List[List[Expansion]] = []
+
+        for state in states:
+            tops = self._tops(state)
+            h = _h_remaining(self, state) if incremental else None
+            children: List[Expansion] = []
+            for i in range(k):
+                disk = tops[i]
+                if not disk:
+                    continue
+                step = powers[disk - 1]
+                for j in range(k):
+                    if i == j:
+                        continue
+                    top_j = tops[j]
+                    if not top_j or top_j > disk:
+                        ns = state + (j - i) * step
+                        children.append((ns, ns, 1, h + (i == last) - (j == last) if incremental else None))
+            out.append(children)
 
-def _move(state: Pegs, src: int, dst: int) -> Pegs:
-    pegs = [list(p) for p in state]
-    disk = pegs[src].pop()
-    pegs[dst].append(disk)
-    return tuple(tuple(p) for p in pegs)
+        return out
 
+    def predecessors(self, state: State) -> Iterable[Tuple[State, int]]:
+        # Every move can be undone by moving the same disk back, so the move graph is symmetric.
+        return self.neighbors(state)
+
+    def _tops(self, state: int) -> list[int]:
+        # Smallest disk on each peg (0 = empty), found by scanning digits from the smallest disk up.
+        k = self.pegs
+        tops = [0] * k
+        free = k
+        s = state
+        for disk in range(1, self.disks + 1):
+            s, peg = divmod(s, k)
+            if not tops[peg]:
+                tops[peg] = disk
+                free -= 1
+                if not free:
+                    break
+        return tops
+
+    def encode(self, pegs: Pegs) -> int:
+        state = 0
+        for peg, stack in enumerate(pegs):
+            for disk in stack:
+                state += peg * self.powers[disk - 1]
+        return state
 
-def build_generalized_hanoi_problem(instance: dict) -> GeneralizedHanoiProblem:
+    def decode(self, state: State) -> Pegs:
+        stacks: list[list[int]] = [[] for _ in range(self.pegs)]
+        s: int = state
+        for disk in range(1, self.disks + 1):
+            s, peg = divmod(s, self.pegs)
+            stacks[peg].append(disk)
+        return tuple(tuple(reversed(stack)) for stack in stacks)
+
+
+def _h_remaining(problem: GeneralizedHanoiProblem, state: State) -> float:
+    s: int = state
+    k = problem.pegs
+    last = k - 1
+    misplaced = 0
+    for _ in range(problem.disks):
+        s, peg = divmod(s, k)
+        if peg != last:
+            misplaced += 1
+    return float(misplaced)
+
+
+def _h_goal_blockers(problem: GeneralizedHanoiProblem, state: State) -> float:
+    # Every misplaced disk moves at least once. Before the largest misplaced disk can land on the goal
+    # peg, every smaller disk already sitting there has to leave and come back: two moves each.
+    s: int = state
+    k = problem.pegs
+    last = k - 1
+    misplaced = 0
+    on_goal = 0
+    blockers = 0
+    for _ in range(problem.disks):
+        s, peg = divmod(s, k)
+        if peg == last:
+            on_goal += 1
+        else:
+            misplaced += 1
+            blockers = on_goal
+    return float(misplaced + 2 * blockers)
+
+
+def _h_pattern_db(problem: GeneralizedHanoiProblem, state: State) -> float:
+    # Sum over the disk groups of the exact cost of solving that group alone (additive pattern
+    # databases); exact for instances small enough to fit one group.
+    s: int = state
+    total = 0
+    for div, mod, table in problem.pattern_groups:
+        total += table[(s // div) % mod]
+    return float(total)
+
+
+HEURISTICS: Dict[str, Callable[[GeneralizedHanoiProblem, State], float]] = {
+    "remaining": _h_remaining,
+    "goal_blockers": _h_goal_blockers,
+    "pattern_db": _h_pattern_db,
+}
+
+
+def build_generalized_hanoi_problem(instance: dict, heuristic: str | None = None) -> GeneralizedHanoiProblem:
     disks = int(instance.get("disks") or instance.get("n_disks") or 0)
     pegs = int(instance.get("pegs") or instance.get("k") or 3)
-    return GeneralizedHanoiProblem(name="Generalized Hanoi", disks=disks, pegs=pegs)
\ No newline at end of file
+    return GeneralizedHanoiProblem(name="Generalized Hanoi", disks=disks, pegs=pegs, heuristic_name=heuristic or "remaining")
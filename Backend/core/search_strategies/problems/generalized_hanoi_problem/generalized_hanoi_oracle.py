@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def frame_stewart(disks: int, pegs: int) -> int:
+    # Frame-Stewart: park the t smallest disks on a spare peg using every peg, move the other
+    # disks - t with one peg fewer, then bring the t disks back on top; minimise over t.
+    # It is the optimal move count for 3 pegs (2^n - 1) and, as proved by Bousch, for 4 pegs; for more
+    # pegs it is the best known solution and conjectured optimal.
+    if disks < 0 or pegs < 3:
+        raise ValueError(f"Frame-Stewart needs disks >= 0 and pegs >= 3 (got disks={disks}, pegs={pegs})")
+    if disks == 0:
+        return 0
+    if disks == 1:
+        return 1
+    if pegs == 3:
+        return (1 << disks) - 1
+    return min(2 * frame_stewart(t, pegs) + frame_stewart(disks - t, pegs - 1) for t in range(1, disks))
+
+
+def is_proven_optimal(pegs: int) -> bool:
+    return 3 <= pegs <= 4
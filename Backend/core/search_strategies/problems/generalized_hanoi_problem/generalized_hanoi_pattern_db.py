@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import argparse
+import mmap
+import os
+import sys
+import threading
+from array import array
+from typing import Optional, Sequence
+
+from Backend.core.search_strategies.atomic_file import atomic_write
+from Backend.services import Logger
+
+log = Logger("GenHanoiPatternDB")
+
+# Additive pattern databases for generalized Hanoi. The disks are split into groups of consecutive
+# sizes; a group's table holds, for every placement of just those disks, the number of moves needed
+# to bring them onto the goal peg when the other disks are ignored. Every real move moves a disk of
+# exactly one group and is also a legal move in that group's reduced puzzle, so the table values of
+# all groups add up to an admissible heuristic. A group of g disks on k pegs behaves the same whatever
+# the actual disk sizes are, so one table per (pegs, group size) serves every instance.
+
+# Largest table built on demand (pegs ** group size entries, two bytes each). Building one is a
+# breadth-first search over all of its placements, a fraction of a second at this size.
+PDB_MAX_STATES = 1 << 17
+
+# Groups built on demand hold at least this many disks even past PDB_MAX_STATES. Only 5 pegs need it:
+# their 5**8-entry table takes about 2.5 s to build once per process, and with 7-disk groups A* runs
+# out of the default search budget on 10 disks.
+PDB_MIN_GROUP = 8
+
+# Optional directory holding tables built offline (see main()). They are memory-mapped instead of
+# rebuilt, and larger prebuilt tables mean larger groups and a much better informed heuristic.
+PDB_DIR = os.getenv("HANOI_PDB_DIR", "").strip() or None
+
+# Default size limit for the offline build.
+OFFLINE_MAX_STATES = 1 << 21
+
+PDB_VERSION = 1
+
+_UNSEEN = 0xFFFF
+
+_tables: dict[tuple[int, int], Sequence[int]] = {}
+_lock = threading.Lock()
+
+
+def _fitting(pegs: int, max_states: int) -> int:
+    g = 1
+    while pegs ** (g + 1) <= max_states:
+        g += 1
+    return g
+
+
+def group_size(pegs: int) -> int:
+    g = max(_fitting(pegs, PDB_MAX_STATES), PDB_MIN_GROUP)
+    if PDB_DIR:
+        while os.path.exists(_path(PDB_DIR, pegs, g + 1)):
+            g += 1
+    return g
+
+
+def build_table(pegs: int, disks: int) -> array:
+    # Distances from the goal (every disk on the last peg, i.e. pegs**disks - 1) by BFS; moves are
+    # reversible, so this is also the distance to it. States use the same base-`pegs` encoding as
+    # GeneralizedHanoiProblem.
+    size = pegs ** disks
+    powers = [pegs ** d for d in range(disks)]
+    dist = array("H", [_UNSEEN]) * size
+    goal = size - 1
+    dist[goal] = 0
+    frontier = [goal]
+    depth = 0
+
+    while frontier:
+        depth += 1
+        nxt: list[int] = []
+        for s in frontier:
+            tops = [0] * pegs
+            free = pegs
+            x = s
+            for disk in range(1, disks + 1):
+                x, peg = divmod(x, pegs)
+                if not tops[peg]:
+                    tops[peg] = disk
+                    free -= 1
+                    if not free:
+                        break
+            for i in range(pegs):
+                disk = tops[i]
+                if not disk:
+                    continue
+                step = powers[disk - 1]
+                for j in range(pegs):
+                    if i != j and (not tops[j] or tops[j] > disk):
+                        ns = s + (j - i) * step
+                        if dist[ns] == _UNSEEN:
+                            dist[ns] = depth
+                            nxt.append(ns)
+        frontier = nxt
+
+    return dist
+
+
+def _path(directory: str, pegs: int, disks: int) -> str:
+    return os.path.join(directory, f"hanoi_pdb_p{pegs}_d{disks}_v{PDB_VERSION}.u16")
+
+
+def _map(pegs: int, disks: int) -> Optional[Sequence[int]]:
+    # Files are little-endian uint16; on other byte orders the table is simply rebuilt.
+    if not PDB_DIR or sys.byteorder != "little":
+        return None
+    path = _path(PDB_DIR, pegs, disks)
+    try:
+        with open(path, "rb") as fh:
+            if os.fstat(fh.fileno()).st_size != 2 * pegs ** disks:
+                log.warn("Pattern database has the wrong size, rebuilding", {"path": path})
+                return None
+            mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        log.warn("Unreadable pattern database ignored", {"path": path, "error": str(e)})
+        return None
+    return memoryview(mm).cast("H")
+
+
+def save_table(directory: str, pegs: int, disks: int, table: array) -> str:
+    os.makedirs(directory, exist_ok=True)
+    out = array("H", table)
+    if sys.byteorder != "little":
+        out.byteswap()
+    path = _path(directory, pegs, disks)
+    atomic_write(path, out.tofile)
+    return path
+
+
+def table(pegs: int, disks: int) -> Sequence[int]:
+    key = (pegs, disks)
+    with _lock:
+        t = _tables.get(key)
+        if t is None:
+            t = _map(pegs, disks)
+            if t is None:
+                t = build_table(pegs, disks)
+                log.ok("Pattern database built", {"pegs": pegs, "disks": disks, "entries": len(t)})
+            _tables[key] = t
+        return t
+
+
+def groups(disks: int, pegs: int) -> tuple[tuple[int, int, Sequence[int]], ...]:
+    # (divisor, modulus, table) per group, largest disks first: the reduced state of disks lo..hi is
+    # (state // pegs**(lo-1)) % pegs**(hi-lo+1).
+    g = group_size(pegs)
+    out: list[tuple[int, int, Sequence[int]]] = []
+    hi = disks
+    while hi >= 1:
+        lo = max(1, hi - g + 1)
+        size = hi - lo + 1
+        out.append((pegs ** (lo - 1), pegs ** size, table(pegs, size)))
+        hi = lo - 1
+    return tuple(out)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    # Offline build: python -m Backend.core.search_strategies.problems.generalized_hanoi_problem.generalized_hanoi_pattern_db --out DIR
+    ap = argparse.ArgumentParser(description="Build the generalized Hanoi pattern databases.")
+    ap.add_argument("--out", required=True, help="directory to write the tables to (point HANOI_PDB_DIR at it)")
+    ap.add_argument("--pegs", type=int, action="append", help="peg count to build for (repeatable, default 3, 4 and 5)")
+    ap.add_argument("--max-states", type=int, default=OFFLINE_MAX_STATES, help="largest table to build, in entries")
+    args = ap.parse_args(argv)
+
+    for pegs in args.pegs or [3, 4, 5]:
+        for disks in range(1, _fitting(pegs, args.max_states) + 1):
+            path = save_table(args.out, pegs, disks, build_table(pegs, disks))
+            print(path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
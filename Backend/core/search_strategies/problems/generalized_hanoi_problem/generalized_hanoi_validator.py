@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from Backend.services import Logger
+from .generalized_hanoi_oracle import frame_stewart, is_proven_optimal
 
 log = Logger("GenHanoiValidator")
 
@@ -13,4 +14,20 @@ class GeneralizedHanoiValidator:
         if not isinstance(pegs, int) or pegs < 3:
             return False
         log.ok("Generalized Hanoi instance valid", ctx={"disks": disks, "pegs": pegs})
-        return True
\ No newline at end of file
+        return True
+
+    @staticmethod
+    def optimal_moves(disks: int, pegs: int) -> int:
+        return frame_stewart(disks, pegs)
+
+    @staticmethod
+    def is_optimal(disks: int, pegs: int, moves: int) -> bool:
+        # Nothing can beat the Frame-Stewart count where it is proven optimal (3 and 4 pegs). With more
+        # pegs it is only conjectured optimal, so a shorter solution is accepted but logged.
+        best = frame_stewart(disks, pegs)
+        if moves < best and is_proven_optimal(pegs):
+            log.warn("Generalized Hanoi solution shorter than the proven optimum", ctx={"disks": disks, "pegs": pegs, "moves": moves, "optimal": best})
+            return False
+        if moves < best:
+            log.warn("Generalized Hanoi solution beats Frame-Stewart", ctx={"disks": disks, "pegs": pegs, "moves": moves, "frame_stewart": best})
+        return moves <= best
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Hashable, Iterable, Tuple
+import math
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Hashable, Iterable, List, Sequence, Tuple
 
-from Backend.core.search_strategies.search_problem import SearchProblem, State
+from Backend.core.search_strategies.search_problem import Expansion, SearchProblem, State
 
 
 @dataclass(frozen=True)
@@ -12,6 +13,16 @@ class GraphColoringProblem(SearchProblem):
     num_nodes: int
     num_colors: int
     edges: Tuple[Tuple[int, int], ...]
+    heuristic_name: str = "remaining"
+    # earlier[v]: neighbours of v that are coloured before v (nodes are coloured in index order).
+    earlier: Tuple[Tuple[int, ...], ...] = field(init=False, repr=False, compare=False)
+    h_fn: Callable[["GraphColoringProblem", State], float] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.heuristic_name not in HEURISTICS:
+            raise ValueError(f"Unknown Graph Coloring heuristic: {self.heuristic_name}")
+        object.__setattr__(self, "earlier", _earlier_neighbors(self.num_nodes, self.edges))
+        object.__setattr__(self, "h_fn", HEURISTICS[self.heuristic_name])
 
     def initial_state(self) -> State:
         return ()
@@ -23,9 +34,16 @@ class GraphColoringProblem(SearchProblem):
     def key(self, state: State) -> Hashable:
         return state
 
-    def heuristic(self, state: State) -> float:
+    def depth(self, state: State) -> int:
         s: Tuple[int, ...] = state
-        return float(self.num_nodes - len(s))
+        return len(s)
+
+    def heuristic(self, state: State) -> float:
+        return self.h_fn(self, state)
+
+    def rank(self, state: State) -> Tuple[float, float]:
+        r_fn = RANKS.get(self.heuristic_name)
+        return r_fn(self, state) if r_fn is not None else (self.h_fn(self, state), 0.0)
 
     def neighbors(self, state: State) -> Iterable[Tuple[State, int]]:
         s: Tuple[int, ...] = state
@@ -33,25 +51,97 @@ class GraphColoringProblem(SearchProblem):
         if i >= self.num_nodes:
             return []
 
+        used = 0
+        for u in self.earlier[i]:
+            used |= 1 << s[u]
+
         out: list[Tuple[State, int]] = []
         for color in range(self.num_colors):
-            if _valid_color(i, color, s, self.edges):
+            if not (used >> color) & 1:
                 out.append((s + (color,), 1))
         return out
 
+    def expand_batch(self, states: Sequence[State], with_heuristic: bool = True) -> List[List[Expansion]]:
+        # Children are their own keys, and under 'remaining' they all sit one node closer to the goal.
+        n = self.num_nodes
+        k = self.num_colors
+        earlier = self.earlier
+        incremental = with_heuristic and self.h_fn is _h_remaining and self.heuristic_name not in RANKS
+        out: List[List[Expansion]] = []
+
+        for s in states:
+            i = len(s)
+            children: List[Expansion] = []
+            if i < n:
+                used = 0
+                for u in earlier[i]:
+                    used |= 1 << s[u]
+                h = float(n - i - 1) if incremental else None
+                for color in range(k):
+                    if not (used >> color) & 1:
+                        ns = s + (color,)
+                        children.append((ns, ns, 1, h))
+            out.append(children)
+
+        return out
 
-def _valid_color(node: int, color: int, partial: Tuple[int, ...], edges: Tuple[Tuple[int, int], ...]) -> bool:
+
+def _earlier_neighbors(num_nodes: int, edges: Tuple[Tuple[int, int], ...]) -> Tuple[Tuple[int, ...], ...]:
+    earlier: list[list[int]] = [[] for _ in range(num_nodes)]
     for a, b in edges:
-        if a == node and b < len(partial):
-            if partial[b] == color:
-                return False
-        elif b == node and a < len(partial):
-            if partial[a] == color:
-                return False
-    return True
+        if a == b or not (0 <= a < num_nodes and 0 <= b < num_nodes):
+            continue
+        lo, hi = (a, b) if a < b else (b, a)
+        if lo not in earlier[hi]:
+            earlier[hi].append(lo)
+    return tuple(tuple(sorted(x)) for x in earlier)
+
+
+def _h_remaining(problem: GraphColoringProblem, state: State) -> float:
+    s: Tuple[int, ...] = state
+    return float(problem.num_nodes - len(s))
+
+
+def _rank_dsatur(problem: GraphColoringProblem, state: State) -> Tuple[float, float]:
+    # Remaining nodes, or inf when an uncoloured node already sees every colour on its neighbours.
+    # Ties are broken towards the lower average saturation of the uncoloured nodes.
+    s: Tuple[int, ...] = state
+    i = len(s)
+    k = problem.num_colors
+    remaining = problem.num_nodes - i
+    if remaining <= 0:
+        return 0.0, 0.0
+
+    total = 0
+    for v in range(i, problem.num_nodes):
+        used = 0
+        for u in problem.earlier[v]:
+            if u < i:
+                used |= 1 << s[u]
+        sat = used.bit_count()
+        if sat >= k:
+            return math.inf, 0.0
+        total += sat
+
+    return float(remaining), total / (remaining * k + 1)
+
+
+def _h_dsatur(problem: GraphColoringProblem, state: State) -> float:
+    return _rank_dsatur(problem, state)[0]
+
+
+HEURISTICS: Dict[str, Callable[[GraphColoringProblem, State], float]] = {
+    "remaining": _h_remaining,
+    "dsatur": _h_dsatur,
+}
+
+# Heuristics with a tie-break (see rank()); the others never break ties.
+RANKS: Dict[str, Callable[[GraphColoringProblem, State], Tuple[float, float]]] = {
+    "dsatur": _rank_dsatur,
+}
 
 
-def build_graph_coloring_problem(instance: dict) -> GraphColoringProblem:
+def build_graph_coloring_problem(instance: dict, heuristic: str | None = None) -> GraphColoringProblem:
     n = int(instance.get("num_nodes") or instance.get("nodes") or 0)
     k = int(instance.get("num_colors") or instance.get("colors") or 0)
 
@@ -78,7 +168,10 @@ def build_graph_coloring_problem(instance: dict) -> GraphColoringProblem:
     edges: list[tuple[int, int]] = []
     for e in edges_raw:
         if isinstance(e, (list, tuple)) and len(e) == 2:
-            edges.append((int(e[0]), int(e[1])))
+            a, b = int(e[0]), int(e[1])
+            # Undirected: store (lo, hi) so equivalent edge lists build equal problems.
+            if a != b:
+                edges.append((a, b) if a < b else (b, a))
 
     edges = sorted(set(edges))
 
@@ -87,4 +180,5 @@ def build_graph_coloring_problem(instance: dict) -> GraphColoringProblem:
         num_nodes=n,
         num_colors=k,
         edges=tuple(edges),
+        heuristic_name=heuristic or "remaining",
     )
\ No newline at end of file
@@ -1,47 +1,105 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Hashable, Iterable, Tuple
+import math
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
 
-from Backend.core.search_strategies.search_problem import SearchProblem, State
+from Backend.core.search_strategies.search_problem import Expansion, SearchProblem, State
 
 
 Pos = Tuple[int, int]
 
+# Compact state: (current square, visited bitmask, visited count, parent state).
+# Squares are indexed r * n + c; the parent link is only followed to rebuild the path.
+TourState = Tuple[int, int, int, Optional["TourState"]]
+
 @dataclass(frozen=True)
 class KnightsTourProblem(SearchProblem):
     name: str
     n: int
     start: Pos
+    heuristic_name: str = "remaining"
+    targets: Tuple[Tuple[int, ...], ...] = field(init=False, repr=False, compare=False)
+    move_masks: Tuple[int, ...] = field(init=False, repr=False, compare=False)
+    # Bits reserved for the square in a state key (enough for every square index).
+    key_shift: int = field(init=False, repr=False, compare=False)
+    h_fn: Callable[["KnightsTourProblem", State], float] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.heuristic_name not in HEURISTICS:
+            raise ValueError(f"Unknown Knight's Tour heuristic: {self.heuristic_name}")
+        targets, masks = _move_tables(self.n)
+        object.__setattr__(self, "targets", targets)
+        object.__setattr__(self, "move_masks", masks)
+        object.__setattr__(self, "key_shift", max(1, (self.n * self.n - 1).bit_length()))
+        object.__setattr__(self, "h_fn", HEURISTICS[self.heuristic_name])
 
     def initial_state(self) -> State:
-        return (self.start,)
+        sq = self.start[0] * self.n + self.start[1]
+        return (sq, 1 << sq, 1, None)
 
     def is_goal(self, state: State) -> bool:
-        path: Tuple[Pos, ...] = state
-        return len(path) == self.n * self.n
+        s: TourState = state
+        return s[2] == self.n * self.n
 
     def key(self, state: State) -> Hashable:
-        return state
+        s: TourState = state
+        return (s[1] << self.key_shift) | s[0]
+
+    def depth(self, state: State) -> int:
+        s: TourState = state
+        return s[2] - 1
 
     def heuristic(self, state: State) -> float:
-        path: Tuple[Pos, ...] = state
-        return float((self.n * self.n) - len(path))
+        return self.h_fn(self, state)
+
+    def rank(self, state: State) -> Tuple[float, float]:
+        r_fn = RANKS.get(self.heuristic_name)
+        return r_fn(self, state) if r_fn is not None else (self.h_fn(self, state), 0.0)
 
     def neighbors(self, state: State) -> Iterable[Tuple[State, int]]:
-        path: Tuple[Pos, ...] = state
-        last = path[-1]
-        visited = set(path)
+        cur, visited, count, _parent = state
+        masks = self.move_masks
+
+        moves = [sq for sq in self.targets[cur] if not (visited >> sq) & 1]
+
+        # Warnsdorff ordering: onward degree is a popcount of the precomputed move mask minus visited squares.
+        moves.sort(key=lambda sq: (masks[sq] & ~visited).bit_count())
 
-        moves = []
-        for dr, dc in _KNIGHT_DELTAS:
-            nr, nc = last[0] + dr, last[1] + dc
-            if 0 <= nr < self.n and 0 <= nc < self.n and (nr, nc) not in visited:
-                moves.append((nr, nc))
+        return [((sq, visited | (1 << sq), count + 1, state), 1) for sq in moves]
 
-        moves.sort(key=lambda p: _onward_degree(p, visited, self.n))
+    def expand_batch(self, states: Sequence[State], with_heuristic: bool = True) -> List[List[Expansion]]:
+        # Same Warnsdorff ordering as neighbors(), with keys built inline from (visited, square); under
+        # 'remaining' all children of a state share one heuristic value.
+        targets = self.targets
+        masks = self.move_masks
+        size = self.n * self.n
+        shift = self.key_shift
+        incremental = with_heuristic and self.h_fn is _h_remaining and self.heuristic_name not in RANKS
+        out: List[List[Expansion]] = []
 
-        return [ (path + (p,), 1) for p in moves ]
+        for state in states:
+            cur, visited, count, _parent = state
+            moves = [sq for sq in targets[cur] if not (visited >> sq) & 1]
+            moves.sort(key=lambda sq: (masks[sq] & ~visited).bit_count())
+
+            h = float(size - count - 1) if incremental else None
+            children: List[Expansion] = []
+            for sq in moves:
+                nv = visited | (1 << sq)
+                children.append(((sq, nv, count + 1, state), (nv << shift) | sq, 1, h))
+            out.append(children)
+
+        return out
+
+    def path(self, state: State) -> Tuple[Pos, ...]:
+        out: list[Pos] = []
+        s: Optional[TourState] = state
+        while s is not None:
+            out.append(divmod(s[0], self.n))
+            s = s[3]
+        return tuple(reversed(out))
 
 
 _KNIGHT_DELTAS = [
@@ -52,17 +110,77 @@ _KNIGHT_DELTAS = [
 ]
 
 
-def _onward_degree(pos: Pos, visited: set[Pos], n: int) -> int:
-    cnt = 0
-    for dr, dc in _KNIGHT_DELTAS:
-        nr, nc = pos[0] + dr, pos[1] + dc
-        if 0 <= nr < n and 0 <= nc < n and (nr, nc) not in visited:
-            cnt += 1
-    return cnt
-
-
-def build_knights_tour_problem(instance: dict) -> KnightsTourProblem:
+@lru_cache(maxsize=None)
+def _move_tables(n: int) -> Tuple[Tuple[Tuple[int, ...], ...], Tuple[int, ...]]:
+    targets: list[Tuple[int, ...]] = []
+    masks: list[int] = []
+    for r in range(n):
+        for c in range(n):
+            sqs = []
+            for dr, dc in _KNIGHT_DELTAS:
+                nr, nc = r + dr, c + dc
+                if 0 <= nr < n and 0 <= nc < n:
+                    sqs.append(nr * n + nc)
+            targets.append(tuple(sqs))
+            mask = 0
+            for sq in sqs:
+                mask |= 1 << sq
+            masks.append(mask)
+    return tuple(targets), tuple(masks)
+
+
+def _h_remaining(problem: KnightsTourProblem, state: State) -> float:
+    s: TourState = state
+    return float((problem.n * problem.n) - s[2])
+
+
+def _rank_warnsdorff(problem: KnightsTourProblem, state: State) -> Tuple[float, float]:
+    # Remaining squares, or inf when the rest of the board can no longer be covered:
+    # an unvisited square with no way in, or two squares that could only be the last one.
+    # Ties are broken towards the lower onward degree of the current square (Warnsdorff).
+    cur, visited, count, _parent = state
+    masks = problem.move_masks
+    size = problem.n * problem.n
+    remaining = size - count
+    if remaining == 0:
+        return 0.0, 0.0
+
+    unvisited = ((1 << size) - 1) & ~visited
+    cur_mask = masks[cur]
+    ends = 0
+    rest = unvisited
+    while rest:
+        bit = rest & -rest
+        rest ^= bit
+        sq = bit.bit_length() - 1
+        degree = (masks[sq] & unvisited).bit_count() + ((cur_mask >> sq) & 1)
+        if degree == 0:
+            return math.inf, 0.0
+        if degree == 1:
+            ends += 1
+            if ends > 1:
+                return math.inf, 0.0
+
+    return float(remaining), float((cur_mask & unvisited).bit_count())
+
+
+def _h_warnsdorff(problem: KnightsTourProblem, state: State) -> float:
+    return _rank_warnsdorff(problem, state)[0]
+
+
+HEURISTICS: Dict[str, Callable[[KnightsTourProblem, State], float]] = {
+    "remaining": _h_remaining,
+    "warnsdorff": _h_warnsdorff,
+}
+
+# Heuristics with a tie-break (see rank()); the others never break ties.
+RANKS: Dict[str, Callable[[KnightsTourProblem, State], Tuple[float, float]]] = {
+    "warnsdorff": _rank_warnsdorff,
+}
+
+
+def build_knights_tour_problem(instance: dict, heuristic: str | None = None) -> KnightsTourProblem:
     n = int(instance.get("board_size") or instance.get("n") or 0)
     start = instance.get("start") or [0, 0]
     sr, sc = int(start[0]), int(start[1])
-    return KnightsTourProblem(name="Knight's Tour", n=n, start=(sr, sc))
\ No newline at end of file
+    return KnightsTourProblem(name="Knight's Tour", n=n, start=(sr, sc), heuristic_name=heuristic or "remaining")
@@ -4,6 +4,7 @@ import random
 from typing import Any
 
 from Backend.services import Logger
+from .knights_tour_solvability import solvable_starts
 from .knights_tour_validator import KnightsTourValidator
 
 log = Logger("KnightsTourInstanceGenerator")
@@ -13,11 +14,14 @@ class KnightsTourInstanceGenerator:
     @staticmethod
     def generate(board_size: int, start: tuple[int, int] | None = None) -> dict[str, Any]:
         if start is None:
-            start = (random.randrange(0, board_size), random.randrange(0, board_size))
+            starts = solvable_starts(board_size)
+            if not starts:
+                raise ValueError(f"Knight's Tour has no tour on a {board_size}x{board_size} board")
+            start = random.choice(starts)
 
         validator = KnightsTourValidator()
         if not validator.is_valid(board_size, start):
-            raise RuntimeError("KnightsTourInstanceGenerator produced invalid instance")
+            raise ValueError(f"Knight's Tour has no tour on a {board_size}x{board_size} board starting at {list(start)}")
 
         log.ok("Generated Knights Tour instance", ctx={"board_size": board_size, "start": list(start)})
 
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Optional
+
+from Backend.core.search_strategies.problems.knights_tour import Pos, _move_tables
+
+# Open tours on an n x n board:
+#   - n = 1 is trivially toured, n = 2..4 have no tour at all;
+#   - a tour alternates square colours, so on odd boards (one more square with r + c even) it has to
+#     start on such a square;
+#   - from every other start square a tour exists for n >= 5. construct_tour() finds one for each of
+#     them over the question sizes, and for 5x5 this was also confirmed by exhaustive search.
+# The table below is what the generator and validator consult, so no instance is ever issued that
+# would make every algorithm burn its whole budget.
+
+
+def is_solvable(n: int, start: Pos) -> bool:
+    r, c = start
+    if not (0 <= r < n and 0 <= c < n):
+        return False
+    if n == 1:
+        return True
+    if n < 5:
+        return False
+    return n % 2 == 0 or (r + c) % 2 == 0
+
+
+@lru_cache(maxsize=None)
+def solvable_starts(n: int) -> tuple[Pos, ...]:
+    return tuple((r, c) for r in range(n) for c in range(n) if is_solvable(n, (r, c)))
+
+
+def construct_tour(n: int, start: Pos, max_backtracks: Optional[int] = None) -> Optional[list[Pos]]:
+    # Warnsdorff's rule (fewest onward moves first) with ties broken towards the rim, which keeps the
+    # hard-to-reach edge squares from being stranded. It almost never needs to back up, so a tour costs
+    # O(n^2) steps. If the greedy walk does hit a dead end, it is redone as a backtracking search that
+    # also skips moves stranding an unvisited square (the check behind the 'warnsdorff' heuristic),
+    # giving up after max_backtracks (default n^2) dead ends.
+    if not is_solvable(n, start):
+        return None
+
+    targets, masks = _move_tables(n)
+    size = n * n
+    full = (1 << size) - 1
+    centre = n - 1
+    rim = [(2 * (sq // n) - centre) ** 2 + (2 * (sq % n) - centre) ** 2 for sq in range(size)]
+
+    def stranded(cur: int, visited: int) -> bool:
+        unvisited = full & ~visited
+        ends = 0
+        rest = unvisited
+        while rest:
+            bit = rest & -rest
+            rest ^= bit
+            sq = bit.bit_length() - 1
+            degree = (masks[sq] & unvisited).bit_count() + ((masks[cur] >> sq) & 1)
+            if degree == 0:
+                return True
+            if degree == 1:
+                ends += 1
+                if ends > 1:
+                    return True
+        return False
+
+    def ordered(sq: int, visited: int, prune: bool) -> list[int]:
+        options = [t for t in targets[sq] if not (visited >> t) & 1]
+        if prune:
+            # Plain Warnsdorff order here: the rim preference is what misled the greedy walk.
+            options = [t for t in options if not stranded(t, visited | (1 << t))]
+            options.reverse()
+            options.sort(key=lambda t: -(masks[t] & ~visited).bit_count())
+        else:
+            # pop() takes the last element: lowest onward degree, then furthest from the centre.
+            options.sort(key=lambda t: (-(masks[t] & ~visited).bit_count(), rim[t]))
+        return options
+
+    def walk(prune: bool, limit: int) -> Optional[list[int]]:
+        first = start[0] * n + start[1]
+        path = [first]
+        visited = 1 << first
+        frames = [ordered(first, visited, prune)]
+        backtracks = 0
+        while len(path) < size:
+            options = frames[-1]
+            if not options:
+                backtracks += 1
+                if backtracks > limit or len(path) == 1:
+                    return None
+                frames.pop()
+                visited &= ~(1 << path.pop())
+                continue
+            sq = options.pop()
+            path.append(sq)
+            visited |= 1 << sq
+            frames.append(ordered(sq, visited, prune))
+        return path
+
+    path = walk(False, 0) or walk(True, size if max_backtracks is None else max_backtracks)
+    return [divmod(sq, n) for sq in path] if path is not None else None
+
+
+def is_tour(n: int, start: Pos, path: list[Pos]) -> bool:
+    if len(path) != n * n or tuple(path[0]) != tuple(start):
+        return False
+    seen = set()
+    for i, (r, c) in enumerate(path):
+        if not (0 <= r < n and 0 <= c < n) or (r, c) in seen:
+            return False
+        if i and sorted((abs(r - path[i - 1][0]), abs(c - path[i - 1][1]))) != [1, 2]:
+            return False
+        seen.add((r, c))
+    return True
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from Backend.services import Logger
+from .knights_tour_solvability import construct_tour, is_tour
 
 log = Logger("KnightsTourValidator")
 
@@ -15,5 +16,14 @@ class KnightsTourValidator:
             return False
         if r < 0 or c < 0 or r >= board_size or c >= board_size:
             return False
+        # An instance without any tour would make every algorithm run out its whole budget; the
+        # constructed tour, once checked move by move, is a witness that this start is solvable.
+        tour = construct_tour(board_size, (r, c))
+        if tour is None:
+            log.warn("Knights Tour instance has no tour", ctx={"board_size": board_size, "start": [r, c]})
+            return False
+        if not is_tour(board_size, (r, c), tour):
+            log.error("Constructed Knights Tour is not a valid tour", ctx={"board_size": board_size, "start": [r, c]})
+            return False
         log.ok("Knights Tour instance valid", ctx={"board_size": board_size, "start": [r, c]})
         return True
\ No newline at end of file
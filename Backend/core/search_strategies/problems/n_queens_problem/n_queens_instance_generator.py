@@ -4,99 +4,73 @@ import random
 from typing import Any
 
 from Backend.services import Logger
-from .n_queens_validator import NQueensValidator
-
-from Backend.core.search_strategies.algorithms_generic import backtracking as bt
-from Backend.core.search_strategies.problems.nqueens import build_nqueens_problem
-from Backend.core.search_strategies.search_problem import SearchBudget
+from .n_queens_solution_index import solution_index
 
 log = Logger("NQueensInstanceGenerator")
 
+
+def _random_solution(n: int) -> list[int]:
+    # Randomized bitboard backtracking: shuffling each row's free columns makes every run land on a
+    # different full solution, and for the board sizes we ask about the first one is found almost
+    # immediately (no dead ends at all for most seeds).
+    full = (1 << n) - 1
+
+    def free_columns(cols: int, ld: int, rd: int) -> list[int]:
+        free = full & ~(cols | ld | rd)
+        options = [c for c in range(n) if free >> c & 1]
+        random.shuffle(options)
+        return options
+
+    placed: list[int] = []
+    frames = [(0, 0, 0, free_columns(0, 0, 0))]
+    while frames:
+        cols, ld, rd, options = frames[-1]
+        if not options:
+            frames.pop()
+            if placed:
+                placed.pop()
+            continue
+
+        c = options.pop()
+        bit = 1 << c
+        placed.append(c)
+        if len(placed) == n:
+            return placed
+
+        cols, ld, rd = cols | bit, ((ld | bit) << 1) & full, (rd | bit) >> 1
+        frames.append((cols, ld, rd, free_columns(cols, ld, rd)))
+
+    raise ValueError(f"N-Queens has no solution for n={n}")
+
+
 class NQueensInstanceGenerator:
     @staticmethod
     def generate(board_size: int) -> dict[str, Any]:
+        # Presets are the first rows of a random full solution (drawn uniformly from the solution index
+        # where one exists), so every generated board is solvable by construction. The number of preset
+        # queens is drawn exactly as before (uniform in 0..n).
+        if board_size < 1 or board_size in (2, 3):
+            raise ValueError(f"N-Queens has no solution for n={board_size}; use n=1 or n>=4")
+
         num_queens = random.randint(0, board_size)
+        index = solution_index(board_size)
+        if index is not None:
+            solution = index.solution(random.randrange(index.total))
+        else:
+            solution = _random_solution(board_size)
 
-        log.info(
-            "Generating N-Queens instance",
+        board = [[0] * board_size for _ in range(board_size)]
+        for r in range(num_queens):
+            board[r][solution[r]] = 1
+
+        log.ok(
+            "Generated solvable N-Queens instance",
             ctx={"board_size": board_size, "num_queens": num_queens},
         )
 
-        board = [[0] * board_size for _ in range(board_size)]
-        validator = NQueensValidator()
-
-        attempts = 0
-        while True:
-            attempts += 1
-
-            for r in range(board_size):
-                for c in range(board_size):
-                    board[r][c] = 0
-
-            positions = random.sample(range(board_size), num_queens)
-            for r, c in enumerate(positions):
-                board[r][c] = 1
-
-            is_valid = validator.is_valid(board, num_queens)
-            if not is_valid:
-                if attempts % 10 == 0:
-                    log.info(
-                        "Still searching for a valid solvable instance",
-                        ctx={
-                            "attempts": attempts,
-                            "board_size": board_size,
-                            "num_queens": num_queens,
-                            "status": "invalid_board",
-                        },
-                    )
-                if attempts > 100:
-                    log.error(
-                        "Failed to generate a valid N-Queens instance after max attempts",
-                        ctx={"attempts": attempts, "board_size": board_size, "num_queens": num_queens},
-                    )
-                    raise RuntimeError("Failed to generate a valid N-Queens instance after 100 tries.")
-                continue
-
-            try:
-                problem = build_nqueens_problem(board)
-                budget = SearchBudget(max_time_s=0.7, max_expansions=200_000)
-                solvable = bt(problem, budget) is not None
-            except Exception as e:
-                log.error(
-                    "Backtracking crashed while validating solvability",
-                    ctx={"attempts": attempts, "board_size": board_size, "num_queens": num_queens},
-                    exc=e,
-                )
-                solvable = False
-
-            if solvable:
-                log.ok(
-                    "Generated solvable N-Queens instance",
-                    ctx={"attempts": attempts, "board_size": board_size, "num_queens": num_queens},
-                )
-                break
-
-            if attempts % 10 == 0:
-                log.info(
-                    "Still searching for a valid solvable instance",
-                    ctx={
-                        "attempts": attempts,
-                        "board_size": board_size,
-                        "num_queens": num_queens,
-                        "status": "not_solvable_yet",
-                    },
-                )
-
-            if attempts > 100:
-                log.error(
-                    "Failed to generate a solvable N-Queens instance after max attempts",
-                    ctx={"attempts": attempts, "board_size": board_size, "num_queens": num_queens},
-                )
-                raise RuntimeError("Failed to generate a solvable N-Queens instance after 100 tries.")
-
         return {
             "problem_name": "N-Queens",
             "board_size": board_size,
             "queen_number_on_board": num_queens,
             "board": board,
-        }
\ No newline at end of file
+        }
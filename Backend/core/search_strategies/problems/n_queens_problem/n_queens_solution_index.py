@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import os
+import struct
+import sys
+import threading
+from array import array
+from typing import Optional, Sequence
+
+from Backend.core.search_strategies.atomic_file import atomic_write
+from Backend.services import Logger
+
+log = Logger("NQueensSolutionIndex")
+
+# Every solution of an n x n board fits comfortably in memory up to here (14,200 for n=12); beyond it
+# callers fall back to search.
+INDEX_MAX_N = 12
+
+# Optional directory where built indexes are kept across restarts (one file per n). Without it the
+# index is rebuilt in memory on first use, which takes a fraction of a second for n=12.
+INDEX_DIR = os.getenv("NQUEENS_INDEX_DIR", "").strip() or None
+
+# Bump whenever the file layout changes, so stale files are rebuilt instead of misread.
+INDEX_VERSION = 1
+
+_MAGIC = b"NQIX"
+_HEADER = struct.Struct("<4sHBBII")
+
+
+def _all_solutions(n: int) -> array:
+    # Bitboard enumeration in lexicographic column order, so the prefixes sharing a trie node are
+    # contiguous and the first one reached is the node's sample completion.
+    full = (1 << n) - 1
+    out = array("B")
+    placed: list[int] = []
+
+    def place(cols: int, ld: int, rd: int) -> None:
+        if len(placed) == n:
+            out.extend(placed)
+            return
+        free = full & ~(cols | ld | rd)
+        while free:
+            bit = free & -free
+            free ^= bit
+            placed.append(bit.bit_length() - 1)
+            place(cols | bit, ((ld | bit) << 1) & full, (rd | bit) >> 1)
+            placed.pop()
+
+    place(0, 0, 0)
+    return out
+
+
+class NQueensSolutionIndex:
+    # Prefix trie over every solution of one board size, stored as flat arrays: node i's child for
+    # column c is child[i * n + c] (-1 when no solution continues that way), count[i] is the number
+    # of solutions below it and first[i] the index of one of them in `solutions` (n bytes each).
+    # Node 0 is the empty prefix.
+
+    def __init__(self, n: int, child: array, count: array, first: array, solutions: array):
+        self.n = n
+        self.child = child
+        self.count = count
+        self.first = first
+        self.solutions = solutions
+
+    @classmethod
+    def build(cls, n: int) -> "NQueensSolutionIndex":
+        solutions = _all_solutions(n)
+        child = array("i", [-1] * n)
+        count = array("I", [0])
+        first = array("i", [0])
+
+        for s in range(len(solutions) // n if n else 0):
+            node = 0
+            count[0] += 1
+            for c in solutions[s * n : (s + 1) * n]:
+                nxt = child[node * n + c]
+                if nxt < 0:
+                    nxt = len(count)
+                    child[node * n + c] = nxt
+                    child.extend([-1] * n)
+                    count.append(0)
+                    first.append(s)
+                node = nxt
+                count[node] += 1
+
+        return cls(n, child, count, first, solutions)
+
+    @property
+    def total(self) -> int:
+        return self.count[0]
+
+    def node(self, prefix: Sequence[int]) -> int:
+        n = self.n
+        node = 0
+        for c in prefix:
+            if not 0 <= c < n:
+                return -1
+            node = self.child[node * n + c]
+            if node < 0:
+                return -1
+        return node
+
+    def is_extendable(self, prefix: Sequence[int]) -> bool:
+        return self.count_completions(prefix) > 0
+
+    def count_completions(self, prefix: Sequence[int]) -> int:
+        node = self.node(prefix)
+        return self.count[node] if node >= 0 else 0
+
+    def completion(self, prefix: Sequence[int]) -> Optional[list[int]]:
+        node = self.node(prefix)
+        if node < 0 or self.count[node] == 0:
+            return None
+        return self.solution(self.first[node])
+
+    def solution(self, i: int) -> list[int]:
+        return list(self.solutions[i * self.n : (i + 1) * self.n])
+
+    def _dump(self, fh) -> None:
+        fh.write(_HEADER.pack(_MAGIC, INDEX_VERSION, self.n, sys.byteorder == "little", len(self.count), self.total))
+        for arr in (self.child, self.count, self.first, self.solutions):
+            arr.tofile(fh)
+
+    @classmethod
+    def _read(cls, fh, n: int) -> Optional["NQueensSolutionIndex"]:
+        raw = fh.read(_HEADER.size)
+        if len(raw) != _HEADER.size:
+            return None
+        magic, version, file_n, little, nodes, total = _HEADER.unpack(raw)
+        # Arrays are stored in native byte order, so a file from another architecture is just rebuilt.
+        if magic != _MAGIC or version != INDEX_VERSION or file_n != n or bool(little) != (sys.byteorder == "little"):
+            return None
+        child, count, first, solutions = array("i"), array("I"), array("i"), array("B")
+        child.fromfile(fh, nodes * n)
+        count.fromfile(fh, nodes)
+        first.fromfile(fh, nodes)
+        solutions.fromfile(fh, total * n)
+        return cls(n, child, count, first, solutions)
+
+
+_indexes: dict[int, NQueensSolutionIndex] = {}
+_lock = threading.Lock()
+
+
+def _path(n: int) -> str:
+    return os.path.join(INDEX_DIR or "", f"nqueens_{n}_v{INDEX_VERSION}.bin")
+
+
+def _load(n: int) -> Optional[NQueensSolutionIndex]:
+    if not INDEX_DIR:
+        return None
+    try:
+        with open(_path(n), "rb") as fh:
+            return NQueensSolutionIndex._read(fh, n)
+    except FileNotFoundError:
+        return None
+    except (OSError, EOFError, ValueError) as e:
+        log.warn("Unreadable N-Queens index ignored", {"n": n, "error": str(e)})
+        return None
+
+
+def _store(index: NQueensSolutionIndex) -> None:
+    if not INDEX_DIR:
+        return
+    try:
+        os.makedirs(INDEX_DIR, exist_ok=True)
+        atomic_write(_path(index.n), index._dump)
+    except OSError as e:
+        log.error("N-Queens index not persisted", {"n": index.n}, exc=e)
+
+
+def solution_index(n: int) -> Optional[NQueensSolutionIndex]:
+    # Built (or loaded) on first use per size; None when n is too large to index.
+    if not 1 <= n <= INDEX_MAX_N:
+        return None
+    with _lock:
+        index = _indexes.get(n)
+        if index is None:
+            index = _load(n)
+            if index is None:
+                index = NQueensSolutionIndex.build(n)
+                _store(index)
+                log.ok("N-Queens solution index built", {"n": n, "solutions": index.total, "nodes": len(index.count)})
+            _indexes[n] = index
+        return index
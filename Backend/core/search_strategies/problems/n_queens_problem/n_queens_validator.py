@@ -1,4 +1,10 @@
+from typing import Optional
+
 from Backend.services import Logger
+from Backend.core.search_strategies.algorithms_generic import backtracking
+from Backend.core.search_strategies.problems.nqueens import board_to_preset, build_nqueens_problem
+from Backend.core.search_strategies.search_problem import SearchBudget
+from .n_queens_solution_index import solution_index
 
 log = Logger("NQueensValidator")
 
@@ -24,3 +30,48 @@ class NQueensValidator:
 
         log.ok("Board is valid", ctx={"board_size": n, "num_queens": num_queens})
         return True
+
+    @staticmethod
+    def is_solvable(board: list[list[int]]) -> Optional[bool]:
+        # Boards are solved row by row from their preset prefix (see board_to_preset), which is exactly
+        # what the solution index answers without searching; larger boards fall back to backtracking,
+        # and None means that search ran out of budget, not that the board has no solution.
+        preset = _preset(board)
+        if preset is None:
+            return False
+        index = solution_index(len(board))
+        if index is not None:
+            return index.is_extendable(preset)
+        budget = SearchBudget(max_time_s=0.7, max_expansions=200_000)
+        if backtracking(build_nqueens_problem(board), budget) is not None:
+            return True
+        if budget.exceeded():
+            log.warn("N-Queens solvability unknown, search budget exhausted", ctx={"board_size": len(board)})
+            return None
+        return False
+
+    @staticmethod
+    def count_completions(board: list[list[int]]) -> Optional[int]:
+        # Number of full solutions extending the board; None beyond the indexed sizes, where it would
+        # take a search over every completion.
+        index = solution_index(len(board))
+        if index is None:
+            return None
+        preset = _preset(board)
+        return index.count_completions(preset) if preset is not None else 0
+
+    @staticmethod
+    def completion(board: list[list[int]]) -> Optional[list[int]]:
+        # One full solution extending the board (queen column per row), or None.
+        index = solution_index(len(board))
+        preset = _preset(board)
+        if index is None or preset is None:
+            return None
+        return index.completion(preset)
+
+
+def _preset(board: list[list[int]]) -> Optional[tuple[int, ...]]:
+    # Queens outside the preset prefix would be ignored by the search problems, so such boards have no
+    # valid preset at all.
+    preset = board_to_preset(board)
+    return preset if sum(map(sum, board)) == len(preset) else None
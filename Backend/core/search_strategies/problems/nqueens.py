@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Hashable, Iterable, Tuple
+import math
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Hashable, Iterable, List, Sequence, Tuple
 
-from Backend.core.search_strategies.search_problem import SearchProblem, State
+from Backend.core.search_strategies.search_problem import Expansion, SearchProblem, State
 
 
 @dataclass(frozen=True)
@@ -22,6 +23,10 @@ class NQueensProblem(SearchProblem):
     def key(self, state: State) -> Hashable:
         return state
 
+    def depth(self, state: State) -> int:
+        s: Tuple[int, ...] = state
+        return len(s) - len(self.preset)
+
     def heuristic(self, state: State) -> float:
         s: Tuple[int, ...] = state
         return float(self.n - len(s))
@@ -49,7 +54,131 @@ def _is_valid(col: int, partial: Tuple[int, ...]) -> bool:
     return True
 
 
-def build_nqueens_problem(board: list[list[int]]) -> NQueensProblem:
+# Bitboard state: (placed columns, column mask, left-diagonal mask, right-diagonal mask).
+# Diagonal masks are already shifted into the frame of the next row to fill.
+BitboardState = Tuple[Tuple[int, ...], int, int, int]
+
+
+@dataclass(frozen=True)
+class NQueensBitboardProblem(SearchProblem):
+    name: str
+    n: int
+    preset: Tuple[int, ...]
+    heuristic_name: str = "remaining"
+    full: int = field(init=False, repr=False, compare=False)
+    h_fn: Callable[["NQueensBitboardProblem", State], float] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.heuristic_name not in HEURISTICS:
+            raise ValueError(f"Unknown N-Queens heuristic: {self.heuristic_name}")
+        object.__setattr__(self, "full", (1 << self.n) - 1)
+        object.__setattr__(self, "h_fn", HEURISTICS[self.heuristic_name])
+
+    def initial_state(self) -> State:
+        cols = ld = rd = 0
+        for col in self.preset:
+            bit = 1 << col
+            cols |= bit
+            ld = ((ld | bit) << 1) & self.full
+            rd = (rd | bit) >> 1
+        return (self.preset, cols, ld, rd)
+
+    def is_goal(self, state: State) -> bool:
+        s: BitboardState = state
+        return len(s[0]) == self.n
+
+    def key(self, state: State) -> Hashable:
+        s: BitboardState = state
+        return s[0]
+
+    def depth(self, state: State) -> int:
+        s: BitboardState = state
+        return len(s[0]) - len(self.preset)
+
+    def heuristic(self, state: State) -> float:
+        return self.h_fn(self, state)
+
+    def rank(self, state: State) -> Tuple[float, float]:
+        r_fn = RANKS.get(self.heuristic_name)
+        return r_fn(self, state) if r_fn is not None else (self.h_fn(self, state), 0.0)
+
+    def neighbors(self, state: State) -> Iterable[Tuple[State, int]]:
+        placed, cols, ld, rd = state
+        if len(placed) >= self.n:
+            return []
+
+        full = self.full
+        free = ~(cols | ld | rd) & full
+
+        out: list[Tuple[State, int]] = []
+        while free:
+            bit = free & -free
+            free ^= bit
+            col = bit.bit_length() - 1
+            out.append(((placed + (col,), cols | bit, ((ld | bit) << 1) & full, (rd | bit) >> 1), 1))
+        return out
+
+    def expand_batch(self, states: Sequence[State], with_heuristic: bool = True) -> List[List[Expansion]]:
+        # The key is the placed-columns tuple; under 'remaining' every child is one row closer to the goal.
+        n = self.n
+        full = self.full
+        incremental = with_heuristic and self.h_fn is _h_remaining and self.heuristic_name not in RANKS
+        out: List[List[Expansion]] = []
+
+        for placed, cols, ld, rd in states:
+            children: List[Expansion] = []
+            if len(placed) < n:
+                h = float(n - len(placed) - 1) if incremental else None
+                free = ~(cols | ld | rd) & full
+                while free:
+                    bit = free & -free
+                    free ^= bit
+                    nplaced = placed + (bit.bit_length() - 1,)
+                    children.append(((nplaced, cols | bit, ((ld | bit) << 1) & full, (rd | bit) >> 1), nplaced, 1, h))
+            out.append(children)
+
+        return out
+
+
+def _h_remaining(problem: NQueensBitboardProblem, state: State) -> float:
+    s: BitboardState = state
+    return float(problem.n - len(s[0]))
+
+
+def _rank_conflicts(problem: NQueensBitboardProblem, state: State) -> Tuple[float, float]:
+    # Remaining rows, or inf when some future row is already fully attacked (no completion exists);
+    # ties are broken towards fewer attacked squares in the future rows.
+    placed, cols, ld, rd = state
+    n = problem.n
+    full = problem.full
+    remaining = n - len(placed)
+
+    attacked = 0
+    for t in range(remaining):
+        blocked = (cols | (ld << t) | (rd >> t)) & full
+        if blocked == full:
+            return math.inf, 0.0
+        attacked += blocked.bit_count()
+
+    return float(remaining), float(attacked)
+
+
+def _h_conflicts(problem: NQueensBitboardProblem, state: State) -> float:
+    return _rank_conflicts(problem, state)[0]
+
+
+HEURISTICS: Dict[str, Callable[[NQueensBitboardProblem, State], float]] = {
+    "remaining": _h_remaining,
+    "conflicts": _h_conflicts,
+}
+
+# Heuristics with a tie-break (see rank()); the others never break ties.
+RANKS: Dict[str, Callable[[NQueensBitboardProblem, State], Tuple[float, float]]] = {
+    "conflicts": _rank_conflicts,
+}
+
+
+def board_to_preset(board: list[list[int]]) -> Tuple[int, ...]:
     n = len(board)
     preset: list[int] = []
     for row in range(n):
@@ -61,9 +190,22 @@ def build_nqueens_problem(board: list[list[int]]) -> NQueensProblem:
         if found is None:
             break
         preset.append(found)
+    return tuple(preset)
+
+
+def build_nqueens_problem(
+    board: list[list[int]],
+    bitboard: bool = True,
+    heuristic: str | None = None,
+) -> NQueensProblem | NQueensBitboardProblem:
+    preset = board_to_preset(board)
+    if bitboard:
+        return NQueensBitboardProblem(name="N-Queens", n=len(board), preset=preset, heuristic_name=heuristic or "remaining")
+    if heuristic not in (None, "remaining"):
+        raise ValueError("N-Queens heuristics other than 'remaining' require the bitboard representation")
 
     return NQueensProblem(
         name="N-Queens",
-        n=n,
-        preset=tuple(preset),
+        n=len(board),
+        preset=preset,
     )
\ No newline at end of file
@@ -1,22 +1,90 @@
 from __future__ import annotations
 
 from Backend.core.search_strategies.search_problem import SearchProblem
+from Backend.core.search_strategies.problems import nqueens, graph_coloring, knights_tour, generalized_hanoi
 from Backend.core.search_strategies.problems.nqueens import build_nqueens_problem
 from Backend.core.search_strategies.problems.graph_coloring import build_graph_coloring_problem
 from Backend.core.search_strategies.problems.knights_tour import build_knights_tour_problem
 from Backend.core.search_strategies.problems.generalized_hanoi import build_generalized_hanoi_problem
+from Backend.core.search_strategies.problems.n_queens_problem.n_queens_instance_generator import NQueensInstanceGenerator
+from Backend.core.search_strategies.problems.graph_coloring_problem.graph_coloring_instance_generator import GraphColoringInstanceGenerator
+from Backend.core.search_strategies.problems.knights_tour_problem.knights_tour_instance_generator import KnightsTourInstanceGenerator
+from Backend.core.search_strategies.problems.generalized_hanoi_problem.generalized_hanoi_instance_generator import GeneralizedHanoiInstanceGenerator
 
 
-def build_problem(problem_key: str, instance: dict) -> SearchProblem:
+HEURISTICS = {
+    "nqueens": nqueens.HEURISTICS,
+    "graph_coloring": graph_coloring.HEURISTICS,
+    "knights_tour": knights_tour.HEURISTICS,
+    "generalized_hanoi": generalized_hanoi.HEURISTICS,
+}
+
+# Instance size bounds per difficulty ("def" is the size used when none is requested).
+SIZE_RULES: dict[str, dict[str, dict[str, int]]] = {
+    "easy": {
+        "nqueens": {"min": 4, "max": 5, "def": 4},
+        "graph_coloring": {"min": 4, "max": 9, "def": 6},
+        "knights_tour": {"min": 5, "max": 7, "def": 5},
+        "generalized_hanoi": {"min": 3, "max": 6, "def": 4},
+    },
+    "medium": {
+        "nqueens": {"min": 4, "max": 8, "def": 6},
+        "graph_coloring": {"min": 6, "max": 14, "def": 9},
+        "knights_tour": {"min": 5, "max": 9, "def": 6},
+        "generalized_hanoi": {"min": 3, "max": 10, "def": 5},
+    },
+    "hard": {
+        "nqueens": {"min": 6, "max": 10, "def": 8},
+        "graph_coloring": {"min": 10, "max": 18, "def": 12},
+        "knights_tour": {"min": 7, "max": 10, "def": 8},
+        "generalized_hanoi": {"min": 6, "max": 14, "def": 8},
+    },
+}
+
+
+def canonical_problem_key(problem_key: str) -> str:
     p = (problem_key or "").strip().lower()
     if p in ("nqueens", "n-queens", "n_queens"):
-        board = instance if isinstance(instance, list) else (instance.get("board") or [])
-        return build_nqueens_problem(board)
+        return "nqueens"
     if p in ("graph_coloring", "graph-coloring", "coloring"):
-        return build_graph_coloring_problem(instance)
+        return "graph_coloring"
     if p in ("knights_tour", "knightstour", "knights-tour"):
-        return build_knights_tour_problem(instance)
+        return "knights_tour"
     if p in ("generalized_hanoi", "hanoi", "tower_of_hanoi"):
-        return build_generalized_hanoi_problem(instance)
+        return "generalized_hanoi"
+
+    raise ValueError(f"Unknown problem_key: {problem_key}")
+
+
+def heuristic_names(problem_key: str) -> list[str]:
+    return list(HEURISTICS[canonical_problem_key(problem_key)])
+
+
+def build_problem(problem_key: str, instance: dict, heuristic: str | None = None) -> SearchProblem:
+    p = canonical_problem_key(problem_key)
+    if heuristic is not None and heuristic not in HEURISTICS[p]:
+        raise ValueError(f"Unknown heuristic '{heuristic}' for {p} (available: {sorted(HEURISTICS[p])})")
+
+    if p == "nqueens":
+        board = instance if isinstance(instance, list) else (instance.get("board") or [])
+        return build_nqueens_problem(board, heuristic=heuristic)
+    if p == "graph_coloring":
+        return build_graph_coloring_problem(instance, heuristic=heuristic)
+    if p == "knights_tour":
+        return build_knights_tour_problem(instance, heuristic=heuristic)
+    return build_generalized_hanoi_problem(instance, heuristic=heuristic)
+
 
-    raise ValueError(f"Unknown problem_key: {problem_key}")
\ No newline at end of file
+def build_instance(problem_key: str, difficulty: str, size: int) -> dict:
+    # Shared by the question handler and the benchmark suite, so both work on the same instances.
+    p = canonical_problem_key(problem_key)
+    if p == "nqueens":
+        return NQueensInstanceGenerator.generate(size)
+    if p == "graph_coloring":
+        num_colors = {"easy": 3, "medium": 4, "hard": 5}.get(difficulty, 4)
+        num_colors = max(2, min(num_colors, size))
+        return GraphColoringInstanceGenerator.generate(size, num_colors=num_colors)
+    if p == "knights_tour":
+        return KnightsTourInstanceGenerator.generate(size)
+    pegs = {"easy": 3, "medium": 4, "hard": 5}.get(difficulty, 4)
+    return GeneralizedHanoiInstanceGenerator.generate(size, pegs=pegs)
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import fields, is_dataclass
+from typing import Any, Optional
+
+from Backend.core.search_strategies.atomic_file import atomic_write
+from Backend.services import Logger
+
+log = Logger("SearchResultCache")
+
+# Only used with rank_by="expansions", where the outcome of every algorithm is deterministic; time rankings
+# are always measured afresh. An entry keeps each algorithm's status, expansion count, note and the time of
+# the cached run. Solutions are not stored (problem states do not survive a JSON round trip); the comparator
+# re-runs the winning algorithm on a hit to rebuild it, so a hit costs one search instead of eleven rather
+# than nothing.
+CACHE_SIZE = int(os.getenv("SEARCH_COMPARATOR_CACHE_SIZE", "512") or 0)
+CACHE_DIR = os.getenv("SEARCH_COMPARATOR_CACHE_DIR", "").strip() or None
+# Entries kept in CACHE_DIR; the least recently used files (by mtime, refreshed on every hit) go first.
+CACHE_DISK_SIZE = int(os.getenv("SEARCH_COMPARATOR_CACHE_DISK_SIZE", "4096") or 0)
+
+# Bump whenever an algorithm or problem change alters expansion counts, or the entry layout changes, so
+# stale disk entries stop matching.
+CACHE_VERSION = 3
+
+_CACHED_FIELDS = ("status", "time_s", "note", "expansions")
+
+# Entry files are named "v<CACHE_VERSION>-<key>.json"; files of any other version (or of the unversioned
+# "<key>.json" layout) are removed on start.
+_ENTRY_FILE = re.compile(r"(?:v(\d+)-)?[0-9a-f]{64}\.json")
+
+
+def _signature(problem: Any) -> list:
+    # The problem dataclass' compared fields are exactly what the algorithms see, so two instances that
+    # build equal problems (same preset rows, same deduplicated edge set, ...) share an entry. Geometric
+    # board symmetries are deliberately not folded: children are generated in positional order, so a
+    # mirrored board expands a different number of nodes and would get another ranking.
+    if not is_dataclass(problem):
+        raise TypeError(f"cannot derive a cache signature for {type(problem).__name__}")
+    sig: list = [type(problem).__name__]
+    for f in fields(problem):
+        if f.compare:
+            sig.append([f.name, getattr(problem, f.name)])
+    return sig
+
+
+def instance_key(problem_key: str, problem: Any, max_expansions: int, algorithms: list[str]) -> str:
+    payload = [CACHE_VERSION, problem_key, _signature(problem), int(max_expansions), list(algorithms)]
+    raw = json.dumps(payload, separators=(",", ":"), default=list)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    def __init__(
+        self,
+        max_entries: int = CACHE_SIZE,
+        directory: Optional[str] = CACHE_DIR,
+        max_disk_entries: int = CACHE_DISK_SIZE,
+    ):
+        self.max_entries = max(0, int(max_entries))
+        self.directory = directory
+        self.max_disk_entries = max(0, int(max_disk_entries))
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if self.directory:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+            except OSError as e:
+                log.error("Result cache directory unavailable, keeping the cache in memory", {"dir": self.directory}, exc=e)
+                self.directory = None
+            else:
+                self._prune_disk()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get(self, key: str) -> Optional[dict[str, dict]]:
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            runs = self._entries.get(key)
+            if runs is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return runs
+
+        runs = self._load(key)
+        with self._lock:
+            if runs is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, runs)
+        return runs
+
+    def put(self, key: str, runs: dict[str, dict]) -> None:
+        if not self.enabled:
+            return
+
+        slim = {alg: {f: run.get(f) for f in _CACHED_FIELDS} for alg, run in runs.items()}
+        with self._lock:
+            self._remember(key, slim)
+        self._store(key, slim)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def _remember(self, key: str, runs: dict[str, dict]) -> None:
+        self._entries[key] = runs
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory or "", f"v{CACHE_VERSION}-{key}.json")
+
+    def _load(self, key: str) -> Optional[dict[str, dict]]:
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            log.warn("Unreadable result cache entry ignored", {"key": key, "error": str(e)})
+            return None
+        return data if isinstance(data, dict) else None
+
+    def _store(self, key: str, runs: dict[str, dict]) -> None:
+        if not self.directory:
+            return
+        try:
+            atomic_write(self._path(key), lambda fh: json.dump(runs, fh, separators=(",", ":")), binary=False)
+        except OSError as e:
+            log.error("Result cache entry not persisted", {"key": key}, exc=e)
+            return
+        self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        # Drops entry files of other cache versions, then the oldest current ones beyond max_disk_entries.
+        # Other processes may be pruning the same directory, so files that are already gone are skipped.
+        try:
+            names = os.listdir(self.directory or "")
+        except OSError as e:
+            log.warn("Result cache directory not listed", {"dir": self.directory, "error": str(e)})
+            return
+
+        current: list[tuple[float, str]] = []
+        stale: list[str] = []
+        for name in names:
+            m = _ENTRY_FILE.fullmatch(name)
+            if m is None:
+                continue
+            path = os.path.join(self.directory or "", name)
+            if m.group(1) is None or int(m.group(1)) != CACHE_VERSION:
+                stale.append(path)
+                continue
+            try:
+                current.append((os.path.getmtime(path), path))
+            except OSError:
+                continue
+
+        current.sort()
+        excess = max(0, len(current) - self.max_disk_entries)
+        for path in stale + [path for _mtime, path in current[:excess]]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                log.warn("Result cache entry not removed", {"path": path, "error": str(e)})
+
+
+result_cache = ResultCache()
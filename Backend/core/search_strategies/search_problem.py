@@ -1,11 +1,16 @@
 from __future__ import annotations
 
+import threading
 import time
-from dataclasses import dataclass, field
-from typing import Any, Hashable, Iterable, Protocol, Tuple
+from dataclasses import asdict, dataclass, field
+from typing import Any, Hashable, Iterable, List, Optional, Protocol, Sequence, Tuple
 
 
 State = Any
+# One generated child: (state, key(state), step cost, heuristic(state) or None). The heuristic is only
+# filled in when the problem can derive it more cheaply than heuristic(), and never under a heuristic
+# whose rank() breaks ties (callers rank a returned value as (h, 0.0)); callers fall back otherwise.
+Expansion = Tuple[State, Hashable, int, Optional[float]]
 
 
 class SearchProblem(Protocol):
@@ -17,6 +22,86 @@ class SearchProblem(Protocol):
     def key(self, state: State) -> Hashable: ...
     def heuristic(self, state: State) -> float: ...
 
+    # Optional: def depth(self, state: State) -> int
+    # Number of moves from the initial state, used for SearchStats.solution_depth.
+
+    # Optional: def rank(self, state: State) -> Tuple[float, float]
+    # (heuristic(state), tie-break). Best-first algorithms order states with equal estimates by the lower
+    # tie-break; heuristic() itself stays an admissible lower bound, so A* keeps returning optimal solutions.
+
+    # Optional: def is_optimal_cost(self, cost: int) -> bool
+    # Whether a solution of this many moves is optimal, for problems with a known optimum; the comparator
+    # reports it for the algorithms that guarantee cheapest solutions.
+
+
+class BidirectionalSearchProblem(SearchProblem, Protocol):
+    """Optional extension for problems with one explicit goal state that can also be searched backwards."""
+
+    def goal_state(self) -> State: ...
+    def predecessors(self, state: State) -> Iterable[Tuple[State, int]]: ...
+
+
+class BatchExpansionProblem(SearchProblem, Protocol):
+    """Optional extension that expands several states per call and returns keys and heuristics with the children."""
+
+    # One list per input state, children in neighbors() order; with_heuristic=False leaves every value None.
+    # BFS and beam search expand whole batches through it; A* pops one state at a time and uses neighbors().
+    def expand_batch(self, states: Sequence[State], with_heuristic: bool = True) -> List[List[Expansion]]: ...
+
+
+@dataclass
+class SearchStats:
+    expanded: int = 0
+    generated: int = 0
+    peak_frontier: int = 0
+    peak_seen: int = 0
+    solution_depth: Optional[int] = None
+    peak_bytes: Optional[int] = None
+
+    def observe(self, frontier: int, seen: int) -> None:
+        if frontier > self.peak_frontier:
+            self.peak_frontier = frontier
+        if seen > self.peak_seen:
+            self.peak_seen = seen
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass
+class CancelToken:
+    # Shared by every search of one request: cancel() stops them all, and deadline_s (seconds from
+    # creation) bounds the whole request rather than a single algorithm.
+    deadline_s: Optional[float] = None
+    created: float = field(default_factory=time.perf_counter)
+    _event: threading.Event = field(default_factory=threading.Event, init=False, repr=False, compare=False)
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    def remaining_s(self, now: Optional[float] = None) -> Optional[float]:
+        if self.deadline_s is None:
+            return None
+        now = time.perf_counter() if now is None else now
+        return self.created + self.deadline_s - now
+
+    def expired(self, now: Optional[float] = None) -> bool:
+        if self._event.is_set():
+            return True
+        left = self.remaining_s(now)
+        return left is not None and left <= 0
+
+    @property
+    def cancelled(self) -> bool:
+        # True only after an explicit cancel(), not when the deadline merely ran out.
+        return self._event.is_set()
+
+
+# step() reads the clock only every `check_every` calls; the stride adapts so that a clock read
+# happens roughly every _CLOCK_INTERVAL_S, which bounds the time overshoot to about that much.
+_CLOCK_INTERVAL_S = 0.001
+_MAX_CHECK_EVERY = 4096
+
 
 @dataclass
 class SearchBudget:
@@ -24,6 +109,11 @@ class SearchBudget:
     max_expansions: int = 300_000
     started: float = field(default_factory=time.perf_counter)
     expansions: int = 0
+    stats: Optional[SearchStats] = None
+    cancel: Optional[CancelToken] = None
+    check_every: int = field(default=1, init=False, repr=False)
+    _countdown: int = field(default=1, init=False, repr=False)
+    _last_clock: float = field(default_factory=time.perf_counter, init=False, repr=False)
 
     def tick(self, n: int = 1) -> None:
         self.expansions += n
@@ -36,4 +126,32 @@ class SearchBudget:
             return True
         if self.time_s() >= self.max_time_s:
             return True
+        if self.cancel is not None and self.cancel.expired():
+            return True
+        return False
+
+    def step(self) -> bool:
+        # Same as `if exceeded(): stop` followed by tick(), with the clock read amortized.
+        if self.expansions >= self.max_expansions:
+            return True
+        self._countdown -= 1
+        if self._countdown <= 0 and self._clock_exceeded():
+            return True
+        self.expansions += 1
+        return False
+
+    def _clock_exceeded(self) -> bool:
+        now = time.perf_counter()
+        if now - self.started >= self.max_time_s:
+            return True
+        if self.cancel is not None and self.cancel.expired(now):
+            return True
+
+        since = now - self._last_clock
+        self._last_clock = now
+        if since < _CLOCK_INTERVAL_S / 2:
+            self.check_every = min(self.check_every * 2, _MAX_CHECK_EVERY)
+        elif since > _CLOCK_INTERVAL_S * 2:
+            self.check_every = max(self.check_every // 2, 1)
+        self._countdown = self.check_every
         return False
@@ -1,10 +1,29 @@
 from .logging_service import Logger, LogConfig
-from .question_service import generate_question
-from .evaluation_service import evaluate_answer
 
 __all__ = [
     "Logger",
     "LogConfig",
     "generate_question",
+    "generate_question_stream",
     "evaluate_answer",
 ]
+
+# The question and evaluation services import Backend.core, whose modules import
+# Logger from this package; load them on first access so that importing Logger
+# does not pull them in (and back into Backend.core) mid-initialisation.
+_LAZY = {
+    "generate_question": "question_service",
+    "generate_question_stream": "question_service",
+    "evaluate_answer": "evaluation_service",
+}
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
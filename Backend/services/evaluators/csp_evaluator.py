@@ -5,7 +5,7 @@ import re
 from typing import Any, Dict, Optional, Tuple
 
 from Backend.services import Logger
-from Backend.core.constrain_satisfaction_problems.instance_solver import CSPSolver
+from Backend.core.constrain_satisfaction_problems.instance_solver import TRACE_OFF, CSPSolver
 
 log = Logger("Eval.CSP")
 
@@ -180,7 +180,7 @@ def _try_solve_from_meta(item: Any) -> Tuple[Optional[bool], Optional[Assignment
 
     payload = _build_solver_payload(meta, inst)
 
-    solved = CSPSolver.solve(payload, strict=True)
+    solved = CSPSolver.solve(payload, strict=True, trace_level=TRACE_OFF)
     if not solved.get("ok"):
         return None, None, str(solved.get("error") or "csp solver failed")
 
@@ -219,7 +219,7 @@ def _build_explanation(
         "- MRV (Minimum Remaining Values) for variable selection",
         "- LCV (Least Constraining Value) for value ordering",
         "- FC (Forward Checking) for inference",
-        "- AC-3 (Arc Consistency) for consistency enforcement",
+        "- AC-3 / AC-2001 / AC-4 (Arc Consistency) for consistency enforcement",
         "",
         'Answer format accepted: JSON assignment like {"A":1,"B":3} or text like A=1, B=3, or "none" if no solution exists.',
         "",
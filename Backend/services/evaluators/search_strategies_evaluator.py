@@ -5,6 +5,7 @@ from typing import Any, Dict, List, Optional
 
 from Backend.services import Logger
 from Backend.core.search_strategies.algorithm_comparator import AlgorithmComparator, string_name
+from Backend.core.search_strategies.problems.n_queens_problem.n_queens_validator import NQueensValidator
 
 log = Logger("Eval.SearchStrategies")
 
@@ -26,6 +27,10 @@ def _status_label(status: str | None) -> str:
         "missing_entrypoint": "missing entrypoint",
         "import_error": "import error",
         "runtime_error": "runtime error",
+        "not_applicable": "not applicable",
+        "not_implemented": "not implemented",
+        "cancelled": "cancelled",
+        "cutoff": "stopped early",
     }
     return m.get(status or "", status or "unknown")
 
@@ -90,6 +95,17 @@ def _normalize_timings(timings: list[dict], fastest_time_s: float | None) -> lis
     return out
 
 
+def _nqueens_completions(meta: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    # Answered from the solution index, so only for indexed board sizes and questions that stored the board.
+    board = (meta.get("instance") or {}).get("board")
+    if not board:
+        return None
+    count = NQueensValidator.count_completions(board)
+    if count is None:
+        return None
+    return {"count": count, "example": NQueensValidator.completion(board)}
+
+
 def evaluate_search_strategies(*, item: Any, answer: Any, reveal: bool) -> Dict[str, Any]:
     meta = item.meta or {}
 
@@ -127,8 +143,12 @@ def evaluate_search_strategies(*, item: Any, answer: Any, reveal: bool) -> Dict[
     if prob:
         lines.append(f"Problema: {prob}")
 
+    ranked_by = meta.get("ranked_by") or "time"
+
     if fastest_name is not None and fastest_time_s is not None:
         lines.append(f"Cel mai rapid: {fastest_name} ({fastest_time_s:.6f} s)")
+    elif fastest_name is not None and ranked_by == "expansions":
+        lines.append(f"Cel mai rapid: {fastest_name} (cele mai putine noduri expandate)")
 
     if timings:
         lines.append("Timpi rulare (sortati descrescator):")
@@ -147,13 +167,22 @@ def evaluate_search_strategies(*, item: Any, answer: Any, reveal: bool) -> Dict[
 
             if ts_val is None:
                 note = t.get("note")
-                if note:
+                expansions = t.get("expansions")
+                if ranked_by == "expansions" and isinstance(expansions, int):
+                    lines.append(f"- {name}: {expansions} noduri expandate ({status})")
+                elif note:
                     lines.append(f"- {name}: {status} ({note})")
                 else:
                     lines.append(f"- {name}: {status}")
             else:
                 lines.append(f"- {name}: {_fmt_time_s(ts_val)} ({status}{pct_txt})")
 
+    completions = _nqueens_completions(meta) if prob == "nqueens" else None
+    if completions is not None:
+        lines.append(f"Solutii care extind tabla data: {completions['count']}")
+        if completions["example"]:
+            lines.append(f"Exemplu de solutie (coloana reginei pe fiecare rand): {completions['example']}")
+
     resp: Dict[str, Any] = {
         "ok": True,
         "correct": correct,
@@ -170,13 +199,16 @@ def evaluate_search_strategies(*, item: Any, answer: Any, reveal: bool) -> Dict[
             "fastest_algorithm_key": meta.get("fastest_algorithm_key"),
             "fastest_algorithm": meta.get("fastest_algorithm"),
             "fastest_time_s": fastest_time_s,
-            "sorted_by": "time_desc",
+            "sorted_by": "expansions" if ranked_by == "expansions" else "time_desc",
             "timings": timings,
         },
 
         "explanation_lines": lines,
     }
 
+    if completions is not None:
+        resp["search_strategies_comparison"]["nqueens_completions"] = completions
+
     if reveal:
         resp["correct_answer"] = correct_label
 
@@ -26,7 +26,7 @@ from Backend.core.constrain_satisfaction_problems.instance_generator import (
     CSPGenConfig,
     CSPInstanceGenerator,
 )
-from Backend.core.constrain_satisfaction_problems.instance_solver import CSPSolver
+from Backend.core.constrain_satisfaction_problems.instance_solver import TRACE_OFF, CSPSolver
 from Backend.core.question_generator import QuestionGenerator
 from Backend.services import Logger
 from Backend.services.question_handlers.utils import clamp_int
@@ -102,7 +102,7 @@ def _label_consistency(code: str) -> str:
     Convert consistency code to a user-friendly label.
 
     Args:
-        code: Consistency code (e.g., "AC3", "NONE").
+        code: Consistency code (e.g., "AC3", "AC2001", "AC4", "NONE").
 
     Returns:
         A human-readable label.
@@ -110,6 +110,10 @@ def _label_consistency(code: str) -> str:
     code = (code or "").upper()
     if code == "AC3":
         return "AC-3"
+    if code == "AC2001":
+        return "AC-2001"
+    if code == "AC4":
+        return "AC-4"
     if code == "NONE":
         return "None"
     return code
@@ -231,7 +235,7 @@ class CSPQuestionHandler:
               - FC (Forward Checking) inference (or NONE)
               - MRV / NONE variable heuristic
               - LCV / NONE value heuristic
-              - AC3 / NONE consistency (enabled optionally)
+              - AC3 / AC2001 / AC4 / NONE consistency (enabled optionally)
               - Numeric knobs: num_vars, num_constraints, domain_min, domain_max
                 clamped based on difficulty-specific rules.
 
@@ -259,7 +263,7 @@ class CSPQuestionHandler:
         # Sanitize / enforce supported codes.
         if inference not in ("NONE", "FC"):
             inference = "FC"
-        if consistency not in ("NONE", "AC3"):
+        if consistency not in ("NONE", "AC3", "AC2001", "AC4"):
             consistency = "NONE"
         if var_heuristic not in ("NONE", "MRV"):
             var_heuristic = "NONE"
@@ -326,7 +330,8 @@ class CSPQuestionHandler:
         inst = payload.get("instance") or {}
         inst_display = _display_instance(inst)
 
-        solved = CSPSolver.solve(payload, strict=True)
+        # Only the final assignment is asked for and stored, so skip the trace.
+        solved = CSPSolver.solve(payload, strict=True, trace_level=TRACE_OFF)
         if not solved.get("ok"):
             log.warn("CSP solver failed", {"error": solved.get("error")})
             return {"ok": False, "error": "csp solver failed"}
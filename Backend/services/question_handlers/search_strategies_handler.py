@@ -1,42 +1,33 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, Iterator, Tuple
 
 from Backend.config.runtime_store import store
 from Backend.core.question_generator import QuestionGenerator
 from Backend.services import Logger
 from Backend.services.question_handlers.utils import clamp_int
 
-from Backend.core.search_strategies.problems.n_queens_problem.n_queens_instance_generator import NQueensInstanceGenerator
-from Backend.core.search_strategies.problems.graph_coloring_problem.graph_coloring_instance_generator import GraphColoringInstanceGenerator
-from Backend.core.search_strategies.problems.knights_tour_problem.knights_tour_instance_generator import KnightsTourInstanceGenerator
-from Backend.core.search_strategies.problems.generalized_hanoi_problem.generalized_hanoi_instance_generator import GeneralizedHanoiInstanceGenerator
-
-from Backend.core.search_strategies.algorithm_comparator import AlgorithmComparator, string_name
+from Backend.core.search_strategies.algorithm_comparator import QUESTION_RANKING, AlgorithmComparator, request_token, string_name
+from Backend.core.search_strategies.problems.registry import SIZE_RULES, build_instance, heuristic_names
 
 log = Logger("QH.SearchStrategies")
 
 
-_RULES: Dict[str, Dict[str, Dict[str, int]]] = {
-    "easy": {
-        "nqueens": {"min": 2, "max": 5, "def": 4},
-        "graph_coloring": {"min": 4, "max": 9, "def": 6},
-        "knights_tour": {"min": 5, "max": 7, "def": 5},
-        "generalized_hanoi": {"min": 3, "max": 6, "def": 4},
-    },
-    "medium": {
-        "nqueens": {"min": 4, "max": 8, "def": 6},
-        "graph_coloring": {"min": 6, "max": 14, "def": 9},
-        "knights_tour": {"min": 5, "max": 9, "def": 6},
-        "generalized_hanoi": {"min": 3, "max": 10, "def": 5},
-    },
-    "hard": {
-        "nqueens": {"min": 6, "max": 10, "def": 8},
-        "graph_coloring": {"min": 10, "max": 18, "def": 12},
-        "knights_tour": {"min": 7, "max": 10, "def": 8},
-        "generalized_hanoi": {"min": 6, "max": 14, "def": 8},
-    },
+_SIZE_KEYS: Dict[str, Tuple[str, ...]] = {
+    "nqueens": ("n",),
+    "graph_coloring": ("nodes",),
+    "knights_tour": ("n",),
+    "generalized_hanoi": ("disks",),
+}
+
+_DISPLAY_NAMES: Dict[str, str] = {
+    "nqueens": "N-Queens",
+    "graph_coloring": "Graph Coloring",
+    "knights_tour": "Knights Tour",
+    "generalized_hanoi": "Generalized Hanoi",
 }
+
+
 def _norm_problem(options: Dict[str, Any]) -> str:
     return str((options or {}).get("problem") or "nqueens").strip().lower()
 
@@ -47,7 +38,7 @@ def _norm_diff(options: Dict[str, Any]) -> str:
 
 
 def _size_bounds(diff: str, problem: str) -> Tuple[int, int, int]:
-    d = _RULES.get(diff) or _RULES["medium"]
+    d = SIZE_RULES.get(diff) or SIZE_RULES["medium"]
     r = d.get(problem) or d["nqueens"]
     return int(r["min"]), int(r["max"]), int(r["def"])
 
@@ -62,6 +53,10 @@ def _pick_size(options: Dict[str, Any], lo: int, hi: int, default: int, keys: Tu
     return clamp_int(raw, lo, hi, default)
 
 
+def _norm_heuristic(options: Dict[str, Any]) -> str | None:
+    return str((options or {}).get("heuristic") or "").strip().lower() or None
+
+
 def _options_text(labels: list[str]) -> str:
     return ", ".join([str(x) for x in labels if str(x).strip()])
 
@@ -75,47 +70,58 @@ class SearchStrategiesQuestionHandler:
         return (ch_num, sub_num) == (1, 1)
 
     def generate(self, ch_num: int, sub_num: int, template_text: str, options: Dict[str, Any]) -> Dict[str, Any]:
+        resp: Dict[str, Any] = {"ok": False, "error": "internal error: comparison produced no result"}
+        for event in self.generate_stream(ch_num, sub_num, template_text, options):
+            if event["event"] == "done":
+                resp = event["response"]
+        return resp
+
+    def generate_stream(self, ch_num: int, sub_num: int, template_text: str, options: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        # Comparator progress events are passed through as they happen; the last event is always
+        # {"event": "done", "response": <same payload generate() returns>}.
         problem = _norm_problem(options)
         diff = _norm_diff(options)
 
-        lo, hi, default = _size_bounds(diff, problem)
+        if problem not in _SIZE_KEYS:
+            yield {"event": "done", "response": {"ok": False, "error": f"unknown search strategies problem '{problem}'"}}
+            return
+
+        heuristic = _norm_heuristic(options)
+        available = heuristic_names(problem)
+        if heuristic is not None and heuristic not in available:
+            yield {"event": "done", "response": {"ok": False, "error": f"unknown heuristic '{heuristic}' for {problem} (available: {sorted(available)})"}}
+            return
 
-        if problem == "nqueens":
-            size = _pick_size(options, lo, hi, default, ("n",))
-            instance = NQueensInstanceGenerator.generate(size)
-            display_name = "N-Queens"
-
-        elif problem == "graph_coloring":
-            size = _pick_size(options, lo, hi, default, ("nodes",))
-            num_colors = {"easy": 3, "medium": 4, "hard": 5}.get(diff, 4)
-            num_colors = max(2, min(num_colors, size))
-            instance = GraphColoringInstanceGenerator.generate(size, num_colors=num_colors)
-            display_name = "Graph Coloring"
-
-        elif problem == "knights_tour":
-            size = _pick_size(options, lo, hi, default, ("n",))
-            instance = KnightsTourInstanceGenerator.generate(size)
-            display_name = "Knights Tour"
-
-        elif problem == "generalized_hanoi":
-            size = _pick_size(options, lo, hi, default, ("disks",))
-            pegs = {"easy": 3, "medium": 4, "hard": 5}.get(diff, 4)
-            instance = GeneralizedHanoiInstanceGenerator.generate(size, pegs=pegs)
-            display_name = "Generalized Hanoi"
-
-        else:
-            return {"ok": False, "error": f"unknown search strategies problem '{problem}'"}
-
-        comp = AlgorithmComparator.compare(problem, instance)
+        lo, hi, default = _size_bounds(diff, problem)
+        size = _pick_size(options, lo, hi, default, _SIZE_KEYS[problem])
+        instance = build_instance(problem, diff, size)
+        display_name = _DISPLAY_NAMES[problem]
+
+        yield {"event": "instance", "problem": problem, "difficulty": diff, "size": size}
+
+        comp = None
+        # One token for the whole comparison: the deadline caps the request, and closing this stream
+        # (client disconnected) cancels whatever is still running.
+        cancel = request_token()
+        try:
+            for event in AlgorithmComparator.iter_compare(problem, instance, heuristic=heuristic, ranking=QUESTION_RANKING, cancel=cancel):
+                if event["event"] == "result":
+                    comp = event["comparison"]
+                else:
+                    yield event
+        finally:
+            cancel.cancel()
         if comp is None:
-            return {"ok": False, "error": "no valid solution found by any algorithm"}
+            yield {"event": "done", "response": {"ok": False, "error": "no valid solution found by any algorithm"}}
+            return
 
         algo_keys = list(getattr(AlgorithmComparator, "ALGORITHM_ORDER", []))
         algo_labels = [string_name(k) for k in algo_keys]
 
         correct = comp.get("fastest_algorithm_key")
         if not correct:
-            return {"ok": False, "error": "internal error: comparator missing fastest_algorithm_key"}
+            yield {"event": "done", "response": {"ok": False, "error": "internal error: comparator missing fastest_algorithm_key"}}
+            return
 
         render_ctx = {
             "problem_name": display_name,
@@ -130,6 +136,8 @@ class SearchStrategiesQuestionHandler:
             "problem": problem,
             "difficulty": diff,
             "size": size,
+            "instance": instance,
+            "heuristic": comp.get("heuristic"),
 
             "answer_option_keys": algo_keys,
             "answer_options": algo_labels,
@@ -138,12 +146,13 @@ class SearchStrategiesQuestionHandler:
             "timings": comp.get("timings") or [],
             "fastest_algorithm_key": correct,
             "fastest_algorithm": comp.get("fastest_algorithm"),
-            "execution_time": round(float(comp.get("execution_time") or 0.0), 6),
+            "execution_time": round(float(comp["execution_time"]), 6) if comp.get("execution_time") is not None else None,
+            "ranked_by": comp.get("ranked_by") or "time",
         }
 
         qa = store.put(ch_num, sub_num, question_text, str(correct), meta_store)
 
-        return {
+        resp = {
             "ok": True,
             "question": {
                 "question_id": qa.id,
@@ -160,4 +169,6 @@ class SearchStrategiesQuestionHandler:
                     "answer_options": algo_labels,
                 },
             },
-        }
\ No newline at end of file
+        }
+
+        yield {"event": "done", "response": resp}
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Dict, Iterator, Optional, Tuple
 
 from Backend.core.question_generator import QuestionGenerator
 from Backend.persistence.services.question_template_service import get_template_text
@@ -19,7 +19,8 @@ def _pick_difficulty(options: Dict[str, Any]) -> str:
     return "medium"
 
 
-def generate_question(payload: Dict[str, Any]) -> Dict[str, Any]:
+def _resolve(payload: Dict[str, Any]) -> Tuple[Optional[Any], Dict[str, Any]]:
+    # Returns (handler, call args) or (None, error response).
     ch_num = int(payload.get("chapter_number") or 0)
     sub_num = int(payload.get("subchapter_number") or 0)
     options = payload.get("options") or {}
@@ -37,25 +38,58 @@ def generate_question(payload: Dict[str, Any]) -> Dict[str, Any]:
     )
 
     if ch_num <= 0 or sub_num <= 0:
-        return {"ok": False, "error": "chapter_number and subchapter_number are required"}
+        return None, {"ok": False, "error": "chapter_number and subchapter_number are required"}
 
     template_text = get_template_text(ch_num, sub_num, difficulty=difficulty)
     if not template_text:
-        return {"ok": False, "error": "no template found for this chapter/subchapter/difficulty"}
+        return None, {"ok": False, "error": "no template found for this chapter/subchapter/difficulty"}
 
     for h in handlers:
         if h.can_handle(ch_num, sub_num):
-            resp = h.generate(ch_num, sub_num, template_text, options)
-            log.info(
-                "generate_question handled",
-                ctx={
-                    "chapter_number": ch_num,
-                    "subchapter_number": sub_num,
-                    "difficulty": difficulty,
-                    "ok": resp.get("ok"),
-                },
-            )
-            return resp
+            return h, {"ch_num": ch_num, "sub_num": sub_num, "template_text": template_text, "options": options}
 
     log.warn("Subchapter not implemented", {"chapter_number": ch_num, "subchapter_number": sub_num})
-    return {"ok": False, "error": "this subchapter is not implemented yet"}
+    return None, {"ok": False, "error": "this subchapter is not implemented yet"}
+
+
+def _log_handled(args: Dict[str, Any], resp: Dict[str, Any]) -> None:
+    log.info(
+        "generate_question handled",
+        ctx={
+            "chapter_number": args["ch_num"],
+            "subchapter_number": args["sub_num"],
+            "difficulty": _pick_difficulty(args["options"]),
+            "ok": resp.get("ok"),
+        },
+    )
+
+
+def generate_question(payload: Dict[str, Any]) -> Dict[str, Any]:
+    h, args = _resolve(payload)
+    if h is None:
+        return args
+
+    resp = h.generate(args["ch_num"], args["sub_num"], args["template_text"], args["options"])
+    _log_handled(args, resp)
+    return resp
+
+
+def generate_question_stream(payload: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    # Same result as generate_question, delivered as progress events followed by
+    # {"event": "done", "response": ...}. Handlers without generate_stream emit only the final event.
+    h, args = _resolve(payload)
+    if h is None:
+        yield {"event": "done", "response": args}
+        return
+
+    stream = getattr(h, "generate_stream", None)
+    if not callable(stream):
+        resp = h.generate(args["ch_num"], args["sub_num"], args["template_text"], args["options"])
+        _log_handled(args, resp)
+        yield {"event": "done", "response": resp}
+        return
+
+    for event in stream(args["ch_num"], args["sub_num"], args["template_text"], args["options"]):
+        if event.get("event") == "done":
+            _log_handled(args, event.get("response") or {})
+        yield event
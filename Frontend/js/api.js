@@ -13,6 +13,50 @@ export async function postQuestion(payload) {
   return { ok: r.ok, status: r.status, data };
 }
 
+// Same result as postQuestion, but reads the /api/question/stream Server-Sent Events so callers can
+// show progress (onEvent gets every event except the final "done") while long comparisons run.
+export async function postQuestionStream(payload, onEvent) {
+  const r = await fetch("/api/question/stream", {
+    method: "POST",
+    headers: { "Content-Type": "application/json", Accept: "text/event-stream" },
+    body: JSON.stringify(payload)
+  });
+  if (!r.ok || !r.body) {
+    return await postQuestion(payload);
+  }
+
+  const reader = r.body.getReader();
+  const decoder = new TextDecoder();
+  let buf = "";
+  let final = null;
+
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buf += decoder.decode(value, { stream: true });
+
+    let cut;
+    while ((cut = buf.indexOf("\n\n")) >= 0) {
+      const chunk = buf.slice(0, cut);
+      buf = buf.slice(cut + 2);
+      const line = chunk.split("\n").find((l) => l.startsWith("data: "));
+      if (!line) continue;
+
+      const event = JSON.parse(line.slice(6));
+      if (event.event === "done") {
+        final = event.response;
+      } else if (onEvent) {
+        onEvent(event);
+      }
+    }
+  }
+
+  if (!final) {
+    return { ok: false, status: r.status, data: { ok: false, error: "stream ended before the question was ready" } };
+  }
+  return { ok: !!final.ok, status: final.ok ? 200 : 400, data: final };
+}
+
 export async function postCheck(payload) {
   const r = await fetch("/api/question/check", {
     method: "POST",
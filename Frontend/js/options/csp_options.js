@@ -32,6 +32,8 @@ export function renderCspOptions(root) {
           <select id="optCspConsistency" class="select">
             <option value="NONE">NONE</option>
             <option value="AC3">AC3</option>
+            <option value="AC2001">AC2001</option>
+            <option value="AC4">AC4</option>
           </select>
         </label>
       </div>
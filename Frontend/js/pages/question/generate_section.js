@@ -1,4 +1,4 @@
-import { postQuestion } from "../../api.js";
+import { postQuestionStream } from "../../api.js";
 import { collectOptions } from "../../options.js";
 import { formatJson } from "../../ui.js";
 import { setLoading, showError, clearError, clearResult } from "./view.js";
@@ -51,6 +51,25 @@ export function initGenerateSection({ dom, state, catalogApi }) {
     textRoot.textContent = q?.question_text || "";
   }
 
+  function progressReporter() {
+    const lines = [];
+    return (event) => {
+      if (!dom.out) return;
+      if (event.event === "instance") {
+        lines.push(`Instance: ${event.problem} (${event.difficulty}, size ${event.size})`);
+      } else if (event.event === "algorithm") {
+        const t = event.timing || {};
+        const ms = typeof t.time_ms === "number" ? ` in ${t.time_ms} ms` : "";
+        lines.push(`[${event.done}/${event.total}] ${t.name || t.key}: ${t.status}${ms}`);
+      } else if (event.event === "ranking") {
+        lines.push(`Re-running ${event.contenders} solving algorithms to confirm the ranking...`);
+      } else {
+        return;
+      }
+      dom.out.textContent = lines.join("\n");
+    };
+  }
+
   async function onGenerate() {
     clearError(dom);
     clearResult(dom);
@@ -66,11 +85,11 @@ export function initGenerateSection({ dom, state, catalogApi }) {
 
     setLoading(dom, true);
     try {
-      const res = await postQuestion({
+      const res = await postQuestionStream({
         chapter_number: sel.chapter_number,
         subchapter_number: sel.subchapter_number,
         options,
-      });
+      }, progressReporter());
 
       if (dom.out) dom.out.textContent = formatJson(res.data);
 
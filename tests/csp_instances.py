@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import itertools
+import operator
+import random
+from typing import Any, Dict, Iterator, List, Optional
+
+# Random binary CSP payloads for the solver fuzz tests. Values stay within 0..7 so every instance also
+# fits bitset domains; roughly half of them are unsatisfiable.
+
+FUZZ_INSTANCES = 300
+
+HEURISTIC_COMBOS = [
+    {"inference": inference, "var_heuristic": var_h, "value_heuristic": value_h}
+    for inference in ("NONE", "FC")
+    for var_h in ("FIXED", "MRV")
+    for value_h in ("NONE", "LCV")
+]
+
+CONSISTENCY_CODES = ("NONE", "AC3", "AC2001", "AC4", "MAC", "MAC2001")
+
+_OPS = {"neq": operator.ne, "lt": operator.lt, "gt": operator.gt}
+
+
+def random_instance(rnd: random.Random) -> Dict[str, Any]:
+    n = rnd.randint(2, 7)
+    variables = [f"V{i}" for i in range(n)]
+    domains = {v: sorted(rnd.sample(range(8), rnd.randint(1, 5))) for v in variables}
+    constraints = []
+    for _ in range(rnd.randint(1, 2 * n)):
+        a, b = rnd.sample(variables, 2)
+        constraints.append({"type": rnd.choice(list(_OPS)), "vars": [a, b]})
+    instance: Dict[str, Any] = {
+        "variables": variables,
+        "order": rnd.sample(variables, n),
+        "domains": domains,
+        "constraints": constraints,
+    }
+    if rnd.random() < 0.3:
+        v = rnd.choice(variables)
+        instance["partial_assignment"] = {v: rnd.choice(domains[v])}
+    return instance
+
+
+def instances(seed: str, count: int = FUZZ_INSTANCES) -> Iterator[Dict[str, Any]]:
+    rnd = random.Random(seed)
+    for _ in range(count):
+        yield random_instance(rnd)
+
+
+def payload(instance: Dict[str, Any], consistency: str = "NONE", **settings: str) -> Dict[str, Any]:
+    return {"consistency": consistency, **settings, "instance": instance}
+
+
+def satisfies(instance: Dict[str, Any], solution: Dict[str, int]) -> bool:
+    if set(solution) != set(instance["variables"]):
+        return False
+    if any(solution[v] not in instance["domains"][v] for v in solution):
+        return False
+    if any(solution[v] != val for v, val in (instance.get("partial_assignment") or {}).items()):
+        return False
+    return all(_OPS[c["type"]](solution[c["vars"][0]], solution[c["vars"][1]]) for c in instance["constraints"])
+
+
+def brute_force(instance: Dict[str, Any]) -> Optional[Dict[str, int]]:
+    variables: List[str] = instance["variables"]
+    for values in itertools.product(*(instance["domains"][v] for v in variables)):
+        solution = dict(zip(variables, values))
+        if satisfies(instance, solution):
+            return solution
+    return None
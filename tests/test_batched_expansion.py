@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from Backend.core.search_strategies import algorithms_generic as ag
+from Backend.core.search_strategies.problems import graph_coloring, knights_tour, nqueens
+from Backend.core.search_strategies.problems.registry import HEURISTICS, build_instance, build_problem
+from Backend.core.search_strategies.search_problem import SearchBudget
+
+_RANKS = {
+    "nqueens": nqueens.RANKS,
+    "graph_coloring": graph_coloring.RANKS,
+    "knights_tour": knights_tour.RANKS,
+}
+
+_CASES = [(p, h) for p in ("nqueens", "graph_coloring", "knights_tour", "generalized_hanoi") for h in HEURISTICS[p]]
+
+
+class _Unbatched:
+    # The same problem with expand_batch hidden, so the algorithms take their neighbors() path.
+    def __init__(self, problem):
+        self._problem = problem
+
+    def __getattr__(self, name):
+        if name == "expand_batch":
+            raise AttributeError(name)
+        return getattr(self._problem, name)
+
+
+def _problem(problem_key: str, heuristic: str):
+    random.seed(f"batch:{problem_key}")
+    return build_problem(problem_key, build_instance(problem_key, "easy", 5), heuristic=heuristic)
+
+
+@pytest.mark.parametrize("problem_key,heuristic", _CASES)
+@pytest.mark.parametrize(
+    "run",
+    [ag.bfs, lambda p, b: ag.beam_search(p, b, beam_width=2)],
+    ids=["bfs", "beam_search"],
+)
+def test_batched_and_unbatched_runs_agree(problem_key, heuristic, run):
+    problem = _problem(problem_key, heuristic)
+    plain, batched = SearchBudget(max_expansions=20_000), SearchBudget(max_expansions=20_000)
+
+    assert run(problem, batched) == run(_Unbatched(problem), plain)
+    assert batched.expansions == plain.expansions
+
+
+@pytest.mark.parametrize("problem_key,heuristic", [(p, h) for p, ranks in _RANKS.items() for h in ranks])
+def test_expand_batch_leaves_tie_breaking_heuristics_to_rank(problem_key, heuristic):
+    problem = _problem(problem_key, heuristic)
+    children = problem.expand_batch([problem.initial_state()], True)[0]
+
+    assert children
+    assert all(h is None for _ns, _k, _cost, h in children)
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from Backend.core.constrain_satisfaction_problems.instance_solver import CSPSolver
+from Backend.core.constrain_satisfaction_problems.instance_solver.csp_bitset import mask_values, to_mask
+from Backend.core.constrain_satisfaction_problems.instance_solver.csp_inference import ac3, forward_check, revise
+from Backend.core.constrain_satisfaction_problems.instance_solver.csp_model import CSPModel
+from tests.csp_instances import HEURISTIC_COMBOS, instances, payload
+
+
+def _models(instance):
+    variables = instance["variables"]
+    lists = CSPModel.compile(variables, instance["constraints"], bitset=False)
+    masks = CSPModel.compile(variables, instance["constraints"], bitset=True)
+    return lists, masks, [list(instance["domains"][v]) for v in variables]
+
+
+def test_mask_round_trip():
+    for values in ([], [0], [3, 5, 63], list(range(0, 64, 7))):
+        assert mask_values(to_mask(values)) == values
+
+
+def test_revise_and_ac3_prune_the_same_values_on_masks():
+    for instance in instances("csp-bitset-inference"):
+        lists, masks, domains = _models(instance)
+
+        for x, y in lists.arcs:
+            dl, dm = [list(d) for d in domains], [to_mask(d) for d in domains]
+            assert revise(dl, lists, x, y) == revise(dm, masks, x, y)
+            assert [mask_values(d) for d in dm] == dl
+
+        dl, dm = [list(d) for d in domains], [to_mask(d) for d in domains]
+        ok, pruned = ac3(dl, lists)
+        assert ac3(dm, masks) == (ok, pruned)
+        if ok:
+            assert [mask_values(d) for d in dm] == dl
+
+
+def test_forward_check_prunes_the_same_values_on_masks():
+    rnd = random.Random("csp-bitset-fc")
+    for instance in instances("csp-bitset-fc"):
+        lists, masks, domains = _models(instance)
+        var = rnd.randrange(len(domains))
+        assignment = {var: rnd.choice(domains[var])}
+        dl, dm = [list(d) for d in domains], [to_mask(d) for d in domains]
+        result = forward_check(dl, lists, assignment, last_assigned_vars=[var])
+        assert forward_check(dm, masks, assignment, last_assigned_vars=[var]) == result
+        if result[0]:
+            assert [mask_values(d) for d in dm] == dl
+
+
+@pytest.mark.parametrize("consistency", ["NONE", "AC3", "MAC"])
+def test_solver_results_do_not_depend_on_the_domain_representation(consistency):
+    for instance in instances(f"csp-bitset-solver:{consistency}", count=150):
+        for settings in HEURISTIC_COMBOS:
+            p = payload(instance, consistency, **settings)
+            assert CSPSolver.solve(p, bitset=True) == CSPSolver.solve(p, bitset=False), (instance, settings)
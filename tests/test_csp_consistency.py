@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import pytest
+
+from Backend.core.constrain_satisfaction_problems.instance_solver import CSPSolver
+from Backend.core.constrain_satisfaction_problems.instance_solver.csp_inference import ac2001, ac3, ac4
+from Backend.core.constrain_satisfaction_problems.instance_solver.csp_model import CSPModel
+from tests.csp_instances import CONSISTENCY_CODES, HEURISTIC_COMBOS, instances, payload, satisfies
+
+
+def test_ac3_ac2001_and_ac4_reach_the_same_fixpoint():
+    # On a wipe-out each algorithm stops at the first empty domain, so only `ok` is compared there
+    # (see the csp_inference module docstring).
+    for instance in instances("csp-consistency"):
+        variables = instance["variables"]
+        model = CSPModel.compile(variables, instance["constraints"], bitset=False)
+        results = []
+        for propagate in (ac3, ac2001, ac4):
+            domains = [list(instance["domains"][v]) for v in variables]
+            ok, pruned = propagate(domains, model)
+            results.append((ok, pruned, domains) if ok else (ok,))
+        assert results[0] == results[1] == results[2], instance
+
+
+# Codes whose propagation reaches the same fixpoint; within a group the search sees the same domains.
+_SAME_DOMAINS = (("AC3", "AC2001", "AC4"), ("MAC", "MAC2001"))
+
+
+@pytest.mark.parametrize("settings", HEURISTIC_COMBOS, ids=lambda s: "-".join(s.values()))
+def test_every_consistency_code_agrees_on_satisfiability(settings):
+    # MRV and LCV look at the pruned domains, so across groups only `found` has to agree; with the FIXED
+    # order and no value ordering every code returns the same first solution.
+    fixed = settings["var_heuristic"] == "FIXED" and settings["value_heuristic"] == "NONE"
+    for instance in instances("csp-consistency-solver", count=100):
+        results = {code: CSPSolver.solve(payload(instance, code, **settings)) for code in CONSISTENCY_CODES}
+        assert len({r["found"] for r in results.values()}) == 1, instance
+        for r in results.values():
+            assert r["solution"] is None if not r["found"] else satisfies(instance, r["solution"])
+        for group in _SAME_DOMAINS:
+            assert len({repr(results[code]["solution"]) for code in group}) == 1, (instance, group)
+        if fixed:
+            assert len({repr(r["solution"]) for r in results.values()}) == 1, instance
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from Backend.core.constrain_satisfaction_problems.instance_solver import CSPSolver
+from Backend.core.constrain_satisfaction_problems.instance_solver.csp_model import CSPModel
+from tests.csp_instances import HEURISTIC_COMBOS, brute_force, instances, payload, satisfies
+
+
+def test_solver_matches_brute_force():
+    for instance in instances("csp-solver"):
+        expected = brute_force(instance) is not None
+        for settings in HEURISTIC_COMBOS:
+            result = CSPSolver.solve(payload(instance, **settings), bitset=False)
+            assert result["found"] is expected, (instance, settings)
+            if expected:
+                assert satisfies(instance, result["solution"]), (instance, settings)
+
+
+def test_model_orients_every_constraint_both_ways():
+    constraints = [
+        {"type": "lt", "vars": ["A", "B"]},
+        {"type": "neq", "vars": ["B", "A"]},
+        {"type": "gt", "vars": ["C", "A"]},
+    ]
+    model = CSPModel.compile(["A", "B", "C"], constraints, bitset=False)
+    a, b, c = (model.ids[v] for v in "ABC")
+
+    assert model.neighbors[a] == (b, c)
+    assert sorted(model.relations[(a, b)]) == ["lt", "neq"]
+    assert sorted(model.relations[(b, a)]) == ["gt", "neq"]
+    assert model.relations[(a, c)] == ("lt",)
+    assert all(check(1, 2) for check in model.checks[(a, b)])
+    assert not all(check(2, 1) for check in model.checks[(a, b)])
+    assert all(check(2, 1) for check in model.checks[(b, a)])
+    assert len(model.arcs) == len(set(model.arcs)) == 4
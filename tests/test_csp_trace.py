@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import pytest
+
+from Backend.core.constrain_satisfaction_problems.instance_solver import (
+    TRACE_DECISIONS,
+    TRACE_FULL,
+    TRACE_OFF,
+    CSPSolver,
+)
+from Backend.core.constrain_satisfaction_problems.instance_solver.csp_inference import LIST_DOMAINS_ONLY
+from tests.csp_instances import CONSISTENCY_CODES, HEURISTIC_COMBOS, instances, payload
+
+
+def _without_domains(trace):
+    return [{k: v for k, v in entry.items() if k not in ("domains", "removed")} for entry in trace]
+
+
+def _replay(instance, trace):
+    # Rebuilds the domains after every step of a diff-encoded trace: a TRY that passed opens a level
+    # that its BACKTRACK closes, and each propagation step drops the values it lists as removed.
+    domains = {v: list(instance["domains"][v]) for v in instance["variables"]}
+    saved = []
+    for entry in trace:
+        step = entry["step"]
+        if step == "SELECT_VAR":
+            assert entry["domain"] == domains[entry["var"]]
+        elif step == "TRY" and entry["ok"]:
+            saved.append({v: list(d) for v, d in domains.items()})
+        elif step == "BACKTRACK":
+            domains = saved.pop()
+        elif step != "TRY":
+            for v, removed in entry["removed"].items():
+                assert removed and set(removed) <= set(domains[v])
+                domains[v] = [x for x in domains[v] if x not in removed]
+        yield entry, {v: list(d) for v, d in domains.items()}
+
+
+@pytest.mark.parametrize("consistency", CONSISTENCY_CODES)
+def test_decisions_trace_is_the_full_trace_without_domains(consistency):
+    for instance in instances(f"csp-trace-levels:{consistency}", count=100):
+        for settings in HEURISTIC_COMBOS:
+            p = payload(instance, consistency, **settings)
+            full = CSPSolver.solve(p, trace_level=TRACE_FULL)
+            decisions = CSPSolver.solve(p, trace_level=TRACE_DECISIONS)
+            off = CSPSolver.solve(p, trace_level=TRACE_OFF)
+
+            assert decisions["trace"] == _without_domains(full["trace"])
+            assert all("domains" not in e and "removed" not in e for e in decisions["trace"])
+            assert off["trace"] == []
+            for other in (decisions, off):
+                assert {k: v for k, v in other.items() if k != "trace"} == {k: v for k, v in full.items() if k != "trace"}
+
+
+@pytest.mark.parametrize("bitset", [False, True], ids=["lists", "bitsets"])
+@pytest.mark.parametrize("consistency", CONSISTENCY_CODES)
+def test_diff_trace_replays_to_the_full_snapshots(consistency, bitset):
+    if bitset and consistency in LIST_DOMAINS_ONLY:
+        pytest.skip("list domains only")
+    for instance in instances(f"csp-trace-diff:{consistency}", count=100):
+        for settings in HEURISTIC_COMBOS:
+            p = payload(instance, consistency, **settings)
+            full = CSPSolver.solve(p, bitset=bitset)
+            diff = CSPSolver.solve(p, bitset=bitset, trace_diff=True)
+
+            assert _without_domains(diff["trace"]) == _without_domains(full["trace"])
+            for (entry, replayed), snapshot in zip(_replay(instance, diff["trace"]), full["trace"]):
+                if "removed" in entry:
+                    assert replayed == snapshot["domains"], (instance, settings, entry)
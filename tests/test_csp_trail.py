@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import copy
+import random
+
+import pytest
+
+from Backend.core.constrain_satisfaction_problems.instance_solver.csp_bitset import to_mask
+from Backend.core.constrain_satisfaction_problems.instance_solver.csp_inference import (
+    ac2001,
+    ac3,
+    arcs_touching,
+    forward_check,
+)
+from Backend.core.constrain_satisfaction_problems.instance_solver.csp_model import CSPModel
+from Backend.core.constrain_satisfaction_problems.instance_solver.csp_types import undo
+from tests.csp_instances import instances
+
+
+@pytest.mark.parametrize("bitset", [False, True], ids=["lists", "bitsets"])
+def test_trail_undo_restores_the_snapshot_taken_at_its_mark(bitset):
+    # Drives the inference routines the way the search does (assign, propagate, sometimes go deeper,
+    # sometimes back up) and checks every undo against a deep copy taken before the propagation.
+    rnd = random.Random(f"csp-trail:{bitset}")
+    propagators = [ac3] if bitset else [ac3, ac2001]
+    for instance in instances("csp-trail"):
+        variables = instance["variables"]
+        model = CSPModel.compile(variables, instance["constraints"], bitset=bitset)
+        domains = [to_mask(instance["domains"][v]) if bitset else list(instance["domains"][v]) for v in variables]
+        trail: list = []
+        assignment: dict = {}
+        saved: list = []
+
+        for _ in range(12):
+            free = [i for i in range(len(variables)) if i not in assignment]
+            if saved and (not free or rnd.random() < 0.4):
+                mark, snapshot, var = saved.pop()
+                assignment.pop(var)
+                undo(domains, trail, mark)
+                assert domains == snapshot
+                continue
+
+            var = rnd.choice(free)
+            values = instance["domains"][variables[var]]
+            saved.append((len(trail), copy.deepcopy(domains), var))
+            assignment[var] = rnd.choice(values)
+            ok, _ = forward_check(domains, model, assignment, last_assigned_vars=[var], trail=trail)
+            if ok:
+                rnd.choice(propagators)(domains, model, queue=arcs_touching([var], model), trail=trail)
+
+        while saved:
+            mark, snapshot, var = saved.pop()
+            undo(domains, trail, mark)
+            assert domains == snapshot
+        assert trail == []
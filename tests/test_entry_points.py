@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _run_help(module: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-m", module, "--help"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+
+
+def test_benchmark_cli_starts():
+    proc = _run_help("Backend.core.search_strategies.benchmark")
+    assert proc.returncode == 0, proc.stderr
+    assert "--baseline" in proc.stdout
+
+
+def test_hanoi_pattern_db_cli_starts():
+    proc = _run_help(
+        "Backend.core.search_strategies.problems.generalized_hanoi_problem.generalized_hanoi_pattern_db"
+    )
+    assert proc.returncode == 0, proc.stderr
+    assert "--out" in proc.stdout
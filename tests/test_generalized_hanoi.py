@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+import pytest
+
+from Backend.core.search_strategies.algorithms_generic import a_star
+from Backend.core.search_strategies.problems.generalized_hanoi import build_generalized_hanoi_problem
+from Backend.core.search_strategies.problems.generalized_hanoi_problem import generalized_hanoi_pattern_db
+from Backend.core.search_strategies.problems.generalized_hanoi_problem.generalized_hanoi_oracle import frame_stewart
+from Backend.core.search_strategies.search_problem import SearchBudget, SearchStats
+
+
+@pytest.mark.parametrize("pegs", [4, 5])
+def test_pattern_db_a_star_solves_ten_disks_within_the_default_budget(monkeypatch, pegs):
+    # Tables built on demand, as without HANOI_PDB_DIR.
+    monkeypatch.setattr(generalized_hanoi_pattern_db, "PDB_DIR", None)
+    problem = build_generalized_hanoi_problem({"disks": 10, "pegs": pegs}, heuristic="pattern_db")
+    budget = SearchBudget(stats=SearchStats())
+
+    assert a_star(problem, budget) == problem.goal_state()
+    assert budget.stats.solution_depth == frame_stewart(10, pegs)
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from Backend.core.search_strategies.problems.n_queens_problem.n_queens_instance_generator import (
+    NQueensInstanceGenerator,
+)
+from Backend.core.search_strategies.problems.n_queens_problem.n_queens_validator import NQueensValidator
+
+
+def test_generate_never_rejects_unindexed_sizes():
+    # Beyond the solution index a budget-capped search used to reject boards that are solvable by
+    # construction.
+    for n in (20, 28, 40):
+        for _ in range(15):
+            instance = NQueensInstanceGenerator.generate(n)
+            assert NQueensValidator.is_valid(instance["board"], instance["queen_number_on_board"])
+
+
+def test_is_solvable_reports_unknown_when_the_search_budget_runs_out(monkeypatch):
+    from Backend.core.search_strategies.problems.n_queens_problem import n_queens_validator
+    from Backend.core.search_strategies.search_problem import SearchBudget
+
+    monkeypatch.setattr(
+        n_queens_validator, "SearchBudget", lambda **_: SearchBudget(max_time_s=10.0, max_expansions=1)
+    )
+    board = [[0] * 20 for _ in range(20)]
+    assert NQueensValidator.is_solvable(board) is None
+
+
+def test_is_solvable_beyond_the_index():
+    board = [[0] * 16 for _ in range(16)]
+    assert NQueensValidator.is_solvable(board) is True
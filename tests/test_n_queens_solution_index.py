@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import io
+from collections import Counter
+
+import pytest
+
+from Backend.core.search_strategies.problems.n_queens_problem.n_queens_solution_index import (
+    INDEX_MAX_N,
+    NQueensSolutionIndex,
+    solution_index,
+)
+
+# Number of N-Queens solutions for n = 1..12.
+_TOTALS = [1, 0, 0, 2, 10, 4, 40, 92, 352, 724, 2680, 14200]
+
+
+def _safe(solution: list[int]) -> bool:
+    return all(
+        solution[a] != solution[b] and abs(solution[a] - solution[b]) != b - a
+        for a in range(len(solution))
+        for b in range(a + 1, len(solution))
+    )
+
+
+@pytest.mark.parametrize("n", range(1, INDEX_MAX_N + 1))
+def test_index_holds_every_solution_once(n):
+    index = solution_index(n)
+    solutions = [tuple(index.solution(i)) for i in range(index.total)]
+
+    assert index.total == _TOTALS[n - 1]
+    assert len(set(solutions)) == len(solutions)
+    assert all(_safe(list(s)) for s in solutions)
+
+
+@pytest.mark.parametrize("n", [4, 6, 8])
+def test_prefix_queries_match_the_solution_list(n):
+    index = solution_index(n)
+    solutions = [tuple(index.solution(i)) for i in range(index.total)]
+    prefixes = Counter(s[:r] for s in solutions for r in range(n + 1))
+
+    for prefix, count in prefixes.items():
+        assert index.count_completions(prefix) == count
+        assert index.is_extendable(prefix)
+        completion = index.completion(prefix)
+        assert tuple(completion[: len(prefix)]) == prefix and tuple(completion) in solutions
+
+    # Every other two-row prefix, including attacking ones, has no completion.
+    for a in range(n):
+        for b in range(n):
+            if (a, b) not in prefixes:
+                assert not index.is_extendable((a, b))
+                assert index.completion((a, b)) is None
+
+
+def test_index_file_round_trip():
+    index = solution_index(8)
+    buf = io.BytesIO()
+    index._dump(buf)
+    buf.seek(0)
+    loaded = NQueensSolutionIndex._read(buf, 8)
+
+    for name in ("child", "count", "first", "solutions"):
+        assert getattr(loaded, name) == getattr(index, name)
+    assert NQueensSolutionIndex._read(io.BytesIO(buf.getvalue()), 9) is None
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import json
+import os
+import random
+
+import pytest
+
+from Backend.core.search_strategies import algorithm_comparator, result_cache
+from Backend.core.search_strategies.algorithm_comparator import AlgorithmComparator
+from Backend.core.search_strategies.problems.registry import build_instance
+from Backend.core.search_strategies.result_cache import ResultCache
+from Backend.core.search_strategies.search_problem import SearchBudget
+
+
+def _compare(problem_key: str, instance: dict) -> dict:
+    return AlgorithmComparator.compare(
+        problem_key,
+        instance,
+        SearchBudget(max_time_s=5.0, max_expansions=50_000),
+        parallel=False,
+        rank_by="expansions",
+        early_stop=False,
+    )
+
+
+@pytest.mark.parametrize("problem_key", ["nqueens", "graph_coloring", "knights_tour", "generalized_hanoi"])
+def test_disk_hit_matches_a_fresh_comparison(tmp_path, monkeypatch, problem_key):
+    random.seed(f"cache:{problem_key}")
+    instance = build_instance(problem_key, "easy", 5)
+
+    monkeypatch.setattr(algorithm_comparator, "result_cache", ResultCache(max_entries=0))
+    fresh = _compare(problem_key, instance)
+
+    monkeypatch.setattr(algorithm_comparator, "result_cache", ResultCache(max_entries=8, directory=str(tmp_path)))
+    _compare(problem_key, instance)
+    # A new cache on the same directory only has the JSON file to go on.
+    cache = ResultCache(max_entries=8, directory=str(tmp_path))
+    monkeypatch.setattr(algorithm_comparator, "result_cache", cache)
+    hit = _compare(problem_key, instance)
+
+    assert cache.hits == 1
+    assert hit["cached"] is True
+    assert hit["fastest_algorithm_key"] == fresh["fastest_algorithm_key"]
+    assert hit["solution"] == fresh["solution"]
+    assert [(t["key"], t["status"], t["expansions"]) for t in hit["timings"]] == [
+        (t["key"], t["status"], t["expansions"]) for t in fresh["timings"]
+    ]
+    for path in tmp_path.iterdir():
+        entry = json.loads(path.read_text())
+        assert all("solution" not in run for run in entry.values())
+
+
+def _runs(n: int) -> dict:
+    return {"a_star": {"status": "solved", "time_s": 0.001, "note": None, "expansions": n}}
+
+
+def test_disk_store_evicts_the_least_recently_used_entries(tmp_path):
+    cache = ResultCache(max_entries=8, directory=str(tmp_path), max_disk_entries=3)
+    keys = [f"{i:064x}" for i in range(5)]
+    for i, key in enumerate(keys[:3]):
+        cache.put(key, _runs(i))
+        os.utime(cache._path(key), (1000 + i, 1000 + i))
+
+    # A hit from disk refreshes the oldest entry, so the next two writes evict keys[1] and keys[2].
+    assert ResultCache(max_entries=8, directory=str(tmp_path), max_disk_entries=3).get(keys[0]) == _runs(0)
+    for i, key in enumerate(keys[3:], start=3):
+        cache.put(key, _runs(i))
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(
+        os.path.basename(cache._path(k)) for k in (keys[0], keys[3], keys[4])
+    )
+
+
+def test_stale_entry_files_are_removed_on_start(tmp_path):
+    key = "0" * 64
+    (tmp_path / f"{key}.json").write_text("{}")
+    (tmp_path / f"v{result_cache.CACHE_VERSION - 1}-{key}.json").write_text("{}")
+    (tmp_path / "unrelated.txt").write_text("keep")
+    current = tmp_path / f"v{result_cache.CACHE_VERSION}-{key}.json"
+    current.write_text(json.dumps(_runs(1)))
+
+    ResultCache(max_entries=8, directory=str(tmp_path))
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted([current.name, "unrelated.txt"])